@@ -4,5 +4,8 @@ Handles automatic token management and cookie handling
 """
 
 from .auth_manager import AuthManager, CookieManager
+from .browser_pool import BrowserPool, BrowserLease
+from .clearance import ClearanceManager, ClearanceCookie
 
-__all__ = ['AuthManager', 'CookieManager']
+__all__ = ['AuthManager', 'CookieManager', 'BrowserPool', 'BrowserLease',
+           'ClearanceManager', 'ClearanceCookie']
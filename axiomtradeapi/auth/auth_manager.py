@@ -16,6 +16,8 @@ from typing import Dict, Optional, Union
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
+from .clearance import ClearanceManager
+
 
 @dataclass
 class AuthTokens:
@@ -66,18 +68,25 @@ class SecureTokenStorage:
             storage_dir: Directory to store tokens (default: ~/.axiomtradeapi)
         """
         self.storage_dir = Path(storage_dir or Path.home() / '.axiomtradeapi')
-        self.storage_dir.mkdir(exist_ok=True, mode=0o700)  # Only user can access
         
         self.token_file = self.storage_dir / 'tokens.enc'
         self.key_file = self.storage_dir / 'key.enc'
         
         self.logger = logging.getLogger(__name__)
         
-        # Initialize encryption key
-        self._init_encryption_key()
+        # The storage dir and encryption key are set up on first use
+        self._cipher_suite: Optional[Fernet] = None
+    
+    @property
+    def cipher_suite(self) -> Fernet:
+        """Fernet cipher, loading or generating the key on first access"""
+        if self._cipher_suite is None:
+            self._init_encryption_key()
+        return self._cipher_suite
     
     def _init_encryption_key(self):
         """Initialize or load encryption key"""
+        self.storage_dir.mkdir(exist_ok=True, mode=0o700)  # Only user can access
         if self.key_file.exists():
             with open(self.key_file, 'rb') as f:
                 self.key = f.read()
@@ -88,7 +97,7 @@ class SecureTokenStorage:
             # Set file permissions to be readable only by user
             os.chmod(self.key_file, 0o600)
         
-        self.cipher_suite = Fernet(self.key)
+        self._cipher_suite = Fernet(self.key)
     
     def save_tokens(self, tokens: AuthTokens) -> bool:
         """
@@ -181,6 +190,13 @@ class CookieManager:
         self.cookies = {}
         self.logger = logging.getLogger(__name__)
     
+    def set_cf_clearance(self, cf_clearance: Optional[str]) -> None:
+        """Set (or clear) the Cloudflare clearance cookie"""
+        if cf_clearance:
+            self.cookies['cf_clearance'] = cf_clearance
+        else:
+            self.cookies.pop('cf_clearance', None)
+
     def set_auth_cookies(self, auth_token: str, refresh_token: str) -> None:
         """Set authentication cookies"""
         self.cookies['auth-access-token'] = auth_token
@@ -212,12 +228,16 @@ class AuthManager:
     Handles automatic login, token refresh, and session management
     """
 
+    # Seconds between IMAP inbox checks while waiting for an OTP email
+    imap_poll_interval = 2.0
+
     def __init__(self, username: str = None, password: str = None,
                  auth_token: str = None, refresh_token: str = None,
                  storage_dir: str = None, use_saved_tokens: bool = True,
                  proxies: Dict[str, str] = None, cf_clearance: str = None,
                  imap_password: str = None, imap_host: str = None,
-                 imap_user: str = None):
+                 imap_user: str = None, otp_router=None, browser_pool=None,
+                 clearance_manager: ClearanceManager = None):
         """
         Initialize AuthManager
 
@@ -235,17 +255,31 @@ class AuthManager:
                            the login password is tried. Also read from AXIOM_IMAP_PASSWORD env var.
             imap_host: IMAP server hostname. Auto-detected from email domain when not set.
                        Also read from AXIOM_IMAP_HOST env var.
+            imap_user: IMAP login when it differs from username (e.g. a catch-all mailbox).
+                       Also read from AXIOM_IMAP_USER env var.
+            otp_router: Optional SharedMailboxOTPRouter shared between accounts. When set,
+                        OTPs are read through the router's single connection per mailbox
+                        instead of a dedicated IMAP session per login.
+            browser_pool: Optional BrowserPool of warm nodriver browsers. When set,
+                          browser logins lease an isolated context from the pool
+                          instead of launching a new Chrome.
+            clearance_manager: Optional ClearanceManager shared between clients and
+                               processes. When set, cf_clearance is read from it on
+                               every use and refreshed ahead of expiry.
         """
         self.username = username
         self.password = password
         self.base_url = "https://axiom.trade"
         self.use_saved_tokens = use_saved_tokens
         self.proxies = proxies
+        self.clearance_manager = clearance_manager
         self.cf_clearance = cf_clearance or os.environ.get("CF_CLEARANCE")
         self.imap_password = imap_password or os.environ.get("AXIOM_IMAP_PASSWORD") or password
         self.imap_host = imap_host or os.environ.get("AXIOM_IMAP_HOST")
         # imap_user can differ from username when the Axiom login is an alias
         self.imap_user = imap_user or os.environ.get("AXIOM_IMAP_USER") or username
+        self.otp_router = otp_router
+        self.browser_pool = browser_pool
         
         # Setup logging
         self.logger = logging.getLogger(__name__)
@@ -256,14 +290,46 @@ class AuthManager:
         # Initialize secure token storage
         self.token_storage = SecureTokenStorage(storage_dir)
         
-        # Token storage
-        self.tokens: Optional[AuthTokens] = None
+        # Token storage. Saved tokens are decrypted on first use (or warm()),
+        # so constructing many managers does not touch the disk.
+        self._tokens: Optional[AuthTokens] = None
+        self._storage_loaded = False
+        self._pending_save = False
+        
+        # Initialize with provided tokens if given (overrides saved tokens)
+        if auth_token and refresh_token:
+            self._set_tokens(auth_token, refresh_token, save_tokens=False)
+            # Persisted on first use instead of during construction
+            self._storage_loaded = not use_saved_tokens
+            self._pending_save = use_saved_tokens
+    
+    @property
+    def tokens(self) -> Optional[AuthTokens]:
+        """Current tokens, loading saved tokens from secure storage on first access"""
+        if not self._storage_loaded:
+            self._load_storage()
+        return self._tokens
+    
+    @tokens.setter
+    def tokens(self, value: Optional[AuthTokens]) -> None:
+        self._storage_loaded = True
+        self._tokens = value
+    
+    def _load_storage(self) -> None:
+        """Load saved tokens, or persist tokens passed to the constructor"""
+        self._storage_loaded = True
         
-        # Try to load saved tokens first (if enabled)
-        if use_saved_tokens:
+        if self._pending_save:
+            self._pending_save = False
+            if not self.token_storage.save_tokens(self._tokens):
+                self.logger.warning("Failed to save tokens securely")
+            return
+        
+        # Try to load saved tokens (if enabled)
+        if self.use_saved_tokens:
             saved_tokens = self.token_storage.load_tokens()
             if saved_tokens and not saved_tokens.is_expired:
-                self.tokens = saved_tokens
+                self._tokens = saved_tokens
                 self.cookie_manager.set_auth_cookies(
                     saved_tokens.access_token, 
                     saved_tokens.refresh_token
@@ -271,12 +337,40 @@ class AuthManager:
                 self.logger.info("Loaded valid saved tokens")
             elif saved_tokens and saved_tokens.is_expired:
                 self.logger.info("Saved tokens are expired, will attempt refresh")
-                self.tokens = saved_tokens
+                self._tokens = saved_tokens
+    
+    def warm(self) -> 'AuthManager':
+        """
+        Do the deferred start-up work now: set up the storage dir and
+        encryption key and decrypt saved tokens.
         
-        # Initialize with provided tokens if given (overrides saved tokens)
-        if auth_token and refresh_token:
-            self._set_tokens(auth_token, refresh_token)
+        Returns:
+            AuthManager: self, for chaining
+        """
+        if self.use_saved_tokens:
+            self.token_storage.cipher_suite  # loads or creates the key
+        self.tokens  # decrypts saved tokens
+        return self
     
+    @property
+    def cf_clearance(self) -> Optional[str]:
+        """Current Cloudflare clearance cookie (from the clearance manager when set)"""
+        if self.clearance_manager is not None:
+            return self.clearance_manager.get() or self._cf_clearance
+        return self._cf_clearance
+
+    @cf_clearance.setter
+    def cf_clearance(self, value: Optional[str]) -> None:
+        self._cf_clearance = value
+        if value and self.clearance_manager is not None:
+            self.clearance_manager.seed(value)
+
+    def _store_cf_clearance(self, value: str, expires_at: float = None) -> None:
+        """Store a freshly captured clearance cookie with its expiry"""
+        self._cf_clearance = value
+        if self.clearance_manager is not None:
+            self.clearance_manager.set(value, expires_at)
+
     def _parse_jwt_expiry(self, token: str):
         """Extract exp claim from a JWT without verifying signature."""
         try:
@@ -340,6 +434,9 @@ class AuthManager:
 
         try:
             import nodriver  # noqa: F401
+            if self.browser_pool is not None:
+                self.logger.info("nodriver available — using pooled browser login")
+                return self.browser_pool.run(self._login_with_browser)
             self.logger.info("nodriver available — using browser-based login")
             import asyncio
             return asyncio.run(self._login_with_browser())
@@ -394,6 +491,8 @@ class AuthManager:
 
         Searches unseen messages for a 6-digit code in any email that arrived
         after this method was called, from any sender containing 'axiom'.
+        imaplib blocks, so the mailbox is polled on an executor thread; the
+        event loop (shared by every pooled browser login) keeps running.
 
         Args:
             timeout: Seconds to wait for the email before giving up.
@@ -401,10 +500,8 @@ class AuthManager:
         Returns:
             The 6-digit OTP string, or None if not found in time.
         """
-        import imaplib
-        import email as email_lib
-        import re
         import asyncio
+        import threading
 
         host = self.imap_host or self._detect_imap_host()
         imap_pwd = self.imap_password or self.password
@@ -414,6 +511,28 @@ class AuthManager:
             self.logger.warning("No IMAP password — cannot auto-read OTP")
             return None
 
+        if self.otp_router is not None:
+            self.logger.info(f"📬 Waiting for OTP via shared mailbox {imap_user}@{host}...")
+            return await self.otp_router.wait_for_otp_async(
+                self.username, imap_user=imap_user, imap_password=imap_pwd,
+                imap_host=host, timeout=timeout,
+            )
+
+        # Set when the wait is cancelled so the polling thread stops too
+        stop = threading.Event()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self._poll_imap_for_otp, host, imap_user, imap_pwd, timeout, stop)
+        finally:
+            stop.set()
+
+    def _poll_imap_for_otp(self, host: str, imap_user: str, imap_pwd: str,
+                           timeout: float, stop) -> Optional[str]:
+        """Blocking IMAP poll behind _get_otp_from_imap (runs on an executor thread)"""
+        import imaplib
+        import email as email_lib
+        import re
+
         self.logger.info(f"📬 Connecting to IMAP ({host}) as {imap_user}...")
 
         try:
@@ -425,7 +544,6 @@ class AuthManager:
             self.logger.warning("Falling back to manual OTP entry")
             return None
 
-        import time
         start = time.time()
         seen_ids: set = set()
 
@@ -438,7 +556,8 @@ class AuthManager:
 
         try:
             while time.time() - start < timeout:
-                await asyncio.sleep(2)
+                if stop.wait(self.imap_poll_interval):
+                    return None
                 try:
                     mail.check()  # flush any buffered state
                     _, msgs = mail.search(None, 'UNSEEN')
@@ -491,7 +610,36 @@ class AuthManager:
         self.logger.warning("OTP not found in inbox within timeout — falling back to manual entry")
         return None
 
-    async def _login_with_browser(self) -> bool:
+    def _minimize_browser_window(self) -> None:
+        """Minimize the Chrome window on Windows so the terminal stays in focus."""
+        try:
+            import ctypes, ctypes.wintypes
+            SW_MINIMIZE = 6
+            user32 = ctypes.windll.user32
+            minimized = []
+
+            def _enum_cb(hwnd, _):
+                if user32.IsWindowVisible(hwnd):
+                    buf = ctypes.create_unicode_buffer(512)
+                    user32.GetWindowTextW(hwnd, buf, 512)
+                    title = buf.value.lower()
+                    if 'chrome' in title or 'axiom' in title:
+                        user32.ShowWindow(hwnd, SW_MINIMIZE)
+                        minimized.append(buf.value)
+                return True
+
+            WNDENUMPROC = ctypes.WINFUNCTYPE(
+                ctypes.c_bool, ctypes.wintypes.HWND, ctypes.wintypes.LPARAM
+            )
+            user32.EnumWindows(WNDENUMPROC(_enum_cb), 0)
+            if minimized:
+                self.logger.debug(f"Browser minimized: {minimized}")
+            else:
+                self.logger.debug("No Chrome/Axiom window found to minimize")
+        except Exception as _e:
+            self.logger.debug(f"Could not minimize browser: {_e}")
+
+    async def _login_with_browser(self, lease=None) -> bool:
         """
         Full automated login flow via nodriver (real Chrome).
 
@@ -504,46 +652,32 @@ class AuthManager:
              otherwise prompts for manual terminal input
           6. Submit OTP, extract auth cookies
 
+        Args:
+            lease: Optional BrowserLease from a BrowserPool. When given, the
+                   login runs in the lease's isolated context of a warm browser
+                   instead of launching (and stopping) a dedicated Chrome.
+
         Returns:
             bool: True if tokens were successfully extracted.
         """
         import nodriver as uc
         import asyncio
 
-        self.logger.info("🌐 Launching browser for Axiom Trade login...")
         browser = None
         try:
-            browser = await uc.start(headless=False)
-            tab = await browser.get("https://axiom.trade")
-
-            # ── Minimize the browser window so the terminal stays in focus ───
-            await asyncio.sleep(1)  # give Chrome time to paint its window
-            try:
-                import ctypes, ctypes.wintypes
-                SW_MINIMIZE = 6
-                user32 = ctypes.windll.user32
-                minimized = []
-
-                def _enum_cb(hwnd, _):
-                    if user32.IsWindowVisible(hwnd):
-                        buf = ctypes.create_unicode_buffer(512)
-                        user32.GetWindowTextW(hwnd, buf, 512)
-                        title = buf.value.lower()
-                        if 'chrome' in title or 'axiom' in title:
-                            user32.ShowWindow(hwnd, SW_MINIMIZE)
-                            minimized.append(buf.value)
-                    return True
+            if lease is not None:
+                self.logger.info("🌐 Using pooled browser for Axiom Trade login...")
+                tab = await lease.get("https://axiom.trade")
+                get_cookies = lease.get_cookies
+            else:
+                self.logger.info("🌐 Launching browser for Axiom Trade login...")
+                browser = await uc.start(headless=False)
+                tab = await browser.get("https://axiom.trade")
+                get_cookies = browser.cookies.get_all
 
-                WNDENUMPROC = ctypes.WINFUNCTYPE(
-                    ctypes.c_bool, ctypes.wintypes.HWND, ctypes.wintypes.LPARAM
-                )
-                user32.EnumWindows(WNDENUMPROC(_enum_cb), 0)
-                if minimized:
-                    self.logger.debug(f"Browser minimized: {minimized}")
-                else:
-                    self.logger.debug("No Chrome/Axiom window found to minimize")
-            except Exception as _e:
-                self.logger.debug(f"Could not minimize browser: {_e}")
+                # ── Minimize the browser window so the terminal stays in focus ───
+                await asyncio.sleep(1)  # give Chrome time to paint its window
+                self._minimize_browser_window()
 
             # ── Wait for page to settle ───────────────────────────────────────
             await asyncio.sleep(5)
@@ -639,7 +773,9 @@ class AuthManager:
 
                 if not otp_code:
                     self.logger.info("Manual OTP entry required")
-                    otp_code = input("Enter the OTP code sent to your email: ").strip()
+                    # Off the event loop, so other pooled logins keep running
+                    otp_code = (await asyncio.get_running_loop().run_in_executor(
+                        None, input, "Enter the OTP code sent to your email: ")).strip()
 
                 if not otp_code or len(otp_code) != 6:
                     self.logger.error(f"Invalid OTP code: '{otp_code}' (expected 6 digits)")
@@ -672,9 +808,10 @@ class AuthManager:
             access_token = None
             refresh_token = None
             cf_clearance = None
+            cf_expires = None
 
             for _ in range(15):
-                cookies = await browser.cookies.get_all()
+                cookies = await get_cookies()
                 for cookie in cookies:
                     name = getattr(cookie, 'name', None) or cookie.get('name', '')
                     value = getattr(cookie, 'value', None) or cookie.get('value', '')
@@ -684,6 +821,7 @@ class AuthManager:
                         refresh_token = value
                     elif name == 'cf_clearance' and value:
                         cf_clearance = value
+                        cf_expires = getattr(cookie, 'expires', None)
 
                 if access_token and refresh_token:
                     break
@@ -692,12 +830,12 @@ class AuthManager:
             if access_token and refresh_token:
                 self._set_tokens(access_token, refresh_token)
                 if cf_clearance:
-                    self.cf_clearance = cf_clearance
+                    self._store_cf_clearance(cf_clearance, cf_expires)
                     self.logger.info("✅ cf_clearance cookie captured")
                 self.logger.info("✅ Browser login successful — tokens saved")
                 return True
 
-            cookies = await browser.cookies.get_all()
+            cookies = await get_cookies()
             cookie_names = [getattr(c, 'name', None) or c.get('name', '') for c in cookies]
             self.logger.error(
                 f"❌ Auth cookies not found after login. "
@@ -707,6 +845,8 @@ class AuthManager:
 
         except Exception as e:
             self.logger.error(f"❌ Browser login error: {e}", exc_info=True)
+            if lease is not None:
+                lease.broken = True  # let the pool restart this browser
             return False
         finally:
             if browser:
@@ -874,8 +1014,9 @@ class AuthManager:
             'auth-refresh-token': self.tokens.refresh_token,
             'auth-access-token': self.tokens.access_token,
         }
-        if self.cf_clearance:
-            cookies['cf_clearance'] = self.cf_clearance
+        cf_clearance = self.cf_clearance
+        if cf_clearance:
+            cookies['cf_clearance'] = cf_clearance
 
         headers = {
             'accept': 'application/json, text/plain, */*',
@@ -936,6 +1077,9 @@ class AuthManager:
                 self.logger.error("❌ No new access token in refresh response")
                 return False
             else:
+                if response.status_code == 403 and self.clearance_manager is not None:
+                    # Cloudflare rejected the clearance cookie; refresh it for next time
+                    self.clearance_manager.invalidate()
                 self.logger.error(f"❌ Token refresh failed: {response.status_code} - {response.text}")
                 return False
         except Exception as e:
@@ -998,6 +1142,7 @@ class AuthManager:
         }
         
         # Add authentication cookies if available
+        self.cookie_manager.set_cf_clearance(self.cf_clearance)
         cookie_header = self.cookie_manager.get_cookie_header()
         if cookie_header:
             headers["Cookie"] = cookie_header
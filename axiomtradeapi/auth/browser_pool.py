@@ -0,0 +1,204 @@
+"""
+Warm headless-browser pool for Axiom Trade browser logins
+Keeps N nodriver Chrome instances running and hands out isolated contexts
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class BrowserLease:
+    """An isolated browser context lent to a single login"""
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.tab = None
+        self.context_id = None
+        self.broken = False
+
+    async def get(self, url: str):
+        """Open ``url`` in a fresh browser context (own cookies and storage)"""
+        self.tab = await self.browser.create_context(url, new_window=True)
+        self.context_id = self.tab.target.browser_context_id
+        return self.tab
+
+    async def get_cookies(self) -> list:
+        """Return every cookie of this lease's browser context"""
+        from nodriver import cdp
+        return await self.browser.send(cdp.storage.get_cookies(browser_context_id=self.context_id))
+
+    async def dispose(self) -> None:
+        """Close the context so nothing leaks into the next login"""
+        if self.context_id is None:
+            return
+        from nodriver import cdp
+        await self.browser.send(cdp.target.dispose_browser_context(self.context_id))
+        self.context_id = None
+
+
+class _BrowserSlot:
+    """One pooled Chrome process and its usage count"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.browser = None
+        self.uses = 0
+
+
+class BrowserPool:
+    """
+    Pool of warm nodriver browsers shared by many AuthManager logins.
+
+    nodriver browsers are bound to the event loop that started them, while
+    ``AuthManager.authenticate`` runs each login in its own ``asyncio.run``.
+    The pool therefore owns a dedicated event loop in a background thread;
+    logins are submitted to it and receive a :class:`BrowserLease` with an
+    isolated browser context. Browsers are recycled after ``max_uses`` logins
+    or as soon as a login reports them broken.
+    """
+
+    def __init__(self, size: int = 2, headless: bool = False, max_uses: int = 25,
+                 browser_args: List[str] = None):
+        """
+        Initialize BrowserPool
+
+        Args:
+            size: Number of browsers kept warm (maximum concurrent logins)
+            headless: Launch Chrome without a window
+            max_uses: Logins served by one browser before it is restarted
+            browser_args: Extra Chrome command line arguments
+        """
+        self.size = size
+        self.headless = headless
+        self.max_uses = max_uses
+        self.browser_args = browser_args or []
+        self.logger = logging.getLogger(__name__)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._slots: List[_BrowserSlot] = []
+        self._start_lock = threading.Lock()
+        self._stats = {'launches': 0, 'recycles': 0, 'crashes': 0, 'logins': 0}
+
+    # ------------------------------------------------------------------ #
+    #  Lifecycle                                                           #
+    # ------------------------------------------------------------------ #
+
+    def start(self) -> None:
+        """Start the pool thread and warm up all browsers"""
+        with self._start_lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=loop.run_forever, name="browser-pool", daemon=True)
+            self._thread.start()
+            # Hold the lock while warming so concurrent callers wait for the pool
+            asyncio.run_coroutine_threadsafe(self._warm(), loop).result()
+            self._loop = loop
+
+    async def _warm(self) -> None:
+        self._idle = asyncio.Queue()
+        self._slots = [_BrowserSlot(i) for i in range(self.size)]
+        await asyncio.gather(*(self._launch(slot) for slot in self._slots))
+        for slot in self._slots:
+            self._idle.put_nowait(slot)
+        self.logger.info(f"🌐 Browser pool ready ({self.size} browsers)")
+
+    async def _launch(self, slot: _BrowserSlot) -> None:
+        import nodriver as uc
+        try:
+            slot.browser = await uc.start(headless=self.headless, browser_args=self.browser_args)
+            slot.uses = 0
+            self._stats['launches'] += 1
+        except Exception as e:
+            # Leave the slot empty; it is launched again when next acquired
+            slot.browser = None
+            self.logger.error(f"Failed to launch pooled browser #{slot.index}: {e}")
+
+    async def _stop(self, slot: _BrowserSlot) -> None:
+        if slot.browser is not None:
+            try:
+                slot.browser.stop()
+            except Exception:
+                pass
+            slot.browser = None
+
+    async def _recycle(self, slot: _BrowserSlot) -> None:
+        await self._stop(slot)
+        self._stats['recycles'] += 1
+        await self._launch(slot)
+        self._idle.put_nowait(slot)
+
+    def close(self) -> None:
+        """Stop every browser and the pool thread"""
+        if self._loop is None:
+            return
+
+        async def _shutdown():
+            for slot in self._slots:
+                await self._stop(slot)
+
+        asyncio.run_coroutine_threadsafe(_shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop = None
+
+    # ------------------------------------------------------------------ #
+    #  Leasing                                                             #
+    # ------------------------------------------------------------------ #
+
+    async def _run(self, login: Callable[[BrowserLease], Awaitable[Any]]) -> Any:
+        slot = await self._idle.get()
+        if slot.browser is None or slot.browser.stopped:
+            await self._stop(slot)
+            await self._launch(slot)
+            if slot.browser is None:
+                self._idle.put_nowait(slot)
+                raise RuntimeError("No browser available in pool")
+
+        lease = BrowserLease(slot.browser)
+        self._stats['logins'] += 1
+        try:
+            return await login(lease)
+        except Exception:
+            lease.broken = True
+            raise
+        finally:
+            slot.uses += 1
+            try:
+                await lease.dispose()
+            except Exception:
+                lease.broken = True
+            if lease.broken:
+                self._stats['crashes'] += 1
+            if lease.broken or slot.uses >= self.max_uses or slot.browser.stopped:
+                # Relaunch in the background so the login result is not delayed
+                self._loop.create_task(self._recycle(slot))
+            else:
+                self._idle.put_nowait(slot)
+
+    def run(self, login: Callable[[BrowserLease], Awaitable[Any]], timeout: float = None) -> Any:
+        """
+        Run ``login(lease)`` on a pooled browser and wait for its result.
+
+        Blocks the calling thread; waits for a free browser when all are busy.
+        """
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(self._run(login), self._loop)
+        return future.result(timeout)
+
+    async def run_async(self, login: Callable[[BrowserLease], Awaitable[Any]]) -> Any:
+        """Awaitable variant of :meth:`run` for callers inside an event loop"""
+        await asyncio.get_running_loop().run_in_executor(None, self.start)
+        future = asyncio.run_coroutine_threadsafe(self._run(login), self._loop)
+        return await asyncio.wrap_future(future)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Pool counters: launches, recycles, crashes, logins and idle browsers"""
+        stats = dict(self._stats)
+        stats['size'] = self.size
+        stats['idle'] = self._idle.qsize() if self._idle is not None else 0
+        return stats
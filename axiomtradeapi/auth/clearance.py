@@ -0,0 +1,306 @@
+"""
+Cloudflare clearance lifecycle manager for Axiom Trade API
+Stores cf_clearance with its expiry, shares it across clients and processes,
+and refreshes it through the browser path before it expires
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+@dataclass
+class ClearanceCookie:
+    """Container for a cf_clearance cookie"""
+    value: str
+    expires_at: float
+    obtained_at: float
+
+    @property
+    def is_expired(self) -> bool:
+        """Check if the cookie is past its expiry"""
+        return time.time() >= self.expires_at
+
+    def needs_refresh(self, margin: float) -> bool:
+        """Check if the cookie expires within ``margin`` seconds"""
+        return time.time() >= (self.expires_at - margin)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for serialization"""
+        return {
+            'value': self.value,
+            'expires_at': self.expires_at,
+            'obtained_at': self.obtained_at
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ClearanceCookie':
+        """Create from dictionary"""
+        return cls(
+            value=data['value'],
+            expires_at=data['expires_at'],
+            obtained_at=data['obtained_at']
+        )
+
+
+class ClearanceManager:
+    """
+    Manages the cf_clearance cookie shared by AuthManager, AxiomTradeClient
+    and AxiomTradeWebSocketClient instances.
+
+    The current cookie is kept in ``<storage_dir>/cf_clearance.json`` so every
+    process using the same storage directory sees the latest value. When the
+    cookie gets close to expiry one process (guarded by a lock file) refreshes
+    it by loading axiom.trade in a real browser; the others keep using the
+    current value and pick up the new one from the shared file.
+    """
+
+    def __init__(self, storage_dir: str = None, refresh_margin: float = 600,
+                 default_ttl: float = 1800, browser_pool=None, headless: bool = False,
+                 auto_refresh: bool = True, retry_interval: float = 60):
+        """
+        Initialize ClearanceManager
+
+        Args:
+            storage_dir: Directory shared by all processes (default: ~/.axiomtradeapi)
+            refresh_margin: Seconds before expiry at which a refresh is started
+            default_ttl: Lifetime assumed for cookies whose expiry is unknown
+            browser_pool: Optional BrowserPool used for refreshes
+            headless: Launch Chrome without a window when no pool is given
+            auto_refresh: Refresh through the browser path when the cookie ages out
+            retry_interval: Minimum seconds between refresh attempts in this process
+        """
+        self.storage_dir = Path(storage_dir or Path.home() / '.axiomtradeapi')
+        self.clearance_file = self.storage_dir / 'cf_clearance.json'
+        self.lock_file = self.storage_dir / 'cf_clearance.lock'
+        self.refresh_margin = refresh_margin
+        self.default_ttl = default_ttl
+        self.browser_pool = browser_pool
+        self.headless = headless
+        self.auto_refresh = auto_refresh
+        self.retry_interval = retry_interval
+        self.logger = logging.getLogger(__name__)
+
+        self._cookie: Optional[ClearanceCookie] = None
+        self._file_mtime: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._last_attempt = 0.0
+
+    # ------------------------------------------------------------------ #
+    #  Shared storage                                                      #
+    # ------------------------------------------------------------------ #
+
+    def _reload(self) -> None:
+        """Pick up a cookie written by another client or process"""
+        try:
+            mtime = self.clearance_file.stat().st_mtime
+        except OSError:
+            return
+        if mtime == self._file_mtime:
+            return
+        try:
+            with open(self.clearance_file, 'r') as f:
+                self._cookie = ClearanceCookie.from_dict(json.load(f))
+            self._file_mtime = mtime
+        except Exception as e:
+            self.logger.debug(f"Failed to read shared cf_clearance: {e}")
+
+    def _save(self, cookie: ClearanceCookie) -> None:
+        try:
+            self.storage_dir.mkdir(exist_ok=True, mode=0o700)
+            tmp_file = self.clearance_file.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(cookie.to_dict(), f)
+            os.chmod(tmp_file, 0o600)
+            # Atomic replace so readers never see a partial file
+            os.replace(tmp_file, self.clearance_file)
+            self._file_mtime = self.clearance_file.stat().st_mtime
+        except Exception as e:
+            self.logger.warning(f"Failed to save shared cf_clearance: {e}")
+
+    def set(self, value: str, expires_at: float = None) -> None:
+        """
+        Store a new clearance cookie
+
+        Args:
+            value: cf_clearance cookie value
+            expires_at: Unix expiry time; ``default_ttl`` from now when unknown
+        """
+        now = time.time()
+        if not expires_at or expires_at <= now:
+            expires_at = now + self.default_ttl
+        cookie = ClearanceCookie(value=value, expires_at=expires_at, obtained_at=now)
+        with self._lock:
+            self._cookie = cookie
+            self._save(cookie)
+        self.logger.debug(f"cf_clearance stored (expires in {expires_at - now:.0f}s)")
+
+    def seed(self, value: str) -> None:
+        """Store ``value`` only if no valid cookie is known yet (e.g. from CF_CLEARANCE)"""
+        with self._lock:
+            self._reload()
+            current = self._cookie
+        # A stale env value must not revive an expired record with a fresh expiry
+        if current is None or (current.is_expired and current.value != value):
+            self.set(value)
+
+    def invalidate(self) -> None:
+        """Mark the current cookie as expired, e.g. after a Cloudflare 403"""
+        with self._lock:
+            self._reload()
+            if self._cookie is None:
+                return
+            self._cookie = ClearanceCookie(self._cookie.value, time.time(), self._cookie.obtained_at)
+            self._save(self._cookie)
+        self.logger.info("cf_clearance invalidated — will refresh on next use")
+
+    def get_cookie(self) -> Optional[ClearanceCookie]:
+        """Get the current cookie record, reloading from shared storage"""
+        with self._lock:
+            self._reload()
+            return self._cookie
+
+    def get(self, wait: bool = False, timeout: float = 90) -> Optional[str]:
+        """
+        Get the current cf_clearance value
+
+        Starts a background refresh when the cookie is close to expiry.
+
+        Args:
+            wait: Block until a refresh finishes when the cookie is already expired.
+                  Must stay False inside an event loop.
+            timeout: Maximum time to wait for the refresh
+
+        Returns:
+            str: The cookie value, or None if no valid cookie is available
+        """
+        cookie = self.get_cookie()
+        if cookie is not None and not cookie.needs_refresh(self.refresh_margin):
+            return cookie.value
+
+        if self.auto_refresh:
+            thread = self.refresh_in_background()
+            if wait and thread is not None and (cookie is None or cookie.is_expired):
+                thread.join(timeout)
+                cookie = self.get_cookie()
+
+        if cookie is None or cookie.is_expired:
+            return None
+        return cookie.value
+
+    # ------------------------------------------------------------------ #
+    #  Refresh                                                             #
+    # ------------------------------------------------------------------ #
+
+    def _acquire_refresh_lock(self, stale_after: float = 180) -> bool:
+        """Cross-process lock so only one process drives the browser"""
+        try:
+            self.storage_dir.mkdir(exist_ok=True, mode=0o700)
+            fd = os.open(str(self.lock_file), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            return True
+        except FileExistsError:
+            try:
+                if time.time() - self.lock_file.stat().st_mtime > stale_after:
+                    self.lock_file.unlink()
+                    return self._acquire_refresh_lock(stale_after)
+            except OSError:
+                pass
+            return False
+        except OSError as e:
+            self.logger.debug(f"cf_clearance lock unavailable: {e}")
+            return False
+
+    def _release_refresh_lock(self) -> None:
+        try:
+            self.lock_file.unlink()
+        except OSError:
+            pass
+
+    def refresh_in_background(self) -> Optional[threading.Thread]:
+        """Start a refresh thread unless one is already running in this process"""
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return self._refresh_thread
+            if time.time() - self._last_attempt < self.retry_interval:
+                return None
+            self._last_attempt = time.time()
+            self._refresh_thread = threading.Thread(target=self.refresh, name="cf-clearance-refresh",
+                                                    daemon=True)
+            self._refresh_thread.start()
+            return self._refresh_thread
+
+    def refresh(self) -> bool:
+        """
+        Obtain a new cf_clearance by loading axiom.trade in a real browser
+
+        Returns:
+            bool: True if a new cookie was stored (here or by another process)
+        """
+        if not self._acquire_refresh_lock():
+            self.logger.debug("Another process is refreshing cf_clearance")
+            return False
+        try:
+            previous = self.get_cookie()
+            if previous is not None and not previous.needs_refresh(self.refresh_margin):
+                return True  # refreshed by another process meanwhile
+
+            self.logger.info("🌐 Refreshing cf_clearance via browser...")
+            if self.browser_pool is not None:
+                result = self.browser_pool.run(self._fetch_with_browser)
+            else:
+                result = asyncio.run(self._fetch_with_browser())
+
+            if not result:
+                self.logger.warning("cf_clearance refresh failed — cookie not found")
+                return False
+            self.set(*result)
+            self.logger.info("✅ cf_clearance refreshed")
+            return True
+        except Exception as e:
+            self.logger.error(f"cf_clearance refresh error: {e}")
+            return False
+        finally:
+            self._release_refresh_lock()
+
+    async def _fetch_with_browser(self, lease=None) -> Optional[Tuple[str, Optional[float]]]:
+        """Load axiom.trade and return (cf_clearance, expires_at) once Cloudflare sets it"""
+        browser = None
+        try:
+            if lease is not None:
+                await lease.get("https://axiom.trade")
+                get_cookies = lease.get_cookies
+            else:
+                import nodriver as uc
+                browser = await uc.start(headless=self.headless)
+                await browser.get("https://axiom.trade")
+                get_cookies = browser.cookies.get_all
+
+            for _ in range(30):
+                for cookie in await get_cookies():
+                    name = getattr(cookie, 'name', None) or cookie.get('name', '')
+                    if name == 'cf_clearance':
+                        value = getattr(cookie, 'value', None) or cookie.get('value', '')
+                        expires = getattr(cookie, 'expires', None)
+                        if value:
+                            return value, expires
+                await asyncio.sleep(1)
+            return None
+        except Exception:
+            if lease is not None:
+                lease.broken = True
+            raise
+        finally:
+            if browser:
+                try:
+                    browser.stop()
+                except Exception:
+                    pass
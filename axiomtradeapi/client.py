@@ -49,7 +49,8 @@ class AxiomTradeClient:
                  storage_dir: str = None, use_saved_tokens: bool = True,
                  proxies: Dict[str, str] = None, cf_clearance: str = None,
                  imap_password: str = None, imap_host: str = None,
-                 imap_user: str = None):
+                 imap_user: str = None, otp_router=None, browser_pool=None,
+                 clearance_manager=None):
         """
         Initialize AxiomTradeClient with enhanced authentication
 
@@ -65,6 +66,11 @@ class AxiomTradeClient:
             imap_password: Password for IMAP OTP auto-reading. For Gmail with 2FA use an
                            App Password. Also read from AXIOM_IMAP_PASSWORD env var.
             imap_host: IMAP server hostname. Auto-detected from email domain when not set.
+            imap_user: IMAP login when it differs from username (e.g. a catch-all mailbox).
+            otp_router: Optional SharedMailboxOTPRouter shared by many accounts.
+            browser_pool: Optional BrowserPool of warm browsers shared by many accounts.
+            clearance_manager: Optional ClearanceManager that keeps cf_clearance fresh and
+                               shares it with other clients and processes.
         """
         # Initialize the enhanced auth manager
         self.auth_manager = AuthManager(
@@ -79,6 +85,9 @@ class AxiomTradeClient:
             imap_password=imap_password,
             imap_host=imap_host,
             imap_user=imap_user,
+            otp_router=otp_router,
+            browser_pool=browser_pool,
+            clearance_manager=clearance_manager,
         )
         
         # Initialize endpoints for trading functionality
@@ -90,10 +99,9 @@ class AxiomTradeClient:
         # Setup logging
         self.logger = logging.getLogger(__name__)
         
-        # Initialize session for HTTP requests
-        self.session = requests.Session()
-        if proxies:
-            self.session.proxies.update(proxies)
+        # HTTP session is created on first use (see the ``session`` property)
+        self._session: Optional[requests.Session] = None
+        self._proxies = proxies
         
         self.base_headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36',
@@ -107,13 +115,45 @@ class AxiomTradeClient:
             'sec-fetch-mode': 'cors',
             'sec-fetch-site': 'same-site'
         }
-        self.session.headers.update(self.base_headers)
         self._session_bootstrapped = False
 
-        # Sync session with auth manager if tokens exist
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session, built and synced with the auth manager on first access"""
+        if self._session is None:
+            self._session = requests.Session()
+            if self._proxies:
+                self._session.proxies.update(self._proxies)
+            self._session.headers.update(self.base_headers)
+            # Sync session with auth manager if tokens exist
+            self._sync_session_cookies()
+        return self._session
+
+    @session.setter
+    def session(self, value: requests.Session) -> None:
+        self._session = value
+
+    def warm(self) -> 'AxiomTradeClient':
+        """
+        Do the start-up work deferred by the constructor: load the encryption
+        key, decrypt saved tokens and build the HTTP session.
+
+        Returns:
+            AxiomTradeClient: self, for chaining
+        """
+        self.auth_manager.warm()
+        self.session  # builds and syncs the session
+        return self
+
+    def _sync_session_cookies(self) -> None:
+        """Copy the current auth tokens and cf_clearance into the HTTP session"""
         if self.auth_manager.tokens:
             self.session.cookies.set('auth-access-token', self.auth_manager.tokens.access_token)
-            self.session.cookies.set('auth-refresh-token', self.auth_manager.tokens.refresh_token)
+            if self.auth_manager.tokens.refresh_token:
+                self.session.cookies.set('auth-refresh-token', self.auth_manager.tokens.refresh_token)
+        cf_clearance = self.auth_manager.cf_clearance
+        if cf_clearance:
+            self.session.cookies.set('cf_clearance', cf_clearance, domain='.axiom.trade')
     
     @property
     def access_token(self) -> Optional[str]:
@@ -186,12 +226,7 @@ class AxiomTradeClient:
 
         if success and self.auth_manager.tokens:
             # Sync new tokens into the HTTP session
-            self.session.cookies.set(
-                'auth-access-token', self.auth_manager.tokens.access_token
-            )
-            self.session.cookies.set(
-                'auth-refresh-token', self.auth_manager.tokens.refresh_token
-            )
+            self._sync_session_cookies()
             return {
                 'success': True,
                 'access_token': self.auth_manager.tokens.access_token,
@@ -532,10 +567,7 @@ class AxiomTradeClient:
         }
         normalized_period = period_aliases.get(normalized_period, normalized_period)
 
-        if self.auth_manager.tokens:
-            self.session.cookies.set('auth-access-token', self.auth_manager.tokens.access_token)
-            if self.auth_manager.tokens.refresh_token:
-                self.session.cookies.set('auth-refresh-token', self.auth_manager.tokens.refresh_token)
+        self._sync_session_cookies()
 
         headers = dict(self.base_headers)
         headers.update({
@@ -960,9 +992,7 @@ class AxiomTradeClient:
                 self.logger.error(f"Failed to save {name}: {e}")
 
         # Ensure session is in sync with current tokens
-        if self.auth_manager.tokens:
-            self.session.cookies.set('auth-access-token', self.auth_manager.tokens.access_token)
-            self.session.cookies.set('auth-refresh-token', self.auth_manager.tokens.refresh_token)
+        self._sync_session_cookies()
 
         # Ensure we have keys to query, even if empty
         sol_keys = sol_public_keys or []
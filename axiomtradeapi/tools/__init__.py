@@ -1,7 +1,10 @@
 from .email_otp import EmailOTPHandler
 from .login_utils import login_with_email_otp
 from .proxy_manager import ProxyManager, get_proxy_manager
+from .otp_router import SharedMailboxOTPRouter
+from .refresh_scheduler import TokenRefreshScheduler
 from .multi_account import MultiAccountManager
 
-__all__ = ['EmailOTPHandler', 'login_with_email_otp', 'ProxyManager', 'get_proxy_manager', 'MultiAccountManager']
+__all__ = ['EmailOTPHandler', 'login_with_email_otp', 'ProxyManager', 'get_proxy_manager', 'SharedMailboxOTPRouter',
+           'TokenRefreshScheduler', 'MultiAccountManager']
 
@@ -7,15 +7,28 @@ import asyncio
 import logging
 from typing import List, Dict, Callable, Optional, Union
 from ..client import AxiomTradeClient
+from ..auth.browser_pool import BrowserPool
 from .proxy_manager import ProxyManager
+from .otp_router import SharedMailboxOTPRouter
+from .refresh_scheduler import TokenRefreshScheduler
 
 class MultiAccountManager:
     """Manages multiple AxiomTradeClient instances with proxies"""
     
-    def __init__(self, use_proxies: bool = True):
+    def __init__(self, use_proxies: bool = True, browser_pool: BrowserPool = None):
+        """
+        Args:
+            use_proxies: Assign a free proxy to every account
+            browser_pool: Optional BrowserPool shared by every account's browser
+                          login, so mass re-authentication is bounded by pool size
+        """
         self.clients: List[Dict] = []  # List of {'client': client, 'id': int, 'proxy': dict}
         self.proxy_manager = ProxyManager()
         self.use_proxies = use_proxies
+        # One IMAP connection per mailbox, shared by every account's login
+        self.otp_router = SharedMailboxOTPRouter()
+        self.browser_pool = browser_pool
+        self.refresh_scheduler: Optional[TokenRefreshScheduler] = None
         self.logger = logging.getLogger(__name__)
 
     async def initialize_proxies(self, count: int):
@@ -25,8 +38,15 @@ class MultiAccountManager:
             self.proxy_manager.fetch_free_proxies(limit=count + 10)  # Fetch a few extra
 
     def add_account(self, username: str = None, password: str = None, 
-                    auth_token: str = None, refresh_token: str = None):
-        """Add an account to the pool"""
+                    auth_token: str = None, refresh_token: str = None,
+                    imap_user: str = None, imap_password: str = None,
+                    imap_host: str = None):
+        """Add an account to the pool
+
+        ``imap_user``/``imap_password``/``imap_host`` describe the mailbox that
+        receives this account's OTP; accounts that are aliases of the same
+        catch-all mailbox share one connection through ``self.otp_router``.
+        """
         proxies = None
         if self.use_proxies:
             proxies = self.proxy_manager.get_proxy()
@@ -39,7 +59,12 @@ class MultiAccountManager:
             auth_token=auth_token,
             refresh_token=refresh_token,
             proxies=proxies,
-            use_saved_tokens=False # Don't conflict with saved file
+            use_saved_tokens=False, # Don't conflict with saved file
+            imap_user=imap_user,
+            imap_password=imap_password,
+            imap_host=imap_host,
+            otp_router=self.otp_router,
+            browser_pool=self.browser_pool
         )
         
         account_id = len(self.clients) + 1
@@ -51,8 +76,13 @@ class MultiAccountManager:
         self.logger.info(f"Added account #{account_id} with proxy: {proxies}")
         return client
 
-    def load_accounts_from_file(self, filepath: str):
-        """Load accounts from file (format: email:password per line)"""
+    def load_accounts_from_file(self, filepath: str, imap_user: str = None,
+                                imap_password: str = None, imap_host: str = None):
+        """Load accounts from file (format: email:password per line)
+
+        The optional IMAP arguments name a shared catch-all mailbox that
+        receives the OTPs of every account in the file.
+        """
         try:
             with open(filepath, 'r') as f:
                 lines = f.readlines()
@@ -65,10 +95,25 @@ class MultiAccountManager:
                 line = line.strip()
                 if ':' in line:
                     email, password = line.split(':', 1)
-                    self.add_account(username=email, password=password)
+                    self.add_account(username=email, password=password,
+                                     imap_user=imap_user, imap_password=imap_password,
+                                     imap_host=imap_host)
         except Exception as e:
             self.logger.error(f"Failed to load accounts: {e}")
 
+    def start_token_refresh_scheduler(self, **kwargs) -> TokenRefreshScheduler:
+        """
+        Start a TokenRefreshScheduler covering every loaded account.
+
+        Must be called from a running event loop. Keyword arguments are passed
+        to TokenRefreshScheduler (lead_time, spread_window, max_concurrency, ...).
+        """
+        if self.refresh_scheduler is None:
+            self.refresh_scheduler = TokenRefreshScheduler(**kwargs)
+        self.refresh_scheduler.add_clients(self.clients)
+        self.refresh_scheduler.start()
+        return self.refresh_scheduler
+
     async def run_active_users_monitor(self, duration: int = None, callback: Callable = None):
         """
         Run get_active_axiom_users on all accounts simultaneously
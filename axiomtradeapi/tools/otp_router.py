@@ -0,0 +1,312 @@
+"""
+Shared mailbox OTP router for Axiom Trade API
+Keeps one IMAP connection per mailbox and routes OTP codes to waiting logins
+"""
+
+import asyncio
+import email
+import imaplib
+import logging
+import re
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from email.utils import getaddresses, parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+
+# Headers that may carry the alias an email was delivered to
+RECIPIENT_HEADERS = ('To', 'Cc', 'Delivered-To', 'X-Original-To', 'Envelope-To')
+
+
+class _OTPWaiter:
+    """A login waiting for the OTP sent to ``recipient``"""
+
+    def __init__(self, recipient: str):
+        self.recipient = recipient
+        self.since = time.time()
+        self.future: Future = Future()
+
+
+class _MailboxPoller(threading.Thread):
+    """Background thread owning the single IMAP connection of one mailbox"""
+
+    def __init__(self, router: 'SharedMailboxOTPRouter', host: str, port: int,
+                 user: str, password: str):
+        super().__init__(name=f"otp-router-{user}@{host}", daemon=True)
+        self.router = router
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.mail: Optional[imaplib.IMAP4_SSL] = None
+        self.next_uid: Optional[int] = None
+        self.wakeup = threading.Event()
+        self.stopped = threading.Event()
+        self.logger = router.logger
+
+    def run(self):
+        idle_since = time.time()
+        while not self.stopped.is_set():
+            if self.router._has_waiters(self):
+                idle_since = time.time()
+            elif self.mail is None or time.time() - idle_since >= self.router.idle_timeout:
+                # Nobody is waiting: release the connection until a login registers
+                self._disconnect()
+                self.next_uid = None
+                self.wakeup.wait()
+                self.wakeup.clear()
+                idle_since = time.time()
+                continue
+
+            try:
+                self._ensure_connected()
+                self._poll()
+            except Exception as e:
+                self.logger.warning(f"IMAP poll error on {self.user}@{self.host}: {e}")
+                self._disconnect()
+
+            self.wakeup.wait(self.router.check_interval)
+            self.wakeup.clear()
+
+        self._disconnect()
+
+    def _ensure_connected(self):
+        if self.mail is not None:
+            return
+        self.logger.info(f"📬 Connecting to IMAP ({self.host}) as {self.user}...")
+        mail = imaplib.IMAP4_SSL(self.host, self.port)
+        mail.login(self.user, self.password)
+        mail.select("INBOX")
+        self.mail = mail
+
+        if self.next_uid is None:
+            # Start slightly behind UIDNEXT so an OTP that landed between the
+            # login submitting its form and this connection is not missed
+            _, data = mail.status("INBOX", "(UIDNEXT)")
+            match = re.search(rb'UIDNEXT (\d+)', data[0] or b'')
+            uid_next = int(match.group(1)) if match else 1
+            self.next_uid = max(1, uid_next - self.router.lookback)
+
+    def _disconnect(self):
+        if self.mail is None:
+            return
+        try:
+            self.mail.close()
+            self.mail.logout()
+        except Exception:
+            pass
+        self.mail = None
+
+    def _poll(self):
+        """Fetch and parse every message that arrived since the last poll, once"""
+        self.mail.noop()
+        status, data = self.mail.uid('search', None, f'UID {self.next_uid}:*')
+        if status != "OK" or not data or not data[0]:
+            return
+
+        for uid in sorted(int(u) for u in data[0].split()):
+            # "n:*" always matches the newest message, even when its UID < n
+            if uid < self.next_uid:
+                continue
+            self.next_uid = uid + 1
+
+            status, msg_data = self.mail.uid('fetch', str(uid), '(BODY.PEEK[])')
+            if status != "OK":
+                continue
+            for part in msg_data:
+                if isinstance(part, tuple):
+                    parsed = self.router._parse_message(email.message_from_bytes(part[1]))
+                    if parsed:
+                        self.router._route(*parsed)
+
+
+class SharedMailboxOTPRouter:
+    """
+    Routes Axiom OTP emails from shared (catch-all) mailboxes to waiting logins.
+
+    Each mailbox gets exactly one IMAP connection, owned by a background thread.
+    Every new message is fetched and parsed once, and its code is handed to the
+    login waiting on the recipient alias it was sent to. A code that arrives
+    before its login starts waiting is kept for ``clock_skew`` seconds and
+    handed out when the login registers. Waiters are plain
+    ``concurrent.futures.Future`` objects, so logins running in different
+    threads or event loops can share one router.
+    """
+
+    def __init__(self, check_interval: float = 2.0, idle_timeout: float = 60.0,
+                 sender_filter: str = "axiom", lookback: int = 20,
+                 clock_skew: float = 30.0):
+        """
+        Initialize SharedMailboxOTPRouter
+
+        Args:
+            check_interval: Seconds between inbox polls while logins are waiting
+            idle_timeout: Seconds without waiters before a mailbox connection is closed
+            sender_filter: Sender/subject substring identifying Axiom emails
+            lookback: Number of UIDs before UIDNEXT to inspect on first connect
+            clock_skew: Seconds an email may predate its waiter and still be routed;
+                codes nobody is waiting for are kept this long
+        """
+        self.check_interval = check_interval
+        self.idle_timeout = idle_timeout
+        self.sender_filter = sender_filter.lower()
+        self.lookback = lookback
+        self.clock_skew = clock_skew
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._mailboxes: Dict[Tuple[str, str], _MailboxPoller] = {}
+        self._waiters: Dict[str, List[_OTPWaiter]] = {}
+        self._waiter_mailbox: Dict[str, _MailboxPoller] = {}
+        # recipient -> (otp, sent_at, kept_at) of the latest code nobody was waiting for
+        self._unclaimed: Dict[str, Tuple[str, float, float]] = {}
+
+    def add_mailbox(self, imap_user: str, imap_password: str,
+                    imap_host: str = "imap.gmail.com", imap_port: int = 993) -> None:
+        """Register a mailbox; its connection is opened on the first waiting login"""
+        self._get_mailbox(imap_user, imap_password, imap_host, imap_port)
+
+    def _get_mailbox(self, user: str, password: str, host: str, port: int) -> _MailboxPoller:
+        key = (host.lower(), user.lower())
+        with self._lock:
+            poller = self._mailboxes.get(key)
+            if poller is None:
+                poller = _MailboxPoller(self, host, port, user, password)
+                self._mailboxes[key] = poller
+                poller.start()
+            return poller
+
+    def _register(self, recipient: str, poller: _MailboxPoller) -> _OTPWaiter:
+        waiter = _OTPWaiter(recipient.lower())
+        with self._lock:
+            self._expire_unclaimed(waiter.since)
+            unclaimed = self._unclaimed.pop(waiter.recipient, None)
+            if unclaimed is not None and unclaimed[1] >= waiter.since - self.clock_skew:
+                # The code was routed before this login started waiting
+                waiter.future.set_result(unclaimed[0])
+                self.logger.info(f"✅ OTP routed to {waiter.recipient}")
+            self._waiters.setdefault(waiter.recipient, []).append(waiter)
+            self._waiter_mailbox[waiter.recipient] = poller
+        poller.wakeup.set()
+        return waiter
+
+    def _expire_unclaimed(self, now: float) -> None:
+        expired = [r for r, (_, _, kept_at) in self._unclaimed.items() if now - kept_at > self.clock_skew]
+        for recipient in expired:
+            del self._unclaimed[recipient]
+
+    def _unregister(self, waiter: _OTPWaiter) -> None:
+        with self._lock:
+            waiters = self._waiters.get(waiter.recipient)
+            if waiters and waiter in waiters:
+                waiters.remove(waiter)
+            if not waiters:
+                self._waiters.pop(waiter.recipient, None)
+                self._waiter_mailbox.pop(waiter.recipient, None)
+
+    def _has_waiters(self, poller: _MailboxPoller) -> bool:
+        with self._lock:
+            return any(p is poller for p in self._waiter_mailbox.values())
+
+    def _parse_message(self, msg) -> Optional[Tuple[List[str], str, float]]:
+        """Extract (recipients, otp, sent_at) from an Axiom OTP email"""
+        sender = str(msg.get('From', '')).lower()
+        subject = str(msg.get('Subject', '')).lower()
+        if self.sender_filter not in sender and self.sender_filter not in subject:
+            return None
+
+        body = ''
+        if msg.is_multipart():
+            for content_type in ('text/plain', 'text/html'):
+                for part in msg.walk():
+                    if part.get_content_type() == content_type:
+                        body = part.get_payload(decode=True).decode(errors='replace')
+                        break
+                if body:
+                    break
+        else:
+            body = msg.get_payload(decode=True).decode(errors='replace')
+
+        match = re.search(r'(?<!\d)(\d{6})(?!\d)', body)
+        if not match:
+            return None
+
+        values = [str(v) for h in RECIPIENT_HEADERS for v in msg.get_all(h, [])]
+        recipients = [addr.lower() for _, addr in getaddresses(values) if addr]
+
+        try:
+            sent_at = parsedate_to_datetime(msg['Date']).timestamp()
+        except Exception:
+            sent_at = time.time()
+
+        return recipients, match.group(1), sent_at
+
+    def _route(self, recipients: List[str], otp: str, sent_at: float) -> None:
+        """Hand ``otp`` to the oldest login waiting on one of ``recipients``
+
+        Without one, the code is kept for the login that registers next.
+        """
+        with self._lock:
+            for recipient in dict.fromkeys(recipients):
+                for waiter in self._waiters.get(recipient, []):
+                    if sent_at >= waiter.since - self.clock_skew and not waiter.future.done():
+                        waiter.future.set_result(otp)
+                        self.logger.info(f"✅ OTP routed to {recipient}")
+                        return
+            now = time.time()
+            self._expire_unclaimed(now)
+            for recipient in recipients:
+                self._unclaimed[recipient] = (otp, sent_at, now)
+        self.logger.debug(f"No login waiting for OTP sent to {recipients}, keeping it for {self.clock_skew:.0f}s")
+
+    def wait_for_otp(self, recipient: str, imap_user: str, imap_password: str,
+                     imap_host: str = "imap.gmail.com", imap_port: int = 993,
+                     timeout: float = 90.0) -> Optional[str]:
+        """
+        Block until the OTP sent to ``recipient`` arrives in the shared mailbox.
+
+        Args:
+            recipient: Axiom login email (the alias the OTP is addressed to)
+            imap_user: Mailbox login receiving mail for ``recipient``
+            imap_password: Mailbox password or app password
+            imap_host: IMAP server address
+            imap_port: IMAP port
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            str: The 6-digit OTP code, or None on timeout
+        """
+        poller = self._get_mailbox(imap_user, imap_password, imap_host, imap_port)
+        waiter = self._register(recipient, poller)
+        try:
+            return waiter.future.result(timeout=timeout)
+        except FutureTimeoutError:
+            self.logger.warning(f"Timeout waiting for OTP sent to {recipient}")
+            return None
+        finally:
+            self._unregister(waiter)
+
+    async def wait_for_otp_async(self, recipient: str, imap_user: str, imap_password: str,
+                                 imap_host: str = "imap.gmail.com", imap_port: int = 993,
+                                 timeout: float = 90.0) -> Optional[str]:
+        """Awaitable variant of :meth:`wait_for_otp` for use inside an event loop"""
+        poller = self._get_mailbox(imap_user, imap_password, imap_host, imap_port)
+        waiter = self._register(recipient, poller)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(waiter.future), timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Timeout waiting for OTP sent to {recipient}")
+            return None
+        finally:
+            self._unregister(waiter)
+
+    def close(self) -> None:
+        """Stop all mailbox threads and log out of every IMAP connection"""
+        with self._lock:
+            pollers = list(self._mailboxes.values())
+            self._mailboxes.clear()
+        for poller in pollers:
+            poller.stopped.set()
+            poller.wakeup.set()
+        for poller in pollers:
+            poller.join(timeout=5)
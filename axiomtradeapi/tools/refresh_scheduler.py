@@ -0,0 +1,244 @@
+"""
+Staggered token refresh scheduler for Axiom Trade API
+Spreads fleet-wide token refreshes over a window with a concurrency cap
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from ..auth.auth_manager import AuthManager
+
+
+class _ScheduledAccount:
+    """Refresh bookkeeping for one AuthManager"""
+
+    def __init__(self, account_id: str, auth_manager: AuthManager, offset: float):
+        self.account_id = account_id
+        self.auth_manager = auth_manager
+        self.offset = offset
+        self.phased = False
+        self.retry_at = 0.0
+        self.failures = 0
+        self.in_flight = False
+
+
+class TokenRefreshScheduler:
+    """
+    Refreshes the tokens of many accounts ahead of expiry without bursts.
+
+    Each account gets a stable offset inside ``spread_window`` derived from its
+    id, so tokens that were issued (and expire) together are refreshed at
+    different moments. The offset only moves an account's first refresh; the
+    new token then expires at a shifted time, so later refreshes keep the phase
+    and run once per token lifetime (``lifetime - lead_time``). No refresh is
+    due sooner than ``min_refresh_interval`` after the token was issued. On top
+    of that at most ``max_concurrency`` refreshes run at once and consecutive
+    refreshes start at least ``min_interval`` apart.
+    """
+
+    def __init__(self, lead_time: float = 360, spread_window: float = 600,
+                 max_concurrency: int = 4, min_interval: float = 0.5,
+                 retry_delay: float = 30, max_retry_delay: float = 600,
+                 tick: float = 1.0, min_refresh_interval: float = 60):
+        """
+        Initialize TokenRefreshScheduler
+
+        Args:
+            lead_time: Seconds before ``expires_at`` by which every refresh is due
+            spread_window: Width of the window (before ``lead_time``) refreshes are spread over
+            max_concurrency: Maximum number of refreshes in flight
+            min_interval: Minimum seconds between two refresh starts
+            retry_delay: Initial delay before retrying a failed refresh
+            max_retry_delay: Upper bound for the exponential retry delay
+            tick: Maximum sleep between scheduling passes
+            min_refresh_interval: Minimum token age before it is refreshed
+                (capped at the token's lifetime)
+        """
+        self.lead_time = lead_time
+        self.spread_window = spread_window
+        self.max_concurrency = max_concurrency
+        self.min_interval = min_interval
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.tick = tick
+        self.min_refresh_interval = min_refresh_interval
+        self.logger = logging.getLogger(__name__)
+
+        self._accounts: Dict[str, _ScheduledAccount] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._last_start = 0.0
+        self._latencies: deque = deque(maxlen=500)
+        self._lags: deque = deque(maxlen=500)
+        self._counters = {'refreshed': 0, 'failed': 0}
+        self._backlog = 0
+
+    # ------------------------------------------------------------------ #
+    #  Accounts                                                            #
+    # ------------------------------------------------------------------ #
+
+    def _offset_for(self, account_id: str) -> float:
+        digest = hashlib.md5(account_id.encode('utf-8')).hexdigest()
+        return (int(digest[:8], 16) / 0xFFFFFFFF) * self.spread_window
+
+    def add(self, auth_manager: AuthManager, account_id: str = None) -> None:
+        """Track ``auth_manager``; ``account_id`` defaults to its username"""
+        account_id = str(account_id or auth_manager.username or id(auth_manager))
+        self._accounts[account_id] = _ScheduledAccount(account_id, auth_manager,
+                                                       self._offset_for(account_id))
+
+    def add_clients(self, clients: List[Dict]) -> None:
+        """Track every client of a ``MultiAccountManager.clients`` list"""
+        for account in clients:
+            client = account['client']
+            self.add(client.auth_manager, account_id=client.auth_manager.username or account['id'])
+
+    def remove(self, account_id: str) -> None:
+        """Stop tracking an account"""
+        self._accounts.pop(str(account_id), None)
+
+    def due_at(self, account_id: str) -> Optional[float]:
+        """Unix time at which the account's next refresh is due (None if it has no tokens)"""
+        account = self._accounts.get(str(account_id))
+        return self._due_at(account) if account else None
+
+    def _due_at(self, account: _ScheduledAccount) -> Optional[float]:
+        tokens = account.auth_manager.tokens
+        if not tokens or not tokens.refresh_token:
+            return None
+        due = tokens.expires_at - self.lead_time
+        if not account.phased:
+            due -= account.offset
+        lifetime = max(tokens.expires_at - tokens.issued_at, 0.0)
+        due = max(due, tokens.issued_at + min(self.min_refresh_interval, lifetime))
+        return max(due, account.retry_at)
+
+    # ------------------------------------------------------------------ #
+    #  Scheduling                                                          #
+    # ------------------------------------------------------------------ #
+
+    def start(self) -> asyncio.Task:
+        """Start the scheduler on the running event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        """Stop scheduling; refreshes already in flight are left to finish"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self) -> None:
+        """Scheduling loop; runs until cancelled"""
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.logger.info(f"Token refresh scheduler started for {len(self._accounts)} accounts")
+        while True:
+            now = time.time()
+            due = []
+            next_due = now + self.tick
+            for account in list(self._accounts.values()):
+                if account.in_flight:
+                    continue
+                due_at = self._due_at(account)
+                if due_at is None:
+                    continue
+                if due_at <= now:
+                    due.append((due_at, account))
+                else:
+                    next_due = min(next_due, due_at)
+
+            due.sort(key=lambda item: item[0])
+            self._backlog = len(due)
+
+            for due_at, account in due:
+                if self._semaphore.locked():
+                    break
+                wait = self._last_start + self.min_interval - time.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                await self._semaphore.acquire()
+                self._last_start = time.time()
+                self._backlog -= 1
+                account.in_flight = True
+                asyncio.ensure_future(self._refresh(account, due_at))
+
+            if self._backlog:
+                delay = self.min_interval
+            else:
+                delay = min(next_due, now + self.tick) - time.time()
+            await asyncio.sleep(max(delay, 0.01))
+
+    async def _refresh(self, account: _ScheduledAccount, due_at: float) -> None:
+        started = time.time()
+        self._lags.append(started - due_at)
+        try:
+            loop = asyncio.get_running_loop()
+            ok = await loop.run_in_executor(None, account.auth_manager.refresh_tokens)
+        except Exception as e:
+            self.logger.error(f"Refresh error for {account.account_id}: {e}")
+            ok = False
+        finally:
+            self._latencies.append(time.time() - started)
+            account.in_flight = False
+            self._semaphore.release()
+
+        if ok:
+            account.failures = 0
+            account.phased = True
+            account.retry_at = 0.0
+            self._counters['refreshed'] += 1
+        else:
+            account.failures += 1
+            delay = min(self.retry_delay * (2 ** (account.failures - 1)), self.max_retry_delay)
+            account.retry_at = time.time() + delay
+            self._counters['failed'] += 1
+            self.logger.warning(f"Token refresh failed for {account.account_id}, retrying in {delay:.0f}s")
+
+    # ------------------------------------------------------------------ #
+    #  Metrics                                                             #
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _percentile(values: List[float], pct: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+    def get_metrics(self) -> Dict[str, float]:
+        """
+        Scheduler metrics
+
+        Returns:
+            dict: ``accounts``, ``backlog`` (due but not started), ``in_flight``,
+            ``refreshed``/``failed`` counters, refresh ``latency_*`` and
+            scheduling ``lag_*`` (start time minus due time) in seconds, and
+            ``next_due_in`` seconds
+        """
+        latencies = list(self._latencies)
+        lags = list(self._lags)
+        now = time.time()
+        upcoming = [d for d in (self._due_at(a) for a in self._accounts.values()
+                                if not a.in_flight) if d is not None]
+        return {
+            'accounts': len(self._accounts),
+            'backlog': self._backlog,
+            'in_flight': sum(1 for a in self._accounts.values() if a.in_flight),
+            'refreshed': self._counters['refreshed'],
+            'failed': self._counters['failed'],
+            'latency_avg': sum(latencies) / len(latencies) if latencies else 0.0,
+            'latency_p95': self._percentile(latencies, 0.95),
+            'latency_max': max(latencies) if latencies else 0.0,
+            'lag_avg': sum(lags) / len(lags) if lags else 0.0,
+            'lag_max': max(lags) if lags else 0.0,
+            'next_due_in': max(0.0, min(upcoming) - now) if upcoming else None,
+        }
@@ -1,5 +1,29 @@
 """WebSocket support for AxiomTradeAPI."""
 
 from ._client import AxiomTradeWebSocketClient
+from ._hub import HubClient, WebSocketHub
+from ._mock_server import MockAxiomServer
+from ._pairs import NewPair, NewPairIndex
+from ._pnl import WalletPnLAggregator
+from ._state import MarketStateStore
+from ._recorder import FrameRecorder, ReplaySource, read_frames
+from ._stream import EventStream
+from ._sharded import ShardedWebSocketClient
+from ._subscription import Subscription
 
-__all__ = ["AxiomTradeWebSocketClient"]
+__all__ = [
+    "AxiomTradeWebSocketClient",
+    "EventStream",
+    "FrameRecorder",
+    "HubClient",
+    "MarketStateStore",
+    "MockAxiomServer",
+    "NewPair",
+    "NewPairIndex",
+    "ReplaySource",
+    "ShardedWebSocketClient",
+    "Subscription",
+    "WalletPnLAggregator",
+    "WebSocketHub",
+    "read_frames",
+]
@@ -2,8 +2,27 @@ import json
 import logging
 import os
 import asyncio
+import random
 import time
-from typing import Optional, Callable, Dict, Any
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from concurrent.futures import Executor
+from typing import Optional, Callable, Dict, Any, Awaitable, List, Union
+
+from ..auth.clearance import ClearanceManager
+from ._connection import CLUSTER, PRICE, WsConnection
+from ._codec import Frame, extract_room, has_no_content, resolve_json_backend
+from ._executor import CallbackPool
+from ._latency import LatencyTracker, clock_offset_from_response
+from ._pairs import NewPair, NewPairIndex
+from ._pnl import WalletPnLAggregator
+from ._probe import ClusterProbe
+from ._ratelimit import RateLimiter
+from ._recorder import FrameRecorder, ReplaySource
+from ._state import MarketStateStore
+from ._stream import EventStream
+from ._dispatch import DispatchQueue, OVERFLOW_POLICIES
+from ._subscription import Subscription
 
 try:
     from curl_cffi.requests import AsyncSession as CurlAsyncSession
@@ -26,20 +45,97 @@ except ImportError:
 
 
 class AxiomTradeWebSocketClient:
-    def __init__(self, auth_manager, log_level=logging.INFO, cf_clearance: str = None) -> None:
+    _requires_auth = True
+
+    def __init__(self, auth_manager, log_level=logging.INFO, cf_clearance: str = None,
+                 auto_reconnect: bool = True, reconnect_base_delay: float = 1.0,
+                 reconnect_max_delay: float = 60.0, max_reconnect_attempts: Optional[int] = None,
+                 queue_size: Optional[int] = None, overflow: str = "block",
+                 json_backend: str = "auto", offline: bool = False,
+                 track_latency: bool = False, join_rate: Optional[float] = None,
+                 join_burst: int = 100, heartbeat_interval: Optional[float] = 20.0,
+                 stale_timeout: Optional[float] = 60.0, preflight: bool = True,
+                 callback_executor: Union[str, Executor] = "thread",
+                 callback_workers: Optional[int] = None, probe_interval: Optional[float] = None,
+                 probe_timeout: float = 5.0,
+                 track_state: Union[bool, MarketStateStore] = False,
+                 index_new_pairs: Union[bool, NewPairIndex] = False,
+                 track_pnl: Union[bool, WalletPnLAggregator] = False,
+                 curl_stale_timeout: Optional[float] = None) -> None:
         self.ws_url = "wss://cluster9.axiom.trade/"
         self.ws_url_token_price = "wss://socket8.axiom.trade/"
+        self.ws_fallback_urls = [
+            "wss://cluster3.axiom.trade/",
+            "wss://cluster5.axiom.trade/",
+            "wss://cluster7.axiom.trade/",
+        ]
         self.cf_clearance = cf_clearance or os.environ.get("CF_CLEARANCE")
 
-        # curl_cffi session + ws (primary path)
-        self._curl_session: Optional[CurlAsyncSession] = None
-        self._curl_ws = None       # actual WebSocket object
-        self._curl_ws_ctx = None   # async context manager (must be kept alive)
+        # Reconnect supervision (see start())
+        self.auto_reconnect = auto_reconnect
+        self.reconnect_base_delay = reconnect_base_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.max_reconnect_attempts = max_reconnect_attempts
+        # Liveness: ping a socket that has been silent for heartbeat_interval
+        # seconds, reconnect one that has been silent for stale_timeout.
+        # curl_cffi does not report pongs, so a quiet curl socket cannot be
+        # told from a dead one; it uses curl_stale_timeout (off by default)
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_timeout = stale_timeout
+        self.curl_stale_timeout = curl_stale_timeout
+        self._closing = False
+        self._running = False
+        self._supervisors: Dict[str, asyncio.Task] = {}
+        self._stats = {'messages_skipped': 0}
 
-        # websockets fallback
-        self.ws = None
+        # One socket per endpoint; both share the curl session, its cookies
+        # and the pre-flight
+        self._connections: Dict[str, WsConnection] = {
+            CLUSTER: WsConnection(CLUSTER),
+            PRICE: WsConnection(PRICE),
+        }
+        self._curl_session: Optional[CurlAsyncSession] = None
+        # The HTTP pre-flight warms Cloudflare cookies; servers that are not
+        # behind Cloudflare (MockAxiomServer) do without it
+        self.preflight = preflight
+        self.preflight_ttl = 60.0
+        self._preflight_at = 0.0
+        self._fallback_cookies: Dict[str, str] = {}
+        self._connect_lock: Optional[asyncio.Lock] = None
+        # With probe_interval set, the cluster URLs are handshake-probed at
+        # connect and every probe_interval seconds, and the fastest healthy
+        # one is tried first
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self._cluster_probe = ClusterProbe()
+        self._probed_at: Optional[float] = None
+        # Offline clients never connect; frames come from replay()
+        self.offline = offline
+        self._recorder: Optional[FrameRecorder] = None
+        # Server clock minus local clock, measured by the pre-flight
+        self.server_clock_offset: Optional[float] = None
+        self._latency: Optional[LatencyTracker] = LatencyTracker() if track_latency else None
+        # Latest price / active users / wallet trade per subscribed room; a
+        # store passed in (e.g. one shared by several clients) is used as is.
+        # Tracking (state, pair_index, pnl) decodes each tracked frame on the
+        # receive loop, including price ticks a conflating or queued
+        # subscription would otherwise drop undecoded
+        if isinstance(track_state, MarketStateStore):
+            self.state: Optional[MarketStateStore] = track_state
+        else:
+            self.state = MarketStateStore() if track_state else None
+        # Rolling creator/ticker/mint index of the new_pairs room
+        if isinstance(index_new_pairs, NewPairIndex):
+            self.pair_index: Optional[NewPairIndex] = index_new_pairs
+        else:
+            self.pair_index = NewPairIndex() if index_new_pairs else None
+        # Running per-wallet, per-token PnL of subscribed wallet transactions
+        if isinstance(track_pnl, WalletPnLAggregator):
+            self.pnl: Optional[WalletPnLAggregator] = track_pnl
+        else:
+            self.pnl = WalletPnLAggregator() if track_pnl else None
 
-        if not auth_manager:
+        if not auth_manager and self._requires_auth:
             raise ValueError("auth_manager is required and must be an authenticated AuthManager instance")
 
         self.auth_manager = auth_manager
@@ -54,6 +150,33 @@ class AxiomTradeWebSocketClient:
         self.logger.propagate = False
 
         self._callbacks: Dict[str, Callable] = {}
+        # room -> {subscription id: handler}, built at subscribe time so that
+        # dispatching a frame is a single dict lookup on its room
+        self._rooms: Dict[str, Dict[int, Callable[[Any], Awaitable[None]]]] = {}
+        # room -> number of subscriptions that joined it, and the endpoint it is joined on
+        self._room_refs: Dict[str, int] = {}
+        self._room_endpoints: Dict[str, str] = {}
+        # room -> time.monotonic() of its last frame (or of its join)
+        self._room_last_seen: Dict[str, float] = {}
+        # Join/leave messages waiting to be flushed, per endpoint (room -> action);
+        # inside batch() they accumulate and go out together
+        self._pending_rooms: Dict[str, OrderedDict] = {CLUSTER: OrderedDict(), PRICE: OrderedDict()}
+        self._batch_depth = 0
+        # Optional cap on join/leave messages per second, per socket
+        self._join_limiters: Dict[str, RateLimiter] = {}
+        if join_rate is not None:
+            self._join_limiters = {name: RateLimiter(join_rate, join_burst) for name in (CLUSTER, PRICE)}
+        self._streams: set = set()
+        self._subscriptions: Dict[int, Subscription] = {}
+        # Default per-subscription dispatch queue; None runs callbacks inline
+        self.queue_size = None
+        self.overflow = "block"
+        options = self._queue_options(queue_size, overflow)
+        self.queue_size, self.overflow = options['queue_size'], options['overflow']
+        # Plain (non-async) callbacks run on this pool, in order per room
+        self._callback_pool = CallbackPool(callback_executor, callback_workers)
+        # Frames are decoded with orjson/msgspec when installed (pip install orjson)
+        self.json_backend, self._json_loads = resolve_json_backend(json_backend)
 
         # websockets version detection for fallback
         if WEBSOCKETS_AVAILABLE:
@@ -72,17 +195,56 @@ class AxiomTradeWebSocketClient:
         else:
             raise RuntimeError("Neither curl_cffi nor websockets is installed.")
 
+    # The cluster connection is exposed under the historical attribute names
+
+    @property
+    def _curl_ws(self):
+        return self._connections[CLUSTER].curl_ws
+
+    @_curl_ws.setter
+    def _curl_ws(self, value):
+        self._connections[CLUSTER].curl_ws = value
+
+    @property
+    def _curl_ws_ctx(self):
+        return self._connections[CLUSTER].curl_ws_ctx
+
+    @_curl_ws_ctx.setter
+    def _curl_ws_ctx(self, value):
+        self._connections[CLUSTER].curl_ws_ctx = value
+
+    @property
+    def ws(self):
+        return self._connections[CLUSTER].ws
+
+    @ws.setter
+    def ws(self, value):
+        self._connections[CLUSTER].ws = value
+
     # ------------------------------------------------------------------ #
     #  Internal helpers                                                    #
     # ------------------------------------------------------------------ #
 
+    def _current_cf_clearance(self) -> Optional[str]:
+        """Latest cf_clearance: the shared ClearanceManager first, then the static value."""
+        manager = getattr(self.auth_manager, 'clearance_manager', None)
+        if isinstance(manager, ClearanceManager):
+            value = manager.get()
+            if value:
+                return value
+        if self.cf_clearance:
+            return self.cf_clearance
+        value = getattr(self.auth_manager, 'cf_clearance', None)
+        return value if isinstance(value, str) else None
+
     def _build_cookies(self, tokens, extra: dict = None) -> dict:
         cookies = {
             'auth-access-token': tokens.access_token,
             'auth-refresh-token': tokens.refresh_token,
         }
-        if self.cf_clearance:
-            cookies['cf_clearance'] = self.cf_clearance
+        cf_clearance = self._current_cf_clearance()
+        if cf_clearance:
+            cookies['cf_clearance'] = cf_clearance
         if extra:
             for k, v in extra.items():
                 if k not in cookies:
@@ -111,28 +273,54 @@ class AxiomTradeWebSocketClient:
             f'https://api6.axiom.trade/get-announcement?v={v}',
         ]:
             try:
-                await session.get(url, headers=headers, cookies=cookies, timeout=10)
+                sent_at = time.time()
+                resp = await session.get(url, headers=headers, cookies=cookies, timeout=10)
+                if '/server-time' in url:
+                    self._update_clock_offset(resp, sent_at, time.time())
                 self.logger.debug(f"Pre-flight OK: {url}")
             except Exception as e:
                 self.logger.debug(f"Pre-flight failed (non-fatal): {url} — {e}")
 
-    async def _send(self, data: str) -> None:
-        """Send a text message over whichever transport is active."""
-        if self._curl_ws is not None:
-            try:
-                await self._curl_ws.send(data.encode(), 1)  # 1 = CURLWS_TEXT
-                return
-            except Exception:
-                pass
-        if self.ws is not None:
-            await self.ws.send(data)
+    def _update_clock_offset(self, resp, sent_at: float, received_at: float) -> None:
+        """Estimate the server clock offset from the server-time pre-flight response."""
+        try:
+            body = resp.json()
+        except Exception:
+            body = None
+        headers = getattr(resp, 'headers', None)
+        date_header = headers.get('date') if hasattr(headers, 'get') else None
+        offset = clock_offset_from_response(body, date_header if isinstance(date_header, str) else None,
+                                            sent_at, received_at)
+        if offset is not None:
+            self.server_clock_offset = offset
+            if self._latency is not None:
+                self._latency.clock_offset = offset
+            self.logger.debug(f"Server clock offset: {offset * 1000:.1f} ms")
+
+    async def _send(self, data: str, endpoint: str = CLUSTER) -> None:
+        """Send a text message over the socket of ``endpoint``."""
+        await self._connections[endpoint].send(data)
+
+    def _preflight_due(self) -> bool:
+        return self.preflight and time.time() - self._preflight_at >= self.preflight_ttl
 
     # ------------------------------------------------------------------ #
     #  Connection                                                          #
     # ------------------------------------------------------------------ #
 
     async def connect(self, is_token_price: bool = False) -> bool:
-        """Connect to the WebSocket server using Chrome TLS impersonation via curl_cffi."""
+        """Connect to the WebSocket server using Chrome TLS impersonation via curl_cffi.
+
+        The cluster socket (new pairs, wallets, token rooms) and the token
+        price socket are separate connections; connecting one leaves the
+        other untouched.
+        """
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            return await self._connect(PRICE if is_token_price else CLUSTER)
+
+    async def _connect(self, endpoint: str) -> bool:
         if not self.auth_manager.ensure_valid_authentication():
             self.logger.error("WebSocket authentication failed — unable to obtain valid tokens")
             return False
@@ -142,75 +330,114 @@ class AxiomTradeWebSocketClient:
             self.logger.error("No authentication tokens available")
             return False
 
-        if not self.cf_clearance:
+        if self.preflight and not self._current_cf_clearance():
             self.logger.warning("CF_CLEARANCE not set — connection may be rejected. "
                                 "Set CF_CLEARANCE in .env (DevTools → Application → Cookies → cf_clearance)")
 
-        current_url = self.ws_url_token_price if is_token_price else self.ws_url
-        urls_to_try = [current_url]
-        if not is_token_price:
-            urls_to_try += [
-                "wss://cluster3.axiom.trade/",
-                "wss://cluster5.axiom.trade/",
-                "wss://cluster7.axiom.trade/",
-            ]
+        if endpoint == CLUSTER and self._probe_due():
+            await self._probe_clusters(tokens)
+
+        urls_to_try = self._urls_to_try(endpoint == PRICE)
 
         if CURL_CFFI_AVAILABLE:
-            return await self._connect_curl(tokens, urls_to_try)
-        return await self._connect_websockets(tokens, urls_to_try)
+            connected = await self._connect_curl(tokens, urls_to_try, endpoint)
+        else:
+            connected = await self._connect_websockets(tokens, urls_to_try, endpoint)
+        if connected:
+            self._connections[endpoint].mark_connected()
+            if self._running:
+                self._start_supervisor(endpoint)
+        return connected
 
-    async def _connect_curl(self, tokens, urls_to_try: list) -> bool:
-        """Connect using curl_cffi with Chrome TLS impersonation."""
+    def _cluster_urls(self) -> list:
+        return [self.ws_url] + [u for u in self.ws_fallback_urls if u != self.ws_url]
+
+    def _urls_to_try(self, is_token_price: bool) -> list:
+        """Candidate URLs; the fastest probed cluster first when probing is on, otherwise
+        (after a drop) the cluster following the one that failed."""
+        if is_token_price:
+            return [self.ws_url_token_price]
+        urls = self._cluster_urls()
+        if self.probe_interval is not None and self._probed_at is not None:
+            return self._cluster_probe.rank(urls)
+        last_url = self._connections[CLUSTER].url
+        if last_url in urls:
+            i = urls.index(last_url) + 1
+            urls = urls[i:] + urls[:i]
+        return urls
+
+    async def _prepare_curl(self, tokens) -> None:
         # Re-use session across reconnects so Cloudflare cookies persist
         if self._curl_session is None:
             self._curl_session = CurlAsyncSession(impersonate="chrome136")
 
-        self.logger.info("Running pre-flight requests (curl_cffi / Chrome TLS)...")
-        await self._preflight_curl(self._curl_session, tokens)
+        if self._preflight_due():
+            self.logger.info("Running pre-flight requests (curl_cffi / Chrome TLS)...")
+            await self._preflight_curl(self._curl_session, tokens)
+            self._preflight_at = time.time()
 
-        cookies = self._build_cookies(tokens)
-        ws_headers = {
+    def _curl_ws_headers(self) -> dict:
+        return {
             'Cache-Control': 'no-cache',
             'Pragma': 'no-cache',
             'Accept-Language': 'en,es-CL;q=0.9,es-419;q=0.8,es;q=0.7,fr;q=0.6',
         }
 
+    async def _connect_curl(self, tokens, urls_to_try: list, endpoint: str = CLUSTER) -> bool:
+        """Connect using curl_cffi with Chrome TLS impersonation."""
+        await self._prepare_curl(tokens)
+        conn = self._connections[endpoint]
+
+        cookies = self._build_cookies(tokens)
+        ws_headers = self._curl_ws_headers()
+
         for url in urls_to_try:
             try:
                 self.logger.info(f"Attempting WebSocket: {url}")
+                started = time.perf_counter()
                 ctx = self._curl_session.ws_connect(url, headers=ws_headers, cookies=cookies)
                 ws = await ctx.__aenter__()
-                self._curl_ws_ctx = ctx
-                self._curl_ws = ws
+                conn.curl_ws_ctx = ctx
+                conn.curl_ws = ws
+                conn.url = url
+                self._record_handshake(endpoint, url, time.perf_counter() - started)
                 self.logger.info(f"Connected: {url}")
                 return True
             except Exception as e:
                 self.logger.error(f"Failed {url}: {e}")
-                self._curl_ws = None
-                self._curl_ws_ctx = None
+                self._record_handshake(endpoint, url, None, e)
+                conn.curl_ws = None
+                conn.curl_ws_ctx = None
 
         return False
 
-    async def _connect_websockets(self, tokens, urls_to_try: list) -> bool:
-        """Fallback: connect using the websockets library (may fail Cloudflare TLS check)."""
+    def _prepare_fallback(self, tokens) -> None:
         import requests as _req
-        v = int(time.time() * 1000)
         cookies = self._build_cookies(tokens)
-        session = _req.Session()
-        for k, v_val in cookies.items():
-            session.cookies.set(k, v_val, domain='axiom.trade')
-        headers_http = {**self._common_headers(), 'referer': 'https://axiom.trade/',
-                        'sec-fetch-dest': 'empty', 'sec-fetch-mode': 'cors', 'sec-fetch-site': 'same-site'}
-        for url in [f'https://api.axiom.trade/wo/server-time?v={v}',
-                    f'https://api6.axiom.trade/get-announcement?v={v}']:
-            try:
-                session.get(url, headers=headers_http, timeout=10)
-            except Exception:
-                pass
-        collected = {c.name: c.value for c in session.cookies}
+        if self._preflight_due():
+            v = int(time.time() * 1000)
+            session = _req.Session()
+            for k, v_val in cookies.items():
+                session.cookies.set(k, v_val, domain='axiom.trade')
+            headers_http = {**self._common_headers(), 'referer': 'https://axiom.trade/',
+                            'sec-fetch-dest': 'empty', 'sec-fetch-mode': 'cors', 'sec-fetch-site': 'same-site'}
+            for url in [f'https://api.axiom.trade/wo/server-time?v={v}',
+                        f'https://api6.axiom.trade/get-announcement?v={v}']:
+                try:
+                    sent_at = time.time()
+                    resp = session.get(url, headers=headers_http, timeout=10)
+                    if '/server-time' in url:
+                        self._update_clock_offset(resp, sent_at, time.time())
+                except Exception:
+                    pass
+            self._fallback_cookies = {c.name: c.value for c in session.cookies}
+            self._preflight_at = time.time()
 
+    def _fallback_ws_headers(self, tokens) -> dict:
+        cookies = self._build_cookies(tokens)
+        collected = self._fallback_cookies
         cookie_str = '; '.join(f'{k}={v}' for k, v in {**cookies, **{k: v for k, v in collected.items() if k not in cookies}}.items())
-        ws_headers = {
+        return {
             'Origin': 'https://axiom.trade',
             'Cache-Control': 'no-cache',
             'Accept-Language': 'en,es-CL;q=0.9,es-419;q=0.8,es;q=0.7,fr;q=0.6',
@@ -219,17 +446,104 @@ class AxiomTradeWebSocketClient:
             'Cookie': cookie_str,
         }
 
+    async def _connect_websockets(self, tokens, urls_to_try: list, endpoint: str = CLUSTER) -> bool:
+        """Fallback: connect using the websockets library (may fail Cloudflare TLS check)."""
+        self._prepare_fallback(tokens)
+        conn = self._connections[endpoint]
+        ws_headers = self._fallback_ws_headers(tokens)
+
         for url in urls_to_try:
             try:
                 self.logger.info(f"Attempting WebSocket (fallback): {url}")
-                self.ws = await self._ws_connect_with_headers(url, ws_headers)
+                started = time.perf_counter()
+                conn.ws = await self._ws_connect_with_headers(url, ws_headers)
+                conn.url = url
+                self._record_handshake(endpoint, url, time.perf_counter() - started)
                 self.logger.info(f"Connected (fallback): {url}")
                 return True
             except Exception as e:
                 self.logger.error(f"Failed {url}: {e}")
+                self._record_handshake(endpoint, url, None, e)
 
         return False
 
+    def _record_handshake(self, endpoint: str, url: str, latency: Optional[float],
+                          error: Optional[Exception] = None) -> None:
+        if endpoint == CLUSTER:
+            self._cluster_probe.record(url, latency, None if error is None else str(error) or type(error).__name__)
+
+    def _probe_due(self) -> bool:
+        return self.probe_interval is not None and (
+            self._probed_at is None or time.monotonic() - self._probed_at >= self.probe_interval)
+
+    async def probe_clusters(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Measure the WebSocket handshake latency of every cluster URL
+
+        Each of ``ws_url`` and ``ws_fallback_urls`` is connected to and closed
+        again, concurrently. With ``probe_interval`` set, connect() and
+        reconnects then try the fastest healthy cluster first.
+
+        Returns:
+            dict: url -> probe result, as in get_cluster_stats()['clusters']
+        """
+        if not self.auth_manager.ensure_valid_authentication():
+            raise RuntimeError("WebSocket authentication failed — unable to obtain valid tokens")
+        tokens = self.auth_manager.get_tokens()
+        if not tokens:
+            raise RuntimeError("No authentication tokens available")
+        await self._probe_clusters(tokens)
+        return self._cluster_probe.get_stats()
+
+    async def _probe_clusters(self, tokens) -> None:
+        if CURL_CFFI_AVAILABLE:
+            await self._prepare_curl(tokens)
+        else:
+            self._prepare_fallback(tokens)
+        urls = self._cluster_urls()
+        await asyncio.gather(*(self._probe_url(url, tokens) for url in urls))
+        self._probed_at = time.monotonic()
+        fastest = self._cluster_probe.fastest
+        if fastest is None:
+            self.logger.warning(f"No cluster answered the latency probe ({len(urls)} tried)")
+        else:
+            latency = self._cluster_probe.get_stats()[fastest]['latency_ms']
+            self.logger.info(f"Fastest cluster: {fastest} ({latency:.0f} ms handshake)")
+
+    async def _probe_url(self, url: str, tokens) -> None:
+        started = time.perf_counter()
+        try:
+            if CURL_CFFI_AVAILABLE:
+                ctx = self._curl_session.ws_connect(url, headers=self._curl_ws_headers(),
+                                                    cookies=self._build_cookies(tokens))
+                await asyncio.wait_for(ctx.__aenter__(), self.probe_timeout)
+                latency = time.perf_counter() - started
+                await ctx.__aexit__(None, None, None)
+            else:
+                ws = await asyncio.wait_for(
+                    self._ws_connect_with_headers(url, self._fallback_ws_headers(tokens)), self.probe_timeout)
+                latency = time.perf_counter() - started
+                await ws.close()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.debug(f"Probe of {url} failed: {e}")
+            self._record_handshake(CLUSTER, url, None, e)
+            return
+        self._record_handshake(CLUSTER, url, latency)
+
+    async def _probe_periodically(self) -> None:
+        while not self._closing:
+            elapsed = time.monotonic() - (self._probed_at or 0.0)
+            await asyncio.sleep(max(0.0, self.probe_interval - elapsed))
+            try:
+                await self.probe_clusters()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"Cluster probe failed: {e}")
+                self._probed_at = time.monotonic()
+
     async def _ws_connect_with_headers(self, url: str, headers: dict):
         proxy_url = None
         if hasattr(self.auth_manager, 'proxies') and self.auth_manager.proxies:
@@ -256,38 +570,280 @@ class AxiomTradeWebSocketClient:
     # ------------------------------------------------------------------ #
 
     async def _ensure_connected(self, is_token_price: bool = False) -> bool:
-        connected = self._curl_ws is not None or self.ws is not None
-        if not connected:
+        if self.offline:
+            return True
+        if not self._connections[PRICE if is_token_price else CLUSTER].connected:
             return await self.connect(is_token_price=is_token_price)
         return True
 
-    async def subscribe_new_tokens(self, callback: Callable[[Dict[str, Any]], None]):
-        """Subscribe to new token updates."""
-        if not await self._ensure_connected():
+    def _queue_options(self, queue_size: Optional[int], overflow: Optional[str]) -> Dict[str, Any]:
+        """Resolve per-subscription queue options against the client defaults."""
+        if queue_size is None:
+            queue_size = self.queue_size
+        overflow = overflow or self.overflow
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        if queue_size is not None and queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+        return {'queue_size': queue_size, 'overflow': overflow}
+
+    async def _subscribe(self, key: str, callback: Callable, rooms: List[str],
+                         handlers: Dict[str, Callable[[Any], Awaitable[None]]],
+                         is_token_price: bool = False, queue_size: Optional[int] = None,
+                         overflow: str = "block", raw: bool = False) -> Union[Subscription, bool]:
+        """Register ``handlers`` and join the rooms no other subscription holds yet.
+
+        With ``raw=True`` the handlers get the undecoded Frame instead of its content.
+        """
+        if not await self._ensure_connected(is_token_price=is_token_price):
             return False
-        self._callbacks["new_pairs"] = callback
+
+        subscription = Subscription(self, key, callback, rooms, handlers)
+        subscription.endpoint = PRICE if is_token_price else CLUSTER
+        self._subscriptions[subscription.id] = subscription
+        self._callbacks[key] = callback
+        if raw:
+            entries = dict(handlers)
+        elif queue_size:
+            # Frames are queued undecoded; frames dropped by the overflow
+            # policy (e.g. superseded ticks) are never parsed
+            async def deliver(room, frame):
+                content = self._frame_content(frame)
+                if content is not None:
+                    if frame.received_at is None or self._latency is None:
+                        await subscription.handlers[room](content)
+                    else:
+                        started = time.time()
+                        await subscription.handlers[room](content)
+                        self._latency.observe(room, frame, content, started, time.time())
+
+            subscription.queue = DispatchQueue(deliver, queue_size, overflow, name=key)
+            entries = {room: self._queued_handler(subscription.queue, room) for room in handlers}
+        else:
+            entries = {room: self._inline_handler(handler, room) for room, handler in handlers.items()}
+        for room, entry in entries.items():
+            self._rooms.setdefault(room, {})[subscription.id] = entry
+
+        for room in subscription.rooms:
+            self._room_refs[room] = self._room_refs.get(room, 0) + 1
+            if self._room_refs[room] == 1:
+                self._room_endpoints[room] = subscription.endpoint
+                self._room_last_seen[room] = time.monotonic()
+                self._queue_room_message(subscription.endpoint, "join", room)
+
+        if not self._batch_depth:
+            try:
+                await self._flush_room_messages(subscription.endpoint)
+            except Exception:
+                pending = self._pending_rooms[subscription.endpoint]
+                for room in self._remove_subscription(subscription):
+                    pending.pop(room, None)
+                raise
+        return subscription
+
+    def _queue_room_message(self, endpoint: str, action: str, room: str) -> None:
+        """Queue a join/leave; a join and a leave of the same room that were never sent cancel out."""
+        pending = self._pending_rooms[endpoint]
+        queued = pending.get(room)
+        if queued is None:
+            pending[room] = action
+        elif queued != action:
+            del pending[room]
+
+    async def _flush_room_messages(self, endpoint: str) -> int:
+        """Send the queued join/leave messages of ``endpoint``, honouring ``join_rate``."""
+        pending = self._pending_rooms[endpoint]
+        if self.offline:
+            # No socket to join on; replay() feeds the rooms directly
+            pending.clear()
+            return 0
+        limiter = self._join_limiters.get(endpoint)
+        sent = 0
+        while pending:
+            room, action = pending.popitem(last=False)
+            if limiter is not None:
+                await limiter.acquire()
+            try:
+                await self._send(json.dumps({"action": action, "room": room}), endpoint=endpoint)
+            except Exception:
+                if room not in pending:
+                    pending[room] = action
+                    pending.move_to_end(room, last=False)
+                raise
+            sent += 1
+        return sent
+
+    @asynccontextmanager
+    async def batch(self):
+        """
+        Collect the join/leave messages of the subscribe and unsubscribe
+        calls in the block and send them together on exit.
+
+        Example:
+            async with ws.batch():
+                for token in tokens:
+                    await ws.subscribe_token_price(token, on_price)
+        """
+        self._batch_depth += 1
         try:
-            await self._send(json.dumps({"action": "join", "room": "new_pairs"}))
-            self.logger.info("Subscribed to new token updates")
-            return True
+            yield self
+        finally:
+            self._batch_depth -= 1
+        if not self._batch_depth:
+            for endpoint in self._pending_rooms:
+                await self._flush_room_messages(endpoint)
+
+    def _remove_subscription(self, subscription: Subscription) -> List[str]:
+        """Drop a subscription from the indexes; returns the rooms nobody uses any more."""
+        subscription.active = False
+        self._subscriptions.pop(subscription.id, None)
+
+        for room in subscription.handlers:
+            handlers = self._rooms.get(room)
+            if handlers is not None:
+                handlers.pop(subscription.id, None)
+                if not handlers:
+                    del self._rooms[room]
+
+        released = []
+        for room in subscription.rooms:
+            refs = self._room_refs.get(room, 0) - 1
+            if refs > 0:
+                self._room_refs[room] = refs
+            else:
+                self._room_refs.pop(room, None)
+                self._room_endpoints.pop(room, None)
+                self._room_last_seen.pop(room, None)
+                released.append(room)
+
+        remaining = [s for s in self._subscriptions.values() if s.key == subscription.key]
+        if remaining:
+            self._callbacks[subscription.key] = remaining[-1].callback
+        else:
+            self._callbacks.pop(subscription.key, None)
+        return released
+
+    async def _release_callback_lanes(self, subscription: Subscription) -> None:
+        # A room's callback lane (and its worker task) goes with its last handler
+        for room in subscription.handlers:
+            if room not in self._rooms:
+                await self._callback_pool.release(room)
+
+    async def unsubscribe(self, subscription: Subscription) -> bool:
+        """
+        Remove a subscription returned by one of the subscribe methods.
+
+        Rooms are left only once their last subscription is removed.
+
+        Returns:
+            bool: True if the subscription was active
+        """
+        if not subscription.active:
+            return False
+        released = self._remove_subscription(subscription)
+        if subscription.queue is not None:
+            await subscription.queue.stop()
+        await self._release_callback_lanes(subscription)
+        for room in released:
+            self._queue_room_message(subscription.endpoint, "leave", room)
+        if not self._batch_depth:
+            try:
+                await self._flush_room_messages(subscription.endpoint)
+            except Exception as e:
+                self.logger.warning(f"Failed to leave rooms {released}: {e}")
+        self.logger.info(f"Unsubscribed from {subscription.key}")
+        return True
+
+    async def subscribe_new_tokens(self, callback: Callable[[Dict[str, Any]], None],
+                                   queue_size: Optional[int] = None, overflow: Optional[str] = None,
+                                   typed: bool = False):
+        """Subscribe to new token updates.
+
+        ``queue_size``/``overflow`` override the client's dispatch queue defaults.
+        With ``typed=True`` the callback gets a list of NewPair records
+        instead of content dicts. Pairs are added to ``pair_index`` when the
+        client was created with ``index_new_pairs``.
+
+        Returns:
+            Subscription handle (truthy), or False on failure
+        """
+        options = self._queue_options(queue_size, overflow)
+        callback = self._callback_pool.wrap(callback, "new_pairs", queued=bool(options['queue_size']))
+
+        async def on_new_pair(content):
+            if content:
+                if typed and isinstance(content, dict):
+                    content = NewPair.from_content(content)
+                await callback([content])
+
+        try:
+            subscription = await self._subscribe("new_pairs", callback, ["new_pairs"],
+                                                 {"new_pairs": on_new_pair}, **options)
+            if subscription:
+                self.logger.info("Subscribed to new token updates")
+            return subscription
         except Exception as e:
             self.logger.error(f"Failed to subscribe to new tokens: {e}")
             return False
 
-    async def subscribe_token_price(self, token: str, callback: Callable[[Dict[str, Any]], None]):
-        """Subscribe to token price updates."""
-        if not await self._ensure_connected(is_token_price=True):
-            return False
-        self._callbacks[f"token_price_{token}"] = callback
+    async def subscribe_token_price(self, token: str, callback: Callable[[Dict[str, Any]], None],
+                                    queue_size: Optional[int] = None, overflow: Optional[str] = None,
+                                    conflate: bool = False):
+        """Subscribe to token price updates.
+
+        ``queue_size``/``overflow`` override the client's dispatch queue defaults.
+        With ``conflate=True`` ticks that arrive while ``callback`` is still
+        running collapse into the most recent one, so the callback always
+        gets the latest price and never works through a backlog.
+
+        Returns:
+            Subscription handle (truthy), or False on failure
+        """
+        if conflate:
+            options = self._queue_options(1, "conflate")
+        else:
+            options = self._queue_options(queue_size, overflow)
+        callback = self._callback_pool.wrap(callback, token, queued=bool(options['queue_size']))
+
+        async def on_price(content):
+            if content:
+                await callback(content)
+
         try:
-            await self._send(json.dumps({"action": "join", "room": token}))
-            self.logger.info(f"Subscribed to token price updates for {token}")
-            return True
+            subscription = await self._subscribe(f"token_price_{token}", callback, [token],
+                                                 {token: on_price}, is_token_price=True, **options)
+            if subscription:
+                self.logger.info(f"Subscribed to token price updates for {token}")
+            return subscription
         except Exception as e:
             self.logger.error(f"Failed to subscribe to token price: {e}")
             return False
 
-    async def subscribe_wallet_transactions(self, wallet_address: str, callback: Callable[[Dict[str, Any]], None]):
+    async def subscribe_token_prices(self, tokens: List[str], callback: Callable[[str, Dict[str, Any]], None],
+                                     **kwargs) -> Dict[str, Union[Subscription, bool]]:
+        """Subscribe to price updates of many tokens, joining their rooms in one batch.
+
+        ``callback`` is called as ``callback(token, price)``. Other keyword
+        arguments are those of subscribe_token_price().
+
+        Returns:
+            dict: token -> Subscription handle (or False on failure)
+        """
+        queued = kwargs.get('conflate') or self._queue_options(kwargs.get('queue_size'),
+                                                               kwargs.get('overflow'))['queue_size']
+        subscriptions = {}
+        async with self.batch():
+            for token in tokens:
+                handler = self._callback_pool.wrap(callback, token, queued=bool(queued))
+
+                async def on_price(content, token=token, handler=handler):
+                    await handler(token, content)
+
+                subscriptions[token] = await self.subscribe_token_price(token, on_price, **kwargs)
+        return subscriptions
+
+    async def subscribe_wallet_transactions(self, wallet_address: str, callback: Callable[[Dict[str, Any]], None],
+                                            queue_size: Optional[int] = None, overflow: Optional[str] = None):
         """Subscribe to wallet transaction updates.
 
         Response format:
@@ -302,24 +858,62 @@ class AxiomTradeWebSocketClient:
                 ...
             }
         }
+
+        ``queue_size``/``overflow`` override the client's dispatch queue defaults.
+        With ``track_pnl``, each buy/sell also updates ``pnl``.
+
+        Returns:
+            Subscription handle (truthy), or False on failure
         """
-        if not await self._ensure_connected():
-            return False
-        self._callbacks[f"wallet_transactions_{wallet_address}"] = callback
+        options = self._queue_options(queue_size, overflow)
+        callback = self._callback_pool.wrap(callback, f"v:{wallet_address}", queued=bool(options['queue_size']))
+
+        async def on_transaction(content):
+            if content:
+                await callback(content)
+
+        room = f"v:{wallet_address}"
         try:
-            await self._send(json.dumps({"action": "join", "room": f"v:{wallet_address}"}))
-            self.logger.info(f"Subscribed to wallet transactions for {wallet_address}")
-            return True
+            subscription = await self._subscribe(f"wallet_transactions_{wallet_address}", callback,
+                                                 [room], {room: on_transaction}, **options)
+            if subscription:
+                self.logger.info(f"Subscribed to wallet transactions for {wallet_address}")
+            return subscription
         except Exception as e:
             self.logger.error(f"Failed to subscribe to wallet transactions: {e}")
             return False
 
     async def subscribe_active_users(self, callback: Callable[[int], None],
-                                     token_address: str = "FFcYgSSgWHforA9rXXkA48p8YFoz8TSW85Jpo3CQHDyS"):
-        """Subscribe to active Axiom users count updates for a specific token."""
-        if not await self._ensure_connected():
-            return False
-        self._callbacks[f"active_users_{token_address}"] = callback
+                                     token_address: str = "FFcYgSSgWHforA9rXXkA48p8YFoz8TSW85Jpo3CQHDyS",
+                                     queue_size: Optional[int] = None, overflow: Optional[str] = None):
+        """Subscribe to active Axiom users count updates for a specific token.
+
+        ``queue_size``/``overflow`` override the client's dispatch queue defaults.
+
+        Returns:
+            Subscription handle (truthy), or False on failure
+        """
+        options = self._queue_options(queue_size, overflow)
+        callback = self._callback_pool.wrap(callback, f"e-{token_address}", queued=bool(options['queue_size']))
+
+        async def on_count(content):
+            if content is not None:
+                try:
+                    count = int(content)
+                except (ValueError, TypeError):
+                    self.logger.error(f"Failed to parse active users count: {content}")
+                    return
+                await callback(count)
+
+        async def on_stats(content):
+            if isinstance(content, dict) and "active_users" in content:
+                try:
+                    count = int(content["active_users"])
+                except (ValueError, TypeError):
+                    self.logger.error(f"Failed to parse active users count: {content['active_users']}")
+                    return
+                await callback(count)
+
         rooms = [
             f"t:{token_address}", f"f:{token_address}", f"td:{token_address}",
             f"{token_address}-dex-paid", f"s:{token_address}", f"{token_address}_refresh",
@@ -327,99 +921,570 @@ class AxiomTradeWebSocketClient:
             f"pump-cto:{token_address}", f"e-{token_address}", f"b-{token_address}",
         ]
         try:
-            for room in rooms:
-                await self._send(json.dumps({"action": "join", "room": room}))
-            self.logger.info(f"Subscribed to active users updates for token {token_address}")
-            return True
+            subscription = await self._subscribe(
+                f"active_users_{token_address}", callback, rooms,
+                {f"e-{token_address}": on_count, f"s:{token_address}": on_stats}, **options)
+            if subscription:
+                self.logger.info(f"Subscribed to active users updates for token {token_address}")
+            return subscription
         except Exception as e:
             self.logger.error(f"Failed to subscribe to active users: {e}")
             return False
 
+    # ------------------------------------------------------------------ #
+    #  Streaming API                                                       #
+    # ------------------------------------------------------------------ #
+
+    def stream(self, channel: str, *args, maxsize: int = 1000, overflow: str = "block") -> EventStream:
+        """
+        Iterate over a channel's events instead of passing a callback
+
+        Args:
+            channel: ``new_pairs``, ``token_price`` (token), ``wallet_transactions``
+                (wallet address) or ``active_users`` (optional token address)
+            *args: Channel argument, as for the matching ``subscribe_*`` method
+            maxsize: Maximum number of buffered events
+            overflow: ``block``, ``drop_oldest`` or ``drop_newest`` when the buffer is full
+
+        Returns:
+            EventStream yielding one event per pair, price tick, transaction
+            or active users count. Subscribes on first iteration.
+
+        Example:
+            async for pair in ws.stream("new_pairs"):
+                ...
+        """
+        subscribers = {
+            "new_pairs": self.subscribe_new_tokens,
+            "token_price": self.subscribe_token_price,
+            "wallet_transactions": self.subscribe_wallet_transactions,
+            "active_users": self.subscribe_active_users,
+        }
+        if channel not in subscribers:
+            raise ValueError(f"channel must be one of {tuple(subscribers)}, got {channel!r}")
+        subscribe = subscribers[channel]
+
+        async def open_subscriptions(stream):
+            async def push_pairs(pairs):
+                for pair in pairs:
+                    await stream.push(pair)
+
+            callback = push_pairs if channel == "new_pairs" else stream.push
+            if channel == "active_users":
+                subscription = await subscribe(callback, *args)
+            else:
+                subscription = await subscribe(*args, callback)
+            if not subscription:
+                raise RuntimeError(f"Failed to subscribe to {channel}")
+            return [subscription]
+
+        name = ":".join([channel, *map(str, args)])
+        return EventStream(self, open_subscriptions, maxsize, overflow, name=name)
+
+    def stream_prices(self, tokens: List[str], maxsize: int = 1000, overflow: str = "block") -> EventStream:
+        """
+        Iterate over price ticks of several tokens
+
+        Returns:
+            EventStream yielding ``(token, price)`` tuples
+        """
+        tokens = list(tokens)
+
+        async def open_subscriptions(stream):
+            async def on_price(token, content):
+                await stream.push((token, content))
+
+            subscriptions = await self.subscribe_token_prices(tokens, on_price)
+            failed = [token for token, subscription in subscriptions.items() if not subscription]
+            if failed:
+                for subscription in subscriptions.values():
+                    if subscription:
+                        await self.unsubscribe(subscription)
+                raise RuntimeError(f"Failed to subscribe to token price for {failed}")
+            return list(subscriptions.values())
+
+        return EventStream(self, open_subscriptions, maxsize, overflow, name=f"prices:{len(tokens)}")
+
+    def stream_batches(self, channel: str, *args, max_items: int = 100, max_wait_ms: float = 50.0,
+                       maxsize: int = 1000, overflow: str = "block"):
+        """
+        Iterate over micro-batches of a channel's events
+
+        Each batch holds up to ``max_items`` events and is yielded at most
+        ``max_wait_ms`` after its first event arrived. Other arguments are
+        those of stream().
+
+        Example:
+            async for pairs in ws.stream_batches("new_pairs", max_items=50, max_wait_ms=20):
+                db.insert_many(pairs)
+        """
+        return self.stream(channel, *args, maxsize=maxsize, overflow=overflow).batches(max_items, max_wait_ms)
+
+    # ------------------------------------------------------------------ #
+    #  Recording and replay                                                #
+    # ------------------------------------------------------------------ #
+
+    def start_recording(self, path: str, compresslevel: int = 3) -> FrameRecorder:
+        """
+        Append every received frame to a gzip-compressed log
+
+        Args:
+            path: Log file, appended to if it exists
+            compresslevel: gzip level (1-9)
+
+        Returns:
+            FrameRecorder: the active recorder
+        """
+        self.stop_recording()
+        self._recorder = FrameRecorder(path, compresslevel=compresslevel)
+        self.logger.info(f"Recording WebSocket frames to {path}")
+        return self._recorder
+
+    def stop_recording(self) -> None:
+        """Stop recording and close the log."""
+        recorder, self._recorder = self._recorder, None
+        if recorder is not None:
+            recorder.close()
+            self.logger.info(f"Recorded {recorder.frames} frames to {recorder.path}")
+
+    async def replay(self, path: str, speed: Optional[float] = 1.0) -> int:
+        """
+        Feed a recording through the subscribed callbacks
+
+        Use with ``offline=True`` to subscribe without connecting, so
+        backtests run without network access.
+
+        Args:
+            path: Log written by start_recording()
+            speed: 1.0 for recorded timing, N for N times faster, None for max speed
+
+        Returns:
+            int: Number of frames replayed
+        """
+        return await ReplaySource(path, speed).run(self)
+
     # ------------------------------------------------------------------ #
     #  Message loop                                                        #
     # ------------------------------------------------------------------ #
 
-    async def _dispatch(self, raw: str) -> None:
-        """Route a raw JSON message to the appropriate callback."""
-        try:
-            data = json.loads(raw)
-        except json.JSONDecodeError:
-            self.logger.error(f"Failed to parse WebSocket message: {raw[:200]}")
+    def _frame_content(self, frame: Frame) -> Any:
+        content = frame.content
+        if frame.error is not None:
+            self.logger.error(f"Failed to parse WebSocket message: {frame.raw[:200]}")
+        return content
+
+    def _inline_handler(self, handler: Callable[[Any], Awaitable[None]],
+                        room: str = "") -> Callable[[Frame], Awaitable[None]]:
+        async def on_frame(frame):
+            content = self._frame_content(frame)
+            if content is not None:
+                if frame.received_at is None or self._latency is None:
+                    await handler(content)
+                else:
+                    started = time.time()
+                    await handler(content)
+                    self._latency.observe(room, frame, content, started, time.time())
+        return on_frame
+
+    def _queued_handler(self, queue: DispatchQueue, room: str) -> Callable[[Frame], Awaitable[None]]:
+        async def enqueue(frame):
+            # An empty frame must not displace a pending one under conflation
+            empty = frame.content is None if frame.decoded else has_no_content(frame.raw)
+            if not empty:
+                await queue.put(room, frame)
+        return enqueue
+
+    async def _dispatch(self, raw: Union[str, bytes], received_at: Optional[float] = None) -> None:
+        """Route a raw JSON message to the appropriate callback.
+
+        The room is read from the raw frame first, so frames for rooms without
+        a handler (most of the active-users rooms, for instance) are dropped
+        without being decoded. ``received_at`` (epoch seconds) is passed by the
+        receive loops when latency tracking is on.
+
+        ``state``, ``pair_index`` and ``pnl`` are updated here, once per frame,
+        before the frame reaches the subscriptions sharing its room.
+        """
+        room = extract_room(raw)
+        if room is None:
+            frame = Frame(raw, self._json_loads, received_at=received_at)
+            data = frame.data
+            if frame.error is not None:
+                self.logger.error(f"Failed to parse WebSocket message: {raw[:200]}")
+                return
+            room = data.get("room", "") if isinstance(data, dict) else ""
+            frame.room = room
+        elif room not in self._rooms:
+            self._stats['messages_skipped'] += 1
             return
+        else:
+            frame = Frame(raw, self._json_loads, room, received_at=received_at)
 
-        room = data.get("room", "")
-        content = data.get("content")
-
-        if "new_pairs" in self._callbacks and room == "new_pairs" and content:
-            await self._callbacks["new_pairs"]([content])
-
-        for key, cb in list(self._callbacks.items()):
-            if key.startswith("active_users_"):
-                addr = key[len("active_users_"):]
-                if room == f"e-{addr}" and content is not None:
-                    try:
-                        await cb(int(content))
-                    except (ValueError, TypeError):
-                        self.logger.error(f"Failed to parse active users count: {content}")
-                elif room == f"s:{addr}" and isinstance(content, dict) and "active_users" in content:
-                    await cb(int(content["active_users"]))
-
-            elif key.startswith("token_price_"):
-                token = key[len("token_price_"):]
-                if room == token and content:
-                    await cb(content)
-
-            elif key.startswith("wallet_transactions_"):
-                wallet = key[len("wallet_transactions_"):]
-                if room == f"v:{wallet}" and content:
-                    await cb(content)
-
-    async def _message_handler_curl(self) -> None:
+        handlers = self._rooms.get(room)
+        if not handlers:
+            return
+        self._room_last_seen[room] = time.monotonic()
+        if self.state is not None or self.pair_index is not None or self.pnl is not None:
+            try:
+                self._track(frame)
+            except Exception as e:
+                self.logger.error(f"Failed to track frame from {room}: {e}")
+        for handler in list(handlers.values()):
+            await handler(frame)
+
+    def _track(self, frame: Frame) -> None:
+        """Feed ``frame`` to ``state``, ``pair_index`` and ``pnl`` by its room kind."""
+        room, state = frame.room, self.state
+        if room == "new_pairs":
+            if self.pair_index is None:
+                return
+        elif room.startswith("v:"):
+            if state is None and self.pnl is None:
+                return
+        elif state is None or not (room.startswith(("e-", "s:")) or self._room_endpoints.get(room) == PRICE):
+            return
+        content = frame.content
+        if room.startswith("e-"):
+            try:
+                state.update_active_users(room[2:], int(content))
+            except (ValueError, TypeError):
+                pass  # logged by the subscription's handler
+        elif not content:
+            return
+        elif room == "new_pairs":
+            if isinstance(content, dict):
+                self.pair_index.add_content(content)
+        elif room.startswith("v:"):
+            if state is not None:
+                state.update_wallet_trade(room[2:], content)
+            if self.pnl is not None and isinstance(content, dict):
+                self.pnl.add_trade(content, room[2:])
+        elif room.startswith("s:"):
+            if isinstance(content, dict) and "active_users" in content:
+                try:
+                    state.update_active_users(room[2:], int(content["active_users"]))
+                except (ValueError, TypeError):
+                    pass  # logged by the subscription's handler
+        else:
+            state.update_price(room, content)
+
+    async def _message_handler_curl(self, conn: WsConnection = None) -> None:
         """Message loop for curl_cffi AsyncWebSocket."""
-        while self._curl_ws is not None:
+        conn = conn or self._connections[CLUSTER]
+        while conn.curl_ws is not None:
+            # Only a failed recv() ends the loop (and triggers a reconnect);
+            # errors raised while handling a frame are logged per frame
             try:
-                data, _ = await self._curl_ws.recv()
-                if data:
-                    await self._dispatch(data.decode('utf-8', errors='replace'))
+                data, _ = await conn.curl_ws.recv()
             except asyncio.CancelledError:
+                self._closing = True
                 break
             except Exception as e:
-                self.logger.warning(f"WebSocket connection closed: {e}")
+                self.logger.warning(f"WebSocket connection closed ({conn.name}): {e}")
                 break
+            conn.last_frame_at = time.monotonic()
+            if not data:
+                continue
+            received_at = time.time() if self._latency is not None else None
+            conn.stats['messages_received'] += 1
+            if self._recorder is not None:
+                self._recorder.write(data, conn.name, received_at)
+            try:
+                await self._dispatch(data, received_at)
+            except asyncio.CancelledError:
+                self._closing = True
+                break
+            except Exception as e:
+                self.logger.error(f"Error handling message: {e}")
 
-    async def _message_handler_websockets(self) -> None:
+    async def _message_handler_websockets(self, conn: WsConnection = None) -> None:
         """Message loop for websockets fallback."""
+        conn = conn or self._connections[CLUSTER]
         try:
-            async for message in self.ws:
+            async for message in conn.ws:
+                conn.last_frame_at = time.monotonic()
+                received_at = time.time() if self._latency is not None else None
+                conn.stats['messages_received'] += 1
+                if self._recorder is not None:
+                    self._recorder.write(message, conn.name, received_at)
                 try:
-                    await self._dispatch(message)
+                    await self._dispatch(message, received_at)
                 except Exception as e:
                     self.logger.error(f"Error handling message: {e}")
         except Exception as e:
-            self.logger.warning(f"WebSocket connection closed: {e}")
+            self.logger.warning(f"WebSocket connection closed ({conn.name}): {e}")
 
     async def start(self):
-        """Start the WebSocket client and message handler."""
-        if not await self._ensure_connected():
+        """Start the WebSocket client and message handlers.
+
+        Every connected endpoint (cluster and token price) gets its own
+        receive loop; an endpoint connected later by a new subscription is
+        picked up automatically. With ``auto_reconnect`` a dropped connection
+        is re-established with exponential backoff and jitter, rotating
+        through the cluster URLs, and its rooms are joined again. Runs until
+        close() is called or every endpoint gives up after
+        ``max_reconnect_attempts`` consecutive failures.
+        """
+        self._closing = False
+        if not any(conn.connected for conn in self._connections.values()):
+            if not await self._ensure_connected():
+                return
+        self._running = True
+        try:
+            for name, conn in self._connections.items():
+                if conn.connected:
+                    self._start_supervisor(name)
+            while True:
+                pending = [task for task in self._supervisors.values() if not task.done()]
+                if not pending:
+                    break
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception() is not None:
+                        self.logger.error(f"WebSocket receive loop failed: {task.exception()}")
+        finally:
+            self._running = False
+            for task in self._supervisors.values():
+                if not task.done():
+                    task.cancel()
+            self._supervisors.clear()
+
+    def _start_supervisor(self, endpoint: str) -> None:
+        task = self._supervisors.get(endpoint)
+        if task is None or task.done():
+            self._supervisors[endpoint] = asyncio.ensure_future(self._supervise(self._connections[endpoint]))
+
+    async def _supervise(self, conn: WsConnection) -> None:
+        """Receive on ``conn`` and reconnect it when it drops or goes stale."""
+        while not self._closing:
+            helpers = []
+            if self.heartbeat_interval or self.stale_timeout or self.curl_stale_timeout:
+                helpers.append(asyncio.ensure_future(self._watchdog(conn)))
+            if conn.name == CLUSTER and self.probe_interval is not None:
+                helpers.append(asyncio.ensure_future(self._probe_periodically()))
+            try:
+                if conn.curl_ws is not None:
+                    await self._message_handler_curl(conn)
+                elif conn.ws is not None:
+                    await self._message_handler_websockets(conn)
+            finally:
+                for helper in helpers:
+                    helper.cancel()
+
+            if self._closing or not self.auto_reconnect:
+                break
+            if conn.name == CLUSTER and conn.url:
+                # Rank the cluster that just dropped behind the others until it is probed again
+                self._record_handshake(CLUSTER, conn.url, None, ConnectionError("disconnected"))
+            conn.mark_disconnected()
+            if not await self._reconnect(conn):
+                break
+
+    async def _watchdog(self, conn: WsConnection) -> None:
+        """Ping ``conn`` when idle and drop it once silent for ``stale_timeout``.
+
+        On curl_cffi, where pongs are not seen, ``curl_stale_timeout`` applies
+        instead and a ping that cannot be sent drops the socket.
+        """
+        stale_timeout = self.stale_timeout if conn.reports_pongs else self.curl_stale_timeout
+        if not (self.heartbeat_interval or stale_timeout):
             return
-        if self._curl_ws is not None:
-            await self._message_handler_curl()
-        elif self.ws is not None:
-            await self._message_handler_websockets()
+        tick = min(t for t in (self.heartbeat_interval, stale_timeout) if t) / 2
+        while conn.connected and not self._closing:
+            await asyncio.sleep(tick)
+            silent = conn.silent_for
+            if silent is None:
+                return
+            if stale_timeout and silent >= stale_timeout:
+                conn.stats['stale_reconnects'] += 1
+                self.logger.warning(f"No frames on {conn.name} socket for {silent:.0f}s, reconnecting")
+                # Closing the transport ends the receive loop; the supervisor reconnects
+                await conn.drop()
+                return
+            if self.heartbeat_interval and silent >= self.heartbeat_interval:
+                try:
+                    await conn.ping(timeout=self.heartbeat_interval)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.logger.debug(f"Ping on {conn.name} socket failed: {e}")
+                    if not conn.reports_pongs:
+                        self.logger.warning(f"Cannot ping {conn.name} socket, reconnecting")
+                        await conn.drop()
+                        return
 
-    async def close(self):
-        """Close the WebSocket connection."""
-        if self._curl_ws_ctx is not None:
+    def get_room_silence(self, min_silence: float = 0.0) -> Dict[str, float]:
+        """
+        Seconds since each subscribed room last received a frame
+
+        Rooms that have not received anything yet count from their join.
+
+        Args:
+            min_silence: Only report rooms silent for at least this many seconds
+
+        Returns:
+            dict: room -> seconds, most silent first
+        """
+        now = time.monotonic()
+        silence = ((room, now - seen) for room, seen in self._room_last_seen.items())
+        return dict(sorted(((room, s) for room, s in silence if s >= min_silence),
+                           key=lambda item: item[1], reverse=True))
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter in [delay/2, delay]."""
+        delay = min(self.reconnect_max_delay, self.reconnect_base_delay * (2 ** attempt))
+        return delay / 2 + random.random() * delay / 2
+
+    async def _reconnect(self, conn: WsConnection) -> bool:
+        """Reconnect ``conn`` with backoff and replay the joins of its rooms."""
+        await conn.drop()
+        attempt = 0
+        while not self._closing:
+            if self.max_reconnect_attempts is not None and attempt >= self.max_reconnect_attempts:
+                self.logger.error(f"Giving up on {conn.name} socket after {attempt} reconnect attempts")
+                return False
+            delay = self._backoff_delay(attempt)
+            attempt += 1
+            conn.stats['reconnect_attempts'] += 1
+            self.logger.warning(f"Reconnecting {conn.name} socket in {delay:.1f}s (attempt {attempt})")
+            await asyncio.sleep(delay)
+            if self._closing:
+                break
             try:
-                await self._curl_ws_ctx.__aexit__(None, None, None)
-            except Exception:
-                pass
-            self._curl_ws = None
-            self._curl_ws_ctx = None
-        if self.ws is not None:
-            await self.ws.close()
-            self.ws = None
+                connected = await self.connect(is_token_price=conn.name == PRICE)
+            except Exception as e:
+                self.logger.error(f"Reconnect failed: {e}")
+                connected = False
+            if not connected:
+                continue
+
+            # The new socket has no rooms: rebuild the queue from the current ones
+            rooms = [room for room, endpoint in self._room_endpoints.items() if endpoint == conn.name]
+            self._pending_rooms[conn.name].clear()
+            for room in rooms:
+                self._queue_room_message(conn.name, "join", room)
+            try:
+                await self._flush_room_messages(conn.name)
+            except Exception as e:
+                self.logger.error(f"Failed to rejoin rooms: {e}")
+                await conn.drop()
+                continue
+
+            downtime = conn.mark_reconnected()
+            self.logger.info(f"Reconnected {conn.name} socket after {downtime:.1f}s, rejoined {len(rooms)} rooms")
+            return True
+        return False
+
+    def get_queue_stats(self) -> List[Dict[str, Any]]:
+        """
+        Dispatch queue counters of every queued subscription
+
+        Returns:
+            list: One DispatchQueue.get_stats() dict per subscription, with its ``key``
+        """
+        return [{'key': sub.key, **sub.queue.get_stats()}
+                for sub in self._subscriptions.values() if sub.queue is not None]
+
+    def get_callback_stats(self) -> Dict[str, Any]:
+        """
+        Counters of the pool running plain (non-async) callbacks
+
+        Returns:
+            dict: CallbackPool.get_stats() (executor ``kind``, ``lanes``,
+            ``pending``, ``max_depth``, ``delivered``, ``errors``)
+        """
+        return self._callback_pool.get_stats()
+
+    def get_latency_stats(self, rooms: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Per-room latency histograms (requires ``track_latency=True``)
+
+        Each room has ``network`` (server event time to receive, using the
+        server clock offset measured by the pre-flight), ``decode``,
+        ``queue`` (receive to callback start), ``callback`` and ``total``
+        stages, summarised as count, mean/min/max and p50/p90/p99 in ms.
+
+        Args:
+            rooms: Only report these rooms
+
+        Returns:
+            dict: ``clock_offset``, ``rooms`` and ``overall`` (all rooms merged)
+        """
+        if self._latency is None:
+            raise RuntimeError("Latency tracking is off; create the client with track_latency=True")
+        return self._latency.get_stats(rooms)
+
+    def reset_latency_stats(self) -> None:
+        """Clear the latency histograms."""
+        if self._latency is not None:
+            self._latency.reset()
+
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """
+        Connection health counters
+
+        Returns:
+            dict: ``connects``, ``disconnects``, ``reconnect_attempts``,
+            ``messages_received``/``messages_skipped``, ``uptime``/``downtime``
+            seconds (including the current period), ``connected``, ``url``,
+            ``gaps`` (recent outages with their start/end times),
+            ``estimated_missed_messages`` (downtime times the message rate
+            observed while connected), ``stale_reconnects``/``pings`` from
+            the heartbeat watchdog and the same figures per socket under
+            ``endpoints`` (each with its ``silent_for`` seconds)
+        """
+        endpoints = {name: conn.get_stats() for name, conn in self._connections.items()}
+        stats = {key: sum(e[key] for e in endpoints.values())
+                 for key in ('connects', 'disconnects', 'reconnect_attempts', 'stale_reconnects',
+                             'pings', 'messages_received', 'uptime', 'downtime',
+                             'estimated_missed_messages')}
+        stats['messages_skipped'] = self._stats['messages_skipped']
+        stats['connected'] = any(e['connected'] for e in endpoints.values())
+        stats['url'] = endpoints[CLUSTER]['url'] or endpoints[PRICE]['url']
+        stats['gaps'] = sorted((gap for e in endpoints.values() for gap in e['gaps']),
+                               key=lambda gap: gap['disconnected_at'] or 0)
+        stats['endpoints'] = endpoints
+        return stats
+
+    def get_cluster_stats(self) -> Dict[str, Any]:
+        """
+        Cluster handshake latencies, from probes and connect attempts
+
+        Returns:
+            dict: ``preferred`` (fastest healthy cluster URL or None), the
+            ``order`` the next connect would try, ``probe_interval``,
+            ``last_probe_age`` in seconds (None before the first probe) and
+            per-URL ``clusters`` results: ``healthy``, average and last
+            handshake ``latency_ms``, ``successes``, ``failures``,
+            ``last_error``, ``probed_at``
+        """
+        return {
+            'preferred': self._cluster_probe.fastest,
+            'order': self._urls_to_try(False),
+            'probe_interval': self.probe_interval,
+            'last_probe_age': None if self._probed_at is None else time.monotonic() - self._probed_at,
+            'clusters': self._cluster_probe.get_stats(),
+        }
+
+    async def close(self):
+        """Close the WebSocket connections."""
+        self._closing = True
+        current = asyncio.current_task()
+        for task in self._supervisors.values():
+            if task is not current and not task.done():
+                task.cancel()
+        for conn in self._connections.values():
+            conn.mark_closed()
+            await conn.drop()
+        for subscription in list(self._subscriptions.values()):
+            if subscription.queue is not None:
+                await subscription.queue.stop()
+        for stream in list(self._streams):
+            stream._finish()
+        await self._callback_pool.close()
+        self.stop_recording()
         if self._curl_session is not None:
             await self._curl_session.close()
             self._curl_session = None
+        self._preflight_at = 0.0
         self.logger.info("WebSocket connection closed")
@@ -0,0 +1,139 @@
+import json
+import re
+import time
+from typing import Any, Callable, Optional, Tuple, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+JSON_BACKENDS = ("auto", "orjson", "msgspec", "json")
+
+# "room": "<plain string>" — escaped room names fall back to a full decode
+_ROOM_RE = re.compile(r'"room"\s*:\s*"([^"\\]*)"')
+_ROOM_RE_BYTES = re.compile(rb'"room"\s*:\s*"([^"\\]*)"')
+_NULL_CONTENT_RE = re.compile(r'"content"\s*:\s*null\b')
+_NULL_CONTENT_RE_BYTES = re.compile(rb'"content"\s*:\s*null\b')
+
+
+def resolve_json_backend(backend: str = "auto") -> Tuple[str, Callable[[Union[str, bytes]], Any]]:
+    """
+    Pick the JSON decoder used for WebSocket frames
+
+    Args:
+        backend: ``auto`` (orjson, then msgspec, then json), ``orjson``, ``msgspec`` or ``json``
+
+    Returns:
+        tuple: (backend name, loads function accepting str or bytes)
+    """
+    if backend not in JSON_BACKENDS:
+        raise ValueError(f"json_backend must be one of {JSON_BACKENDS}, got {backend!r}")
+    if backend in ("auto", "orjson") and ORJSON_AVAILABLE:
+        return "orjson", orjson.loads
+    if backend in ("auto", "msgspec") and MSGSPEC_AVAILABLE:
+        return "msgspec", msgspec.json.decode
+    if backend not in ("auto", "json"):
+        raise ImportError(f"{backend} is not installed. Install with: pip install {backend}")
+    return "json", json.loads
+
+
+def extract_room(raw: Union[str, bytes]) -> Optional[str]:
+    """
+    Read the ``room`` field of a frame without decoding it
+
+    Only the simple case is handled: exactly one ``"room"`` key whose value is
+    a plain string, with no nested object or array before it (so it is a
+    top-level key). Anything else returns None and the caller falls back to
+    a full decode, so a wrong room is never returned.
+    """
+    if isinstance(raw, bytes):
+        prefix, quote, pattern, key, nested = b'{"room":"', b'"', _ROOM_RE_BYTES, b'"room"', (b'{', b'[')
+    else:
+        prefix, quote, pattern, key, nested = '{"room":"', '"', _ROOM_RE, '"room"', ('{', '[')
+
+    # Fast path: the server puts "room" first, so it is the top-level key
+    if raw.startswith(prefix):
+        end = raw.find(quote, 9)
+        room = raw[9:end] if end > 0 else None
+        if room is None or (b'\\' if isinstance(room, bytes) else '\\') in room:
+            return None
+    else:
+        match = pattern.search(raw)
+        if match is None or raw.find(key) != match.start() or raw.find(key, match.end()) >= 0:
+            return None
+        # Any brace or bracket after the opening one may start a nested value
+        start = raw.find(nested[0])
+        if start < 0 or any(raw.find(c, start + 1, match.start()) >= 0 for c in nested):
+            return None
+        room = match.group(1)
+    return room.decode('utf-8', errors='replace') if isinstance(room, bytes) else room
+
+
+def has_no_content(raw: Union[str, bytes]) -> bool:
+    """
+    True when a frame certainly has no ``content`` (missing or null)
+
+    Frames with several ``"content"`` keys are never reported as empty.
+    """
+    if isinstance(raw, bytes):
+        pattern, key = _NULL_CONTENT_RE_BYTES, b'"content"'
+    else:
+        pattern, key = _NULL_CONTENT_RE, '"content"'
+    start = raw.find(key)
+    if start < 0:
+        return True
+    if raw.find(key, start + 9) >= 0:
+        return False
+    return pattern.match(raw, start) is not None
+
+
+class Frame:
+    """A received frame whose JSON is decoded on first access.
+
+    ``received_at`` is only set when latency tracking is on; decoding is then
+    timed into ``decode_time``.
+    """
+
+    __slots__ = ('raw', 'room', '_data', '_loads', 'error', 'received_at', 'decode_time')
+
+    def __init__(self, raw: Union[str, bytes], loads: Callable, room: Optional[str] = None,
+                 data: Any = None, received_at: Optional[float] = None) -> None:
+        self.raw = raw
+        self.room = room
+        self._data = data
+        self._loads = loads
+        self.error: Optional[Exception] = None
+        self.received_at = received_at
+        self.decode_time: Optional[float] = None
+
+    @property
+    def decoded(self) -> bool:
+        """True once decoding has been attempted"""
+        return self._data is not None or self.error is not None
+
+    @property
+    def data(self) -> Any:
+        """Decoded frame (None when it is not valid JSON)"""
+        if self._data is None and self.error is None:
+            started = time.perf_counter() if self.received_at is not None else None
+            try:
+                self._data = self._loads(self.raw)
+            except Exception as e:
+                self.error = e
+            if started is not None:
+                self.decode_time = time.perf_counter() - started
+        return self._data
+
+    @property
+    def content(self) -> Any:
+        """The frame's ``content`` field"""
+        data = self.data
+        return data.get("content") if isinstance(data, dict) else None
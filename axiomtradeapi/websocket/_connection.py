@@ -0,0 +1,156 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+CLUSTER = "cluster"
+PRICE = "price"
+
+
+class WsConnection:
+    """
+    One socket of AxiomTradeWebSocketClient.
+
+    The client keeps one per endpoint (``cluster`` for new pairs, wallets and
+    token rooms, ``price`` for token price ticks) and tracks the health of
+    each separately.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.curl_ws = None       # curl_cffi WebSocket object
+        self.curl_ws_ctx = None   # async context manager (must be kept alive)
+        self.ws = None            # websockets fallback
+        self.url: Optional[str] = None
+        self.connected_since: Optional[float] = None
+        self.disconnected_at: Optional[float] = None
+        # time.monotonic() of the last frame received (pongs included on the
+        # websockets transport only; curl_cffi drops pongs before recv())
+        self.last_frame_at: Optional[float] = None
+        self.stats = {
+            'connects': 0,
+            'disconnects': 0,
+            'reconnect_attempts': 0,
+            'stale_reconnects': 0,
+            'pings': 0,
+            'messages_received': 0,
+            'uptime': 0.0,
+            'downtime': 0.0,
+        }
+        self.gaps: deque = deque(maxlen=100)
+
+    @property
+    def connected(self) -> bool:
+        return self.curl_ws is not None or self.ws is not None
+
+    @property
+    def reports_pongs(self) -> bool:
+        """Whether a pong refreshes ``last_frame_at`` (not on curl_cffi)"""
+        return self.curl_ws is None and self.ws is not None
+
+    async def send(self, data: str) -> None:
+        """Send a text message over whichever transport is active.
+
+        Raises ConnectionError when no transport took the message.
+        """
+        if self.curl_ws is not None:
+            try:
+                await self.curl_ws.send(data.encode(), 1)  # 1 = CURLWS_TEXT
+                return
+            except Exception as e:
+                if self.ws is None:
+                    raise ConnectionError(f"Send on {self.name} socket failed: {e}") from e
+        if self.ws is None:
+            raise ConnectionError(f"{self.name} socket is not connected")
+        await self.ws.send(data)
+
+    async def ping(self, timeout: float = 10.0) -> None:
+        """Send a WebSocket ping.
+
+        On websockets the pong is awaited and counts as a received frame.
+        curl_cffi answers the server's pings but never hands pongs to recv(),
+        so on that transport only a failed send says anything about the socket.
+        """
+        self.stats['pings'] += 1
+        if self.curl_ws is not None:
+            await self.curl_ws.send(b"", 16)  # 16 = CURLWS_PING
+        elif self.ws is not None:
+            pong = await self.ws.ping()
+            await asyncio.wait_for(pong, timeout)
+            self.last_frame_at = time.monotonic()
+
+    @property
+    def silent_for(self) -> Optional[float]:
+        """Seconds since the last received frame (None when not connected)"""
+        if not self.connected or self.last_frame_at is None:
+            return None
+        return time.monotonic() - self.last_frame_at
+
+    async def drop(self) -> None:
+        """Discard the socket; the client keeps the HTTP session."""
+        if self.curl_ws_ctx is not None:
+            try:
+                await self.curl_ws_ctx.__aexit__(None, None, None)
+            except Exception:
+                pass
+        self.curl_ws = None
+        self.curl_ws_ctx = None
+        if self.ws is not None:
+            try:
+                await self.ws.close()
+            except Exception:
+                pass
+            self.ws = None
+
+    # ------------------------------------------------------------------ #
+    #  Health accounting                                                   #
+    # ------------------------------------------------------------------ #
+
+    def mark_connected(self) -> None:
+        self.stats['connects'] += 1
+        self.connected_since = time.time()
+        self.last_frame_at = time.monotonic()
+
+    def mark_disconnected(self) -> None:
+        now = time.time()
+        self.stats['disconnects'] += 1
+        if self.connected_since is not None:
+            self.stats['uptime'] += now - self.connected_since
+            self.connected_since = None
+        self.disconnected_at = now
+
+    def mark_reconnected(self) -> float:
+        """Close the current outage; returns its length in seconds"""
+        reconnected_at = time.time()
+        downtime = reconnected_at - (self.disconnected_at or reconnected_at)
+        self.stats['downtime'] += downtime
+        self.gaps.append({'endpoint': self.name,
+                          'disconnected_at': self.disconnected_at,
+                          'reconnected_at': reconnected_at,
+                          'downtime': downtime})
+        self.disconnected_at = None
+        return downtime
+
+    def mark_closed(self) -> None:
+        now = time.time()
+        if self.connected_since is not None:
+            self.stats['uptime'] += now - self.connected_since
+            self.connected_since = None
+        if self.disconnected_at is not None:
+            self.stats['downtime'] += now - self.disconnected_at
+            self.disconnected_at = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.time()
+        stats = dict(self.stats)
+        if self.connected_since is not None:
+            stats['uptime'] += now - self.connected_since
+        if self.disconnected_at is not None:
+            stats['downtime'] += now - self.disconnected_at
+        rate = stats['messages_received'] / stats['uptime'] if stats['uptime'] > 0 else 0.0
+        stats['estimated_missed_messages'] = int(stats['downtime'] * rate)
+        stats['connected'] = self.connected
+        stats['silent_for'] = self.silent_for
+        stats['url'] = self.url
+        stats['gaps'] = list(self.gaps)
+        return stats
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest", "conflate")
+
+
+class DispatchQueue:
+    """
+    Bounded queue between the receive loop and one subscription's callback.
+
+    The receive loop only enqueues; a worker task awaits the callback, so a
+    slow consumer no longer stalls socket reads. When the queue is full the
+    ``overflow`` policy decides what happens:
+
+    - ``block``: the receive loop waits for space (backpressure)
+    - ``drop_oldest``: the oldest pending frame is discarded
+    - ``drop_newest``: the incoming frame is discarded
+    - ``conflate``: only the latest pending frame per room is kept; a frame
+      for a room that is not queued yet evicts the oldest one when full
+    """
+
+    def __init__(self, deliver: Callable[[str, Any], Awaitable[None]], maxsize: int = 1000,
+                 overflow: str = "block", name: str = "") -> None:
+        """
+        Initialize DispatchQueue
+
+        Args:
+            deliver: Coroutine function called as ``deliver(room, content)``
+            maxsize: Maximum number of pending frames
+            overflow: One of ``block``, ``drop_oldest``, ``drop_newest``, ``conflate``
+            name: Label used in log messages
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.deliver = deliver
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.name = name
+        self.logger = logging.getLogger(__name__)
+
+        # conflate keeps one entry per room, the other policies a plain FIFO
+        self._items = OrderedDict() if overflow == "conflate" else deque()
+        self._not_empty: Optional[asyncio.Event] = None
+        self._not_full: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._stats = {'enqueued': 0, 'delivered': 0, 'dropped': 0, 'max_depth': 0, 'errors': 0}
+
+    @property
+    def depth(self) -> int:
+        """Number of frames waiting for the callback"""
+        return len(self._items)
+
+    def _ensure_worker(self) -> None:
+        # Events and the task are created lazily so they bind to the running loop
+        if self._worker is None or self._worker.done():
+            self._not_empty = asyncio.Event()
+            self._not_full = asyncio.Event()
+            if self._items:
+                self._not_empty.set()
+            if len(self._items) < self.maxsize:
+                self._not_full.set()
+            self._worker = asyncio.ensure_future(self._run())
+
+    async def put(self, room: str, content: Any) -> None:
+        """Enqueue a frame, applying the overflow policy when full."""
+        self._ensure_worker()
+        items = self._items
+
+        if self.overflow == "conflate":
+            if room in items:
+                items[room] = content
+                self._stats['dropped'] += 1
+                return
+            if len(items) >= self.maxsize:
+                items.popitem(last=False)
+                self._stats['dropped'] += 1
+            items[room] = content
+        elif len(items) >= self.maxsize:
+            if self.overflow == "drop_newest":
+                self._stats['dropped'] += 1
+                return
+            if self.overflow == "drop_oldest":
+                items.popleft()
+                self._stats['dropped'] += 1
+            else:
+                while len(items) >= self.maxsize and self._worker is not None:
+                    self._not_full.clear()
+                    await self._not_full.wait()
+            items.append((room, content))
+        else:
+            items.append((room, content))
+
+        self._stats['enqueued'] += 1
+        self._stats['max_depth'] = max(self._stats['max_depth'], len(items))
+        if len(items) >= self.maxsize:
+            self._not_full.clear()
+        self._not_empty.set()
+
+    def _pop(self):
+        if isinstance(self._items, OrderedDict):
+            return self._items.popitem(last=False)
+        return self._items.popleft()
+
+    async def _run(self) -> None:
+        while True:
+            if not self._items:
+                self._not_empty.clear()
+                await self._not_empty.wait()
+                continue
+            room, content = self._pop()
+            self._not_full.set()
+            try:
+                await self.deliver(room, content)
+                self._stats['delivered'] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats['errors'] += 1
+                self.logger.error(f"Callback error in {self.name or 'subscription'}: {e}")
+
+    async def stop(self) -> None:
+        """Stop the worker; pending frames stay queued until the next put()."""
+        worker, self._worker = self._worker, None
+        if self._not_full is not None:
+            self._not_full.set()  # release a put() blocked on a full queue
+        if worker is not None and not worker.done():
+            worker.cancel()
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Queue counters
+
+        Returns:
+            dict: ``depth``, ``max_depth``, ``maxsize``, ``overflow`` and the
+            ``enqueued``/``delivered``/``dropped``/``errors`` counters
+        """
+        return {'depth': self.depth, 'maxsize': self.maxsize, 'overflow': self.overflow,
+                **self._stats}
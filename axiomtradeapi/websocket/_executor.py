@@ -0,0 +1,142 @@
+import asyncio
+import functools
+import inspect
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from ._dispatch import DispatchQueue
+
+EXECUTOR_KINDS = ("thread", "process")
+
+
+def is_async_callable(fn: Callable) -> bool:
+    """Whether calling ``fn`` returns a coroutine (coroutine functions, async __call__, partials of them)."""
+    while isinstance(fn, functools.partial):
+        fn = fn.func
+    return (asyncio.iscoroutinefunction(fn)
+            or asyncio.iscoroutinefunction(getattr(fn, '__call__', None)))
+
+
+async def _ignore(*args) -> None:
+    pass
+
+
+class CallbackPool:
+    """
+    Runs synchronous callbacks on a thread or process pool, in order per room.
+
+    Each room gets a lane: a DispatchQueue whose worker hands one call at a
+    time to the executor, so calls for a room run in the order their frames
+    arrived while different rooms run in parallel. The receive loop only
+    enqueues; it waits only when a lane already holds ``max_pending`` calls.
+    """
+
+    def __init__(self, executor: Union[str, Executor] = "thread", max_workers: Optional[int] = None,
+                 max_pending: int = 1000) -> None:
+        """
+        Initialize CallbackPool
+
+        Args:
+            executor: ``thread``, ``process`` or an Executor instance (which
+                is used as is and not shut down by close()). Callbacks and
+                their arguments must be picklable for ``process``, and so
+                must their return value: a plain function that returns a
+                coroutine cannot run there (make the callback ``async def``,
+                which runs on the loop, instead).
+            max_workers: Pool size when the pool is created here
+            max_pending: Calls queued per room before the receive loop waits
+        """
+        if isinstance(executor, str) and executor not in EXECUTOR_KINDS:
+            raise ValueError(f"executor must be one of {EXECUTOR_KINDS} or an Executor, got {executor!r}")
+        self.kind = executor if isinstance(executor, str) else type(executor).__name__
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.logger = logging.getLogger(__name__)
+
+        self._owned = isinstance(executor, str)
+        self._executor: Optional[Executor] = None if self._owned else executor
+        self._lanes: Dict[str, DispatchQueue] = {}
+
+    def _get_executor(self) -> Executor:
+        # Owned pools are created on first use and again after close()
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="axiom-callback")
+        return self._executor
+
+    async def _call(self, callback: Callable, args: tuple, state: Dict[str, bool]) -> None:
+        result = await asyncio.get_event_loop().run_in_executor(self._get_executor(), callback, *args)
+        if inspect.isawaitable(result):
+            # A plain function returning a coroutine (a lambda around an async
+            # callback, say): run it on the loop from now on
+            state['async'] = True
+            await result
+
+    async def _run(self, room: str, call) -> None:
+        await self._call(*call)
+
+    def wrap(self, callback: Callable, room: str, queued: bool = False) -> Callable[..., Awaitable[None]]:
+        """
+        Coroutine function calling ``callback`` on the pool
+
+        Coroutine functions are returned unchanged and keep running on the
+        loop. Other callables go through the lane of ``room``; with
+        ``queued=True`` (the subscription has its own DispatchQueue, which
+        already orders calls and applies its overflow policy) the returned
+        function waits for the call to finish instead. ``None`` becomes a
+        no-op, for subscriptions that only feed the client's state store.
+        """
+        if callback is None:
+            return _ignore
+        if is_async_callable(callback):
+            return callback
+        state = {'async': False}
+
+        async def submit(*args):
+            if state['async']:
+                await callback(*args)
+            elif queued:
+                await self._call(callback, args, state)
+            else:
+                lane = self._lanes.get(room)
+                if lane is None:
+                    lane = self._lanes[room] = DispatchQueue(self._run, self.max_pending,
+                                                             name=f"callbacks:{room}")
+                await lane.put(room, (callback, args, state))
+        return submit
+
+    async def release(self, room: str) -> None:
+        """Stop and drop the lane of ``room`` once its last subscription is gone."""
+        lane = self._lanes.pop(room, None)
+        if lane is not None:
+            await lane.stop()
+
+    async def close(self) -> None:
+        """Stop the lanes and shut down the pool if it was created here."""
+        lanes, self._lanes = self._lanes, {}
+        await asyncio.gather(*(lane.stop() for lane in lanes.values()))
+        if self._owned and self._executor is not None:
+            executor, self._executor = self._executor, None
+            executor.shutdown(wait=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Pool counters
+
+        Returns:
+            dict: the executor ``kind``, number of ``lanes``, calls ``pending``
+            and the ``delivered``/``errors`` totals over all lanes
+        """
+        lanes = [lane.get_stats() for lane in self._lanes.values()]
+        return {
+            'kind': self.kind,
+            'lanes': len(lanes),
+            'pending': sum(s['depth'] for s in lanes),
+            'max_depth': max((s['max_depth'] for s in lanes), default=0),
+            'delivered': sum(s['delivered'] for s in lanes),
+            'errors': sum(s['errors'] for s in lanes),
+        }
@@ -0,0 +1,323 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Dict, Optional, Set
+
+from ._client import AxiomTradeWebSocketClient
+from ._connection import CLUSTER, PRICE
+
+# Longest line (one frame or hub message) read from the Unix socket; the
+# asyncio default of 64 KiB is smaller than large market frames
+HUB_LINE_LIMIT = 64 * 1024 * 1024
+
+
+async def _read_line(reader: asyncio.StreamReader, stats: Dict[str, int]) -> bytes:
+    """
+    Next newline-terminated line, or b'' at end of stream
+
+    A line longer than the reader's limit is skipped whole (counted in
+    ``stats['oversize_lines']``), so the stream stays in sync.
+    """
+    skipping = False
+    while True:
+        try:
+            line = await reader.readuntil(b'\n')
+        except asyncio.LimitOverrunError as e:
+            # Discard what is buffered and keep skipping up to the newline
+            await reader.readexactly(e.consumed)
+            skipping = True
+            continue
+        except asyncio.IncompleteReadError:
+            return b''
+        if not skipping:
+            return line
+        skipping = False
+        stats['oversize_lines'] = stats.get('oversize_lines', 0) + 1
+
+
+class _Consumer:
+    """One process connected to the hub."""
+
+    def __init__(self, writer: asyncio.StreamWriter, max_buffer: int) -> None:
+        self.writer = writer
+        self.max_buffer = max_buffer
+        self.rooms: Set[str] = set()
+        self.sent = 0
+        self.dropped = 0
+
+    def send(self, line: bytes) -> None:
+        # Never await a consumer: a slow one loses frames instead of
+        # stalling the upstream receive loop for everybody
+        transport = self.writer.transport
+        if transport.is_closing() or transport.get_write_buffer_size() > self.max_buffer:
+            self.dropped += 1
+            return
+        self.writer.write(line)
+        self.sent += 1
+
+
+class WebSocketHub:
+    """
+    Shares one upstream AxiomTradeWebSocketClient with local processes.
+
+    Consumers (HubClient) connect over a Unix domain socket and send the
+    same join/leave messages the Axiom server expects. The hub joins each
+    room upstream once, however many consumers want it, and forwards the
+    raw frames without decoding them. N strategy processes then cost one
+    authenticated connection (one pre-flight, one Cloudflare session).
+    """
+
+    def __init__(self, client: AxiomTradeWebSocketClient, path: str,
+                 max_buffer: int = 4 * 1024 * 1024, line_limit: int = HUB_LINE_LIMIT) -> None:
+        """
+        Initialize WebSocketHub
+
+        Args:
+            client: Upstream client (authenticated, not started)
+            path: Unix domain socket path consumers connect to
+            max_buffer: Bytes buffered per consumer before its frames are dropped
+            line_limit: Longest consumer message accepted (longer ones are skipped)
+        """
+        self.client = client
+        self.path = path
+        self.max_buffer = max_buffer
+        self.line_limit = line_limit
+        self.logger = logging.getLogger("AxiomTradeWebSocketHub")
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._consumers: Set[_Consumer] = set()
+        self._room_consumers: Dict[str, Set[_Consumer]] = {}
+        self._room_subscriptions: Dict[str, Any] = {}
+        self._stats: Dict[str, int] = {'oversize_lines': 0}
+
+    async def start(self) -> None:
+        """Listen for consumers (returns once the socket is bound)."""
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # stale socket of a previous run
+        self._server = await asyncio.start_unix_server(self._serve, path=self.path, limit=self.line_limit)
+        self.logger.info(f"WebSocket hub listening on {self.path}")
+
+    async def serve_forever(self) -> None:
+        """Listen for consumers and run the upstream client until close() is called."""
+        if self._server is None:
+            await self.start()
+        await self.client.start()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        consumer = _Consumer(writer, self.max_buffer)
+        self._consumers.add(consumer)
+        try:
+            while True:
+                line = await _read_line(reader, self._stats)
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    room = message["room"]
+                    action = message["action"]
+                except (ValueError, KeyError, TypeError):
+                    self.logger.warning(f"Ignoring malformed hub message: {line[:200]!r}")
+                    continue
+                if action == "join":
+                    await self._join(consumer, room, message.get("endpoint", CLUSTER))
+                elif action == "leave":
+                    await self._leave(consumer, room)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._consumers.discard(consumer)
+            for room in list(consumer.rooms):
+                await self._leave(consumer, room)
+            writer.close()
+
+    def _forwarder(self, room: str):
+        consumers = self._room_consumers[room]
+
+        async def forward(frame):
+            raw = frame.raw.encode('utf-8') if isinstance(frame.raw, str) else frame.raw
+            line = raw.replace(b'\n', b' ') + b'\n'
+            for consumer in consumers:
+                consumer.send(line)
+        return forward
+
+    async def _join(self, consumer: _Consumer, room: str, endpoint: str) -> None:
+        if room in consumer.rooms:
+            return
+        consumer.rooms.add(room)
+        consumers = self._room_consumers.get(room)
+        if consumers is not None:
+            consumers.add(consumer)
+            return
+        self._room_consumers[room] = {consumer}
+        try:
+            subscription = await self.client._subscribe(
+                f"hub:{room}", None, [room], {room: self._forwarder(room)},
+                is_token_price=endpoint == PRICE, raw=True)
+        except Exception as e:
+            self.logger.error(f"Failed to join {room} upstream: {e}")
+            subscription = False
+        if not subscription:
+            for waiting in self._room_consumers.pop(room, ()):
+                waiting.rooms.discard(room)
+            return
+        self._room_subscriptions[room] = subscription
+
+    async def _leave(self, consumer: _Consumer, room: str) -> None:
+        consumer.rooms.discard(room)
+        consumers = self._room_consumers.get(room)
+        if consumers is None:
+            return
+        consumers.discard(consumer)
+        if not consumers:
+            del self._room_consumers[room]
+            subscription = self._room_subscriptions.pop(room, None)
+            if subscription is not None:
+                await self.client.unsubscribe(subscription)
+
+    async def close(self) -> None:
+        """Disconnect consumers, stop listening and close the upstream client."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for consumer in list(self._consumers):
+            consumer.writer.close()
+        await self.client.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Hub counters
+
+        Returns:
+            dict: ``consumers``, upstream ``rooms``, ``oversize_lines``
+            (consumer messages over ``line_limit``) and per-consumer
+            ``sent``/``dropped`` frame counts and room counts
+        """
+        return {
+            'consumers': len(self._consumers),
+            'rooms': len(self._room_consumers),
+            'oversize_lines': self._stats['oversize_lines'],
+            'per_consumer': [{'rooms': len(c.rooms), 'sent': c.sent, 'dropped': c.dropped}
+                             for c in self._consumers],
+        }
+
+
+class HubClient(AxiomTradeWebSocketClient):
+    """
+    AxiomTradeWebSocketClient that receives its frames from a WebSocketHub.
+
+    Offers the same subscribe/stream API; joins and leaves go to the hub
+    over its Unix socket instead of to Axiom, so no authentication is needed.
+    """
+
+    _requires_auth = False
+
+    def __init__(self, path: str, log_level=logging.INFO, line_limit: int = HUB_LINE_LIMIT,
+                 **kwargs) -> None:
+        """
+        Initialize HubClient
+
+        Args:
+            path: Unix socket of the hub
+            log_level: Logging level
+            line_limit: Largest frame accepted from the hub (larger ones are skipped)
+            **kwargs: Dispatch options of AxiomTradeWebSocketClient
+                (queue_size, overflow, json_backend, track_latency,
+                auto_reconnect, reconnect_* ...)
+        """
+        kwargs.setdefault('heartbeat_interval', None)
+        kwargs.setdefault('stale_timeout', None)
+        super().__init__(None, log_level=log_level, **kwargs)
+        self.path = path
+        self.line_limit = line_limit
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._hub_stats = {'connects': 0, 'disconnects': 0, 'messages_received': 0, 'oversize_lines': 0}
+
+    async def _ensure_connected(self, is_token_price: bool = False) -> bool:
+        if self._writer is None:
+            return await self.connect(is_token_price)
+        return True
+
+    async def connect(self, is_token_price: bool = False) -> bool:
+        """Connect to the hub (one connection carries every room)."""
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._writer is not None:
+                return True
+            try:
+                self._reader, self._writer = await asyncio.open_unix_connection(self.path, limit=self.line_limit)
+            except (OSError, ConnectionError) as e:
+                self.logger.error(f"Failed to connect to hub at {self.path}: {e}")
+                return False
+        self._hub_stats['connects'] += 1
+        return True
+
+    async def _send(self, data: str, endpoint: str = CLUSTER) -> None:
+        message = json.loads(data)
+        message['endpoint'] = endpoint
+        self._writer.write(json.dumps(message).encode('utf-8') + b'\n')
+
+    async def start(self):
+        """Receive frames from the hub until close() is called; reconnects like the upstream client."""
+        self._closing = False
+        if not await self._ensure_connected():
+            return
+        attempt = 0
+        while not self._closing:
+            reader = self._reader
+            try:
+                while True:
+                    line = await _read_line(reader, self._hub_stats)
+                    if not line:
+                        break
+                    self._hub_stats['messages_received'] += 1
+                    try:
+                        await self._dispatch(line[:-1])
+                    except Exception as e:
+                        self.logger.error(f"Error handling message: {e}")
+            except ConnectionError as e:
+                self.logger.warning(f"Hub connection closed: {e}")
+            if self._closing or not self.auto_reconnect:
+                break
+            self._hub_stats['disconnects'] += 1
+            self._writer = None
+            while not self._closing:
+                if self.max_reconnect_attempts is not None and attempt >= self.max_reconnect_attempts:
+                    self.logger.error(f"Giving up on hub after {attempt} reconnect attempts")
+                    return
+                await asyncio.sleep(self._backoff_delay(attempt))
+                attempt += 1
+                if await self.connect():
+                    attempt = 0
+                    for pending in self._pending_rooms.values():
+                        pending.clear()
+                    for room, endpoint in self._room_endpoints.items():
+                        self._queue_room_message(endpoint, "join", room)
+                    for endpoint in self._pending_rooms:
+                        await self._flush_room_messages(endpoint)
+                    break
+
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """
+        Hub connection counters
+
+        Returns:
+            dict: ``connects``, ``disconnects``, ``messages_received``,
+            ``messages_skipped``, ``oversize_lines`` (frames over
+            ``line_limit``), ``connected`` and the hub ``path``
+        """
+        return {**self._hub_stats, 'messages_skipped': self._stats['messages_skipped'],
+                'connected': self._writer is not None, 'path': self.path}
+
+    async def close(self):
+        """Disconnect from the hub."""
+        self._closing = True
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
+        await super().close()
@@ -0,0 +1,212 @@
+import bisect
+import email.utils
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+STAGES = ("network", "decode", "queue", "callback", "total")
+
+# Content fields carrying the server-side event time, in order of preference
+SERVER_TIME_KEYS = ("created_at", "createdAt", "pairCreatedAt", "timestamp")
+
+# Bucket upper bounds in milliseconds; the last bucket is open-ended
+_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """
+    Epoch seconds from an ISO-8601 string or an epoch number (s or ms)
+
+    Returns None for anything else.
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value / 1000.0 if value > 1e11 else float(value)
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            parsed = datetime.fromisoformat(text)  # handles "Z" and any fraction on 3.11+
+            return parsed.timestamp() if parsed.tzinfo is not None else None
+        except ValueError:
+            pass
+        try:
+            return parse_timestamp(float(text))
+        except ValueError:
+            pass
+        if text.endswith('Z'):
+            text = text[:-1] + '+00:00'
+        # fromisoformat() before 3.11 takes exactly 0, 3 or 6 fraction digits
+        if '.' in text:
+            head, _, tail = text.partition('.')
+            digits = len(tail) - len(tail.lstrip('0123456789'))
+            fraction = (tail[:digits] + '000000')[:6]
+            text = f"{head}.{fraction}{tail[digits:]}"
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            return None
+        return parsed.timestamp()
+    return None
+
+
+def server_timestamp(content: Any) -> Optional[float]:
+    """Server event time of a frame's content, or None if it has none"""
+    if not isinstance(content, dict):
+        return None
+    for key in SERVER_TIME_KEYS:
+        if key in content:
+            ts = parse_timestamp(content[key])
+            if ts is not None:
+                return ts
+    return None
+
+
+def clock_offset_from_response(body: Any, date_header: Optional[str], sent_at: float,
+                               received_at: float) -> Optional[float]:
+    """
+    Server clock minus local clock, from a server-time response
+
+    The server time is read from the body (a number, an ISO string or a dict
+    holding one) and compared with the midpoint of the request. The HTTP
+    ``Date`` header, with one-second resolution, is the fallback.
+    """
+    server_time = None
+    if isinstance(body, dict):
+        for key in ("serverTime", "server_time", "time", "now", "timestamp"):
+            if key in body:
+                server_time = parse_timestamp(body[key])
+                if server_time is not None:
+                    break
+    else:
+        server_time = parse_timestamp(body)
+    if server_time is None and date_header:
+        try:
+            server_time = email.utils.parsedate_to_datetime(date_header).timestamp()
+        except (TypeError, ValueError):
+            server_time = None
+    if server_time is None:
+        return None
+    return server_time - (sent_at + received_at) / 2
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)."""
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, seconds: float) -> None:
+        ms = seconds * 1000.0 if seconds > 0 else 0.0
+        self.counts[bisect.bisect_left(_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if self.min is None or ms < self.min:
+            self.min = ms
+        if self.max is None or ms > self.max:
+            self.max = ms
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Upper bound of the bucket holding the p-th percentile (max for the open bucket)"""
+        if not self.count:
+            return None
+        rank = p / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(_BUCKETS_MS[i], self.max) if i < len(_BUCKETS_MS) else self.max
+        return self.max
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count if self.count else None,
+            'min_ms': self.min,
+            'max_ms': self.max,
+            'p50_ms': self.percentile(50),
+            'p90_ms': self.percentile(90),
+            'p99_ms': self.percentile(99),
+            'buckets': {(f"<={bound}" if i < len(_BUCKETS_MS) else f">{_BUCKETS_MS[-1]}"): n
+                        for i, (bound, n) in enumerate(zip(_BUCKETS_MS + (None,), self.counts)) if n},
+        }
+
+
+class LatencyTracker:
+    """
+    Per-room latency histograms of AxiomTradeWebSocketClient.
+
+    Stages (seconds, recorded per frame that reaches a callback):
+
+    - ``network``: receive time minus the server event time in the content
+      (``created_at`` ...), corrected by ``clock_offset``
+    - ``decode``: JSON decoding of the frame
+    - ``queue``: receive to callback start (decode and queue wait included)
+    - ``callback``: callback start to end
+    - ``total``: receive to callback end
+    """
+
+    def __init__(self, clock_offset: Optional[float] = None) -> None:
+        self.clock_offset = clock_offset  # server clock minus local clock
+        self._rooms: Dict[str, Dict[str, LatencyHistogram]] = {}
+
+    def _stages(self, room: str) -> Dict[str, LatencyHistogram]:
+        stages = self._rooms.get(room)
+        if stages is None:
+            stages = self._rooms[room] = {stage: LatencyHistogram() for stage in STAGES}
+        return stages
+
+    def record(self, room: str, stage: str, seconds: float) -> None:
+        self._stages(room)[stage].record(seconds)
+
+    def observe(self, room: str, frame, content: Any, started: float, finished: float) -> None:
+        """Record all stages of one delivered frame."""
+        received_at = frame.received_at
+        if received_at is None:
+            return
+        stages = self._stages(room)
+        if frame.decode_time is not None:
+            stages["decode"].record(frame.decode_time)
+        stages["queue"].record(started - received_at)
+        stages["callback"].record(finished - started)
+        stages["total"].record(finished - received_at)
+        sent_at = server_timestamp(content)
+        if sent_at is not None:
+            stages["network"].record(received_at - (sent_at - (self.clock_offset or 0.0)))
+
+    def reset(self) -> None:
+        self._rooms.clear()
+
+    def get_stats(self, rooms: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Histogram summaries
+
+        Returns:
+            dict: ``clock_offset``, ``rooms`` ({room: {stage: stats}}) and
+            ``overall`` ({stage: stats} over all rooms)
+        """
+        overall: Dict[str, LatencyHistogram] = {}
+        for stages in self._rooms.values():
+            for stage, histogram in stages.items():
+                if not histogram.count:
+                    continue
+                merged = overall.setdefault(stage, LatencyHistogram())
+                merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+                merged.count += histogram.count
+                merged.total += histogram.total
+                for bound in (histogram.min, histogram.max):
+                    if bound is not None:
+                        merged.min = bound if merged.min is None else min(merged.min, bound)
+                        merged.max = bound if merged.max is None else max(merged.max, bound)
+        selected = self._rooms if rooms is None else {r: self._rooms[r] for r in rooms if r in self._rooms}
+        return {
+            'clock_offset': self.clock_offset,
+            'rooms': {room: {stage: stages[stage].get_stats() for stage in STAGES if stages[stage].count}
+                      for room, stages in selected.items()},
+            'overall': {stage: overall[stage].get_stats() for stage in STAGES if stage in overall},
+        }
@@ -0,0 +1,239 @@
+import asyncio
+import itertools
+import json
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set
+
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+# Frame generators, keyed by the rate names accepted by MockAxiomServer
+FRAME_KINDS = ("new_pairs", "price", "wallet", "active_users")
+
+
+def _room_kind(room: str) -> Optional[str]:
+    if room == "new_pairs":
+        return "new_pairs"
+    if room.startswith("v:"):
+        return "wallet"
+    if room.startswith("e-"):
+        return "active_users"
+    if ":" in room or "-" in room or "_" in room:
+        return None  # token detail rooms (t:, f:, b-, ...) stay silent
+    return "price"
+
+
+def _iso_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+class MockAxiomServer:
+    """
+    Local stand-in for the Axiom WebSocket servers.
+
+    Speaks the same protocol: clients send ``{"action": "join"|"leave",
+    "room": ...}`` and receive ``{"room": ..., "content": ...}`` frames.
+    Synthetic frames are emitted for joined rooms at the configured rates
+    (frames per second per room) for ``new_pairs``, ``price`` (token rooms),
+    ``wallet`` (``v:`` rooms) and ``active_users`` (``e-`` rooms).
+    push() sends a specific frame and drop_connections() simulates an
+    outage, so reconnect handling and dispatch throughput can be tested
+    without the live servers.
+
+    Point a client at it with ``ws_url``/``ws_url_token_price`` and
+    ``preflight=False``:
+
+        async with MockAxiomServer(rates={"price": 100}) as server:
+            ws = AxiomTradeWebSocketClient(auth_manager, preflight=False)
+            ws.ws_url = ws.ws_url_token_price = server.url
+            ws.ws_fallback_urls = []
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 rates: Optional[Dict[str, float]] = None, seed: Optional[int] = None,
+                 handshake_delay: float = 0.0) -> None:
+        """
+        Initialize MockAxiomServer
+
+        Args:
+            host: Interface to listen on
+            port: Port (0 picks a free one; see ``url`` after start())
+            rates: Frames per second per joined room, by kind
+                (``new_pairs``, ``price``, ``wallet``, ``active_users``)
+            seed: Seed for the synthetic data
+            handshake_delay: Seconds added to every opening handshake, to
+                simulate a distant cluster
+        """
+        if not WEBSOCKETS_AVAILABLE:
+            raise ImportError("websockets is required for MockAxiomServer. Install with: pip install websockets")
+        rates = dict(rates or {})
+        unknown = set(rates) - set(FRAME_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown frame kinds {sorted(unknown)}; expected {FRAME_KINDS}")
+        self.host = host
+        self.port = port
+        self.rates = rates
+        self.handshake_delay = handshake_delay
+        self.logger = logging.getLogger("MockAxiomServer")
+
+        self._random = random.Random(seed)
+        self._counter = itertools.count(1)
+        self._server = None
+        self._emitters: Dict[str, asyncio.Task] = {}
+        self._connections: Dict[Any, Set[str]] = {}
+        self._stats = {'connections': 0, 'drops': 0, 'joins': 0, 'leaves': 0, 'frames_sent': 0}
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/"
+
+    async def start(self) -> "MockAxiomServer":
+        """Start listening and emitting."""
+        self._server = await websockets.serve(self._handle, self.host, self.port,
+                                              process_request=self._process_request)
+        self.port = list(self._server.sockets)[0].getsockname()[1]
+        for kind, rate in self.rates.items():
+            if rate and rate > 0:
+                self._emitters[kind] = asyncio.ensure_future(self._emit(kind, rate))
+        self.logger.info(f"Mock Axiom server listening on {self.url}")
+        return self
+
+    async def close(self) -> None:
+        """Stop emitting and close every connection."""
+        for task in self._emitters.values():
+            task.cancel()
+        await asyncio.gather(*self._emitters.values(), return_exceptions=True)
+        self._emitters.clear()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "MockAxiomServer":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    # ------------------------------------------------------------------ #
+    #  Protocol                                                            #
+    # ------------------------------------------------------------------ #
+
+    async def _process_request(self, *args) -> None:
+        # Runs before the handshake response, for both websockets APIs
+        if self.handshake_delay:
+            await asyncio.sleep(self.handshake_delay)
+
+    async def _handle(self, ws, path: Optional[str] = None) -> None:
+        rooms: Set[str] = set()
+        self._connections[ws] = rooms
+        self._stats['connections'] += 1
+        try:
+            async for message in ws:
+                try:
+                    data = json.loads(message)
+                    action, room = data["action"], data["room"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+                if action == "join":
+                    rooms.add(room)
+                    self._stats['joins'] += 1
+                elif action == "leave":
+                    rooms.discard(room)
+                    self._stats['leaves'] += 1
+        except Exception:
+            pass
+        finally:
+            self._connections.pop(ws, None)
+
+    def rooms(self) -> Set[str]:
+        """Rooms joined by at least one connection"""
+        return set().union(*self._connections.values()) if self._connections else set()
+
+    async def push(self, room: str, content: Any) -> int:
+        """
+        Send a frame to every connection that joined ``room``
+
+        Returns:
+            int: Number of connections it was sent to
+        """
+        frame = json.dumps({"room": room, "content": content}, separators=(',', ':'))
+        sent = 0
+        for ws, rooms in list(self._connections.items()):
+            if room in rooms:
+                try:
+                    await ws.send(frame)
+                except Exception:
+                    continue
+                sent += 1
+        self._stats['frames_sent'] += sent
+        return sent
+
+    async def drop_connections(self) -> int:
+        """Abort every connection without a close handshake, like a network outage."""
+        connections = list(self._connections)
+        for ws in connections:
+            ws.transport.abort()
+        self._stats['drops'] += len(connections)
+        return len(connections)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Server counters
+
+        Returns:
+            dict: ``connections``/``drops`` so far, ``joins``/``leaves``,
+            ``frames_sent``, currently ``open`` connections and joined ``rooms``
+        """
+        return {**self._stats, 'open': len(self._connections), 'rooms': len(self.rooms())}
+
+    # ------------------------------------------------------------------ #
+    #  Synthetic frames                                                    #
+    # ------------------------------------------------------------------ #
+
+    def make_content(self, kind: str, room: str) -> Any:
+        """A synthetic ``content`` payload of ``kind`` for ``room``."""
+        n = next(self._counter)
+        rnd = self._random
+        if kind == "new_pairs":
+            return {
+                "pair_address": f"MockPair{n:036d}", "token_address": f"MockMint{n:036d}",
+                "token_name": f"Mock Token {n}", "token_ticker": f"MOCK{n % 10000}",
+                "protocol": "Pump V1", "deployer_address": f"MockDev{rnd.randrange(1000):037d}",
+                "initial_liquidity_sol": round(rnd.uniform(5, 80), 4), "initial_liquidity_token": 1_000_000_000,
+                "supply": 1_000_000_000, "dev_holds_percent": round(rnd.uniform(0, 20), 2),
+                "lp_burned": 100, "created_at": _iso_now(),
+            }
+        if kind == "price":
+            return {"tokenAddress": room, "price": round(rnd.uniform(1e-6, 1e-3), 10),
+                    "priceUsd": round(rnd.uniform(1e-4, 0.1), 8), "created_at": int(time.time() * 1000)}
+        if kind == "wallet":
+            sol = round(rnd.uniform(0.01, 10), 6)
+            return {"created_at": _iso_now(), "maker_address": room[2:], "type": rnd.choice(("buy", "sell")),
+                    "total_sol": sol, "total_usd": round(sol * 150, 2), "signature": f"MockSig{n:080d}"}
+        if kind == "active_users":
+            return str(rnd.randrange(1, 5000))
+        raise ValueError(f"Unknown frame kind {kind!r}")
+
+    async def _emit(self, kind: str, rate: float) -> None:
+        # Frames are released in 10 ms ticks so high rates do not depend on
+        # the timer resolution
+        loop = asyncio.get_event_loop()
+        started = loop.time()
+        emitted = 0
+        while True:
+            await asyncio.sleep(0.01)
+            due = int((loop.time() - started) * rate) - emitted
+            if due <= 0:
+                continue
+            emitted += due
+            rooms = [room for room in self.rooms() if _room_kind(room) == kind]
+            for _ in range(due):
+                for room in rooms:
+                    await self.push(room, self.make_content(kind, room))
@@ -0,0 +1,225 @@
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from ._latency import parse_timestamp
+
+
+def _first(content: Dict[str, Any], *keys: str) -> Any:
+    for key in keys:
+        value = content.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return None if value is None else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class NewPair:
+    """A pair from the ``new_pairs`` room.
+
+    Built from the room content, which uses snake_case keys
+    (``pair_address``, ``deployer_address``...); the camelCase keys of the
+    REST API are accepted too. ``raw`` keeps the original dict.
+    """
+
+    __slots__ = ('pair_address', 'mint', 'ticker', 'name', 'creator', 'protocol',
+                 'created_at', 'supply', 'liquidity_sol', 'received_at', 'raw')
+
+    def __init__(self, pair_address: Optional[str], mint: Optional[str], ticker: Optional[str],
+                 name: Optional[str] = None, creator: Optional[str] = None,
+                 protocol: Optional[str] = None, created_at: Optional[float] = None,
+                 supply: Optional[float] = None, liquidity_sol: Optional[float] = None,
+                 received_at: Optional[float] = None, raw: Optional[Dict[str, Any]] = None) -> None:
+        self.pair_address = pair_address
+        self.mint = mint
+        self.ticker = ticker
+        self.name = name
+        self.creator = creator
+        self.protocol = protocol
+        self.created_at = created_at
+        self.supply = supply
+        self.liquidity_sol = liquidity_sol
+        self.received_at = time.time() if received_at is None else received_at
+        self.raw = raw
+
+    @classmethod
+    def from_content(cls, content: Dict[str, Any], received_at: Optional[float] = None) -> "NewPair":
+        """Build a NewPair from a ``new_pairs`` room content dict."""
+        return cls(
+            pair_address=_first(content, 'pair_address', 'pairAddress'),
+            mint=_first(content, 'token_address', 'tokenAddress'),
+            ticker=_first(content, 'token_ticker', 'tokenTicker'),
+            name=_first(content, 'token_name', 'tokenName'),
+            creator=_first(content, 'deployer_address', 'deployerAddress', 'creator', 'creatorAddress'),
+            protocol=_first(content, 'protocol', 'display_protocol'),
+            created_at=parse_timestamp(_first(content, 'created_at', 'createdAt', 'pairCreatedAt')),
+            supply=_float(content.get('supply')),
+            liquidity_sol=_float(_first(content, 'initial_liquidity_sol', 'liquiditySol')),
+            received_at=received_at,
+            raw=content,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The typed fields as a dict (without ``raw``)"""
+        return {name: getattr(self, name) for name in self.__slots__ if name != 'raw'}
+
+    def __repr__(self) -> str:
+        return f"<NewPair {self.ticker} mint={self.mint} creator={self.creator}>"
+
+
+def _ticker_key(ticker: Any) -> Optional[str]:
+    return str(ticker).strip().upper() if ticker else None
+
+
+class NewPairIndex:
+    """
+    Rolling index of recent new pairs by creator, ticker and mint.
+
+    Pairs are kept for ``retention`` seconds (and at most ``max_pairs``),
+    ordered by receive time, so adding a pair and evicting old ones is O(1)
+    amortised. Windowed counts walk back from the newest entry and stop at
+    the window edge. Tickers are matched case-insensitively.
+    """
+
+    def __init__(self, retention: float = 3600.0, max_pairs: int = 100_000) -> None:
+        """
+        Initialize NewPairIndex
+
+        Args:
+            retention: Seconds a pair stays in the index
+            max_pairs: Maximum number of pairs kept (oldest evicted first)
+        """
+        if retention <= 0:
+            raise ValueError("retention must be positive")
+        if max_pairs < 1:
+            raise ValueError("max_pairs must be at least 1")
+        self.retention = retention
+        self.max_pairs = max_pairs
+        self._pairs: Deque[NewPair] = deque()
+        self._by_creator: Dict[str, Deque[NewPair]] = {}
+        self._by_ticker: Dict[str, Deque[NewPair]] = {}
+        self._by_mint: Dict[str, NewPair] = {}
+        self._stats = {'added': 0, 'evicted': 0}
+
+    def add(self, pair: NewPair) -> None:
+        """Index ``pair`` and evict pairs older than ``retention``."""
+        self._pairs.append(pair)
+        if pair.creator:
+            self._by_creator.setdefault(pair.creator, deque()).append(pair)
+        ticker = _ticker_key(pair.ticker)
+        if ticker:
+            self._by_ticker.setdefault(ticker, deque()).append(pair)
+        if pair.mint:
+            self._by_mint[pair.mint] = pair
+        self._stats['added'] += 1
+        self._evict(pair.received_at)
+
+    def add_content(self, content: Dict[str, Any], received_at: Optional[float] = None) -> NewPair:
+        """Index a raw ``new_pairs`` content dict; returns its NewPair."""
+        pair = NewPair.from_content(content, received_at)
+        self.add(pair)
+        return pair
+
+    def _evict(self, now: float) -> None:
+        pairs = self._pairs
+        cutoff = now - self.retention
+        while pairs and (len(pairs) > self.max_pairs or pairs[0].received_at < cutoff):
+            old = pairs.popleft()
+            # Every per-key deque is in arrival order, so ``old`` is at its left
+            for index, key in ((self._by_creator, old.creator), (self._by_ticker, _ticker_key(old.ticker))):
+                if key:
+                    entries = index[key]
+                    entries.popleft()
+                    if not entries:
+                        del index[key]
+            if old.mint and self._by_mint.get(old.mint) is old:
+                del self._by_mint[old.mint]
+            self._stats['evicted'] += 1
+
+    @staticmethod
+    def _recent(entries: Optional[Deque[NewPair]], window: Optional[float]) -> List[NewPair]:
+        if not entries:
+            return []
+        if window is None:
+            return list(entries)
+        cutoff = time.time() - window
+        recent = []
+        for pair in reversed(entries):
+            if pair.received_at < cutoff:
+                break
+            recent.append(pair)
+        recent.reverse()
+        return recent
+
+    # ------------------------------------------------------------------ #
+    #  Queries                                                             #
+    # ------------------------------------------------------------------ #
+
+    def get(self, mint: str) -> Optional[NewPair]:
+        """The pair of ``mint``, or None"""
+        return self._by_mint.get(mint)
+
+    def by_creator(self, creator: str, window: Optional[float] = None) -> List[NewPair]:
+        """Pairs launched by ``creator`` (in the last ``window`` seconds), oldest first"""
+        return self._recent(self._by_creator.get(creator), window)
+
+    def by_ticker(self, ticker: str, window: Optional[float] = None) -> List[NewPair]:
+        """Pairs with ``ticker`` (in the last ``window`` seconds), oldest first"""
+        return self._recent(self._by_ticker.get(_ticker_key(ticker)), window)
+
+    def count_by_creator(self, creator: str, window: Optional[float] = None) -> int:
+        """Number of pairs launched by ``creator`` in the last ``window`` seconds"""
+        return len(self.by_creator(creator, window))
+
+    def count_by_ticker(self, ticker: str, window: Optional[float] = None) -> int:
+        """Number of pairs with ``ticker`` in the last ``window`` seconds"""
+        return len(self.by_ticker(ticker, window))
+
+    def serial_creators(self, min_count: int, window: Optional[float] = None) -> Dict[str, int]:
+        """
+        Creators with at least ``min_count`` pairs in the last ``window`` seconds
+
+        Returns:
+            dict: creator -> count, highest first
+        """
+        return self._at_least(self._by_creator, min_count, window)
+
+    def duplicate_tickers(self, min_count: int = 2, window: Optional[float] = None) -> Dict[str, int]:
+        """
+        Tickers used by at least ``min_count`` pairs in the last ``window`` seconds
+
+        Returns:
+            dict: upper-cased ticker -> count, highest first
+        """
+        return self._at_least(self._by_ticker, min_count, window)
+
+    def _at_least(self, index: Dict[str, Deque[NewPair]], min_count: int,
+                  window: Optional[float]) -> Dict[str, int]:
+        counts = ((key, len(self._recent(entries, window)))
+                  for key, entries in index.items() if len(entries) >= min_count)
+        return dict(sorted(((key, n) for key, n in counts if n >= min_count),
+                           key=lambda item: item[1], reverse=True))
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def __contains__(self, mint: str) -> bool:
+        return mint in self._by_mint
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Index counters
+
+        Returns:
+            dict: ``pairs``, distinct ``creators``/``tickers``, ``retention``,
+            ``max_pairs`` and the ``added``/``evicted`` totals
+        """
+        return {'pairs': len(self._pairs), 'creators': len(self._by_creator),
+                'tickers': len(self._by_ticker), 'retention': self.retention,
+                'max_pairs': self.max_pairs, **self._stats}
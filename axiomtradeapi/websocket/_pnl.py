@@ -0,0 +1,321 @@
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+from ._latency import parse_timestamp
+
+# Keys tried, in order, for the traded token, its amount and its price
+TOKEN_KEYS = ("token_address", "tokenAddress", "mint", "pair_address", "pairAddress")
+AMOUNT_KEYS = ("token_amount", "tokenAmount", "amount")
+PRICE_SOL_KEYS = ("price_sol", "priceSol")
+PRICE_USD_KEYS = ("price_usd", "priceUsd")
+
+# Fields summed into the rolling-window buckets
+_WINDOW_FIELDS = ("trades", "bought_sol", "sold_sol", "realised_sol", "realised_usd")
+
+
+def _first(content: Dict[str, Any], *keys: str) -> Any:
+    for key in keys:
+        value = content.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return None if value is None else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _new_position() -> Dict[str, Any]:
+    return {'qty': 0.0, 'cost_sol': 0.0, 'cost_usd': 0.0, 'realised_sol': 0.0, 'realised_usd': 0.0,
+            'bought_sol': 0.0, 'sold_sol': 0.0, 'buys': 0, 'sells': 0, 'unmatched_sol': 0.0,
+            'last_at': None}
+
+
+def _new_wallet() -> Dict[str, Any]:
+    return {'trades': 0, 'buys': 0, 'sells': 0, 'bought_sol': 0.0, 'sold_sol': 0.0,
+            'bought_usd': 0.0, 'sold_usd': 0.0, 'realised_sol': 0.0, 'realised_usd': 0.0,
+            'unmatched_sol': 0.0, 'first_at': None, 'last_at': None,
+            'positions': {}, 'buckets': deque()}
+
+
+class WalletPnLAggregator:
+    """
+    Running per-wallet, per-token positions and PnL from wallet transactions.
+
+    Each ``buy``/``sell`` event updates the wallet's position in the traded
+    token with average-cost accounting in O(1): buys add to quantity and
+    cost basis, sells realise ``proceeds - average cost`` for the quantity
+    sold. Sells of tokens bought before tracking started (more than the
+    tracked position) are counted as ``unmatched_sol`` rather than profit.
+    Realised PnL therefore needs the trade's token amount; without it only
+    the SOL flows (``net_sol``) are meaningful.
+
+    Unrealised PnL marks open positions at the last traded price of the
+    token (from any tracked wallet) or at a price given to update_mark().
+    Rolling windows sum time buckets, so they also cost O(1) per event.
+    """
+
+    def __init__(self, windows: Iterable[float] = (3600.0, 86400.0), bucket: float = 60.0) -> None:
+        """
+        Initialize WalletPnLAggregator
+
+        Args:
+            windows: Rolling window lengths in seconds reported per wallet
+            bucket: Bucket width in seconds (window edges are accurate to one bucket)
+        """
+        self.windows = tuple(sorted(float(w) for w in windows))
+        if any(w <= 0 for w in self.windows):
+            raise ValueError("windows must be positive")
+        if bucket <= 0:
+            raise ValueError("bucket must be positive")
+        self.bucket = bucket
+        self._wallets: Dict[str, Dict[str, Any]] = {}
+        self._marks: Dict[str, Dict[str, Optional[float]]] = {}
+        self._stats = {'events': 0, 'ignored': 0}
+
+    # ------------------------------------------------------------------ #
+    #  Updates                                                             #
+    # ------------------------------------------------------------------ #
+
+    def add_trade(self, trade: Dict[str, Any], wallet: Optional[str] = None,
+                  at: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Apply one wallet transaction
+
+        Args:
+            trade: Content of a ``v:<wallet>`` frame (``type``, ``total_sol``,
+                ``total_usd``, token address and amount...)
+            wallet: Wallet address (default: the trade's ``maker_address``)
+            at: Event time in epoch seconds (default: the trade's
+                ``created_at``, else now)
+
+        Returns:
+            dict: The updated position (None for events that are not a buy or sell)
+        """
+        side = str(trade.get('type', '')).lower()
+        wallet = wallet or trade.get('maker_address')
+        sol = _float(trade.get('total_sol'))
+        if side not in ('buy', 'sell') or not wallet or sol is None:
+            self._stats['ignored'] += 1
+            return None
+        state = self._wallets.get(wallet)
+        if state is None:
+            state = self._wallets[wallet] = _new_wallet()
+        usd = _float(trade.get('total_usd')) or 0.0
+        amount = _float(_first(trade, *AMOUNT_KEYS))
+        token = _first(trade, *TOKEN_KEYS)
+        if at is None:
+            at = parse_timestamp(trade.get('created_at')) or time.time()
+
+        positions = state['positions']
+        position = positions.get(token)
+        if position is None:
+            position = positions[token] = _new_position()
+        realised_sol = realised_usd = 0.0
+
+        if side == 'buy':
+            position['buys'] += 1
+            position['bought_sol'] += sol
+            position['cost_sol'] += sol
+            position['cost_usd'] += usd
+            if amount:
+                position['qty'] += amount
+            state['buys'] += 1
+            state['bought_sol'] += sol
+            state['bought_usd'] += usd
+        else:
+            position['sells'] += 1
+            position['sold_sol'] += sol
+            state['sells'] += 1
+            state['sold_sol'] += sol
+            state['sold_usd'] += usd
+            qty = position['qty']
+            if amount and qty > 0:
+                matched = min(amount, qty)
+                held, traded = matched / qty, matched / amount
+                basis_sol, basis_usd = position['cost_sol'] * held, position['cost_usd'] * held
+                realised_sol = sol * traded - basis_sol
+                realised_usd = usd * traded - basis_usd
+                position['realised_sol'] += realised_sol
+                position['realised_usd'] += realised_usd
+                if matched >= qty:
+                    position['qty'] = position['cost_sol'] = position['cost_usd'] = 0.0
+                else:
+                    position['qty'] -= matched
+                    position['cost_sol'] -= basis_sol
+                    position['cost_usd'] -= basis_usd
+                unmatched = sol * (1 - traded)
+            else:
+                unmatched = sol
+            position['unmatched_sol'] += unmatched
+            state['unmatched_sol'] += unmatched
+            state['realised_sol'] += realised_sol
+            state['realised_usd'] += realised_usd
+
+        position['last_at'] = at
+        state['trades'] += 1
+        if state['first_at'] is None:
+            state['first_at'] = at
+        state['last_at'] = at if state['last_at'] is None else max(state['last_at'], at)
+        if amount and token is not None:
+            self._marks[token] = {'price_sol': sol / amount, 'price_usd': usd / amount if usd else None,
+                                  'at': at}
+        elif token is not None:
+            price_sol = _float(_first(trade, *PRICE_SOL_KEYS))
+            if price_sol is not None:
+                self._marks[token] = {'price_sol': price_sol,
+                                      'price_usd': _float(_first(trade, *PRICE_USD_KEYS)), 'at': at}
+        self._add_to_window(state, at, side, sol, realised_sol, realised_usd)
+        self._stats['events'] += 1
+        return position
+
+    def _add_to_window(self, state: Dict[str, Any], at: float, side: str, sol: float,
+                       realised_sol: float, realised_usd: float) -> None:
+        if not self.windows:
+            return
+        buckets = state['buckets']
+        start = at - at % self.bucket
+        if buckets and start <= buckets[-1][0]:
+            entry = buckets[-1]  # late events count in the newest bucket
+        else:
+            entry = [start, 0, 0.0, 0.0, 0.0, 0.0]
+            buckets.append(entry)
+            cutoff = start - self.windows[-1]
+            while buckets[0][0] < cutoff:
+                buckets.popleft()
+        entry[1] += 1
+        entry[2 if side == 'buy' else 3] += sol
+        entry[4] += realised_sol
+        entry[5] += realised_usd
+
+    def update_mark(self, token: str, price_sol: float, price_usd: Optional[float] = None) -> None:
+        """Set the price open positions in ``token`` are marked at (until the next trade in it)."""
+        self._marks[token] = {'price_sol': price_sol, 'price_usd': price_usd, 'at': time.time()}
+
+    # ------------------------------------------------------------------ #
+    #  Queries                                                             #
+    # ------------------------------------------------------------------ #
+
+    def _position_view(self, token: Optional[str], position: Dict[str, Any]) -> Dict[str, Any]:
+        view = dict(position)
+        mark = self._marks.get(token) if token is not None else None
+        unrealised_sol = unrealised_usd = None
+        if position['qty'] > 0 and mark is not None:
+            unrealised_sol = position['qty'] * mark['price_sol'] - position['cost_sol']
+            if mark['price_usd'] is not None:
+                unrealised_usd = position['qty'] * mark['price_usd'] - position['cost_usd']
+        elif position['qty'] == 0:
+            unrealised_sol = unrealised_usd = 0.0
+        view['mark_sol'] = None if mark is None else mark['price_sol']
+        view['unrealised_sol'] = unrealised_sol
+        view['unrealised_usd'] = unrealised_usd
+        view['net_sol'] = position['sold_sol'] - position['bought_sol']
+        return view
+
+    def get_position(self, wallet: str, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Position of ``wallet`` in ``token``
+
+        Returns:
+            dict: ``qty``, cost basis, ``realised_*``, ``unrealised_*`` (None
+            when the token has no mark), ``bought_sol``/``sold_sol``,
+            ``net_sol``, ``unmatched_sol``, trade counts; None if never traded
+        """
+        state = self._wallets.get(wallet)
+        position = None if state is None else state['positions'].get(token)
+        return None if position is None else self._position_view(token, position)
+
+    def get_window(self, wallet: str, window: float, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Totals of ``wallet`` over the last ``window`` seconds
+
+        Returns:
+            dict: ``trades``, ``bought_sol``, ``sold_sol``, ``realised_sol``, ``realised_usd``
+        """
+        totals = dict.fromkeys(_WINDOW_FIELDS, 0)
+        state = self._wallets.get(wallet)
+        if state is None:
+            return totals
+        cutoff = (time.time() if now is None else now) - window
+        for entry in reversed(state['buckets']):
+            if entry[0] + self.bucket <= cutoff:
+                break
+            for i, field in enumerate(_WINDOW_FIELDS, 1):
+                totals[field] += entry[i]
+        return totals
+
+    def get_wallet(self, wallet: str, positions: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        PnL summary of ``wallet``
+
+        Returns:
+            dict: totals (``realised_*``, ``unrealised_*`` over marked open
+            positions, ``bought_*``/``sold_*``, ``net_sol``, ``unmatched_sol``,
+            trade counts, ``open_positions``), one ``windows`` entry per
+            rolling window and, with ``positions=True``, every position
+        """
+        state = self._wallets.get(wallet)
+        if state is None:
+            return None
+        views = {token: self._position_view(token, p) for token, p in state['positions'].items()}
+        summary = {key: value for key, value in state.items()
+                   if key not in ('positions', 'buckets')}
+        summary['net_sol'] = state['sold_sol'] - state['bought_sol']
+        summary['unrealised_sol'] = sum(v['unrealised_sol'] or 0.0 for v in views.values())
+        summary['unrealised_usd'] = sum(v['unrealised_usd'] or 0.0 for v in views.values())
+        summary['open_positions'] = sum(1 for v in views.values() if v['qty'] > 0)
+        now = time.time()
+        summary['windows'] = {w: self.get_window(wallet, w, now) for w in self.windows}
+        if positions:
+            summary['positions'] = views
+        return summary
+
+    def top_wallets(self, n: int = 10, window: Optional[float] = None,
+                    key: str = 'realised_sol') -> List[Dict[str, Any]]:
+        """
+        Wallets ranked by ``key`` (overall, or within ``window`` seconds)
+
+        Returns:
+            list: ``{'wallet': ..., key: value}`` dicts, highest first
+        """
+        now = time.time()
+        if window is None:
+            values = ((w, s[key]) for w, s in self._wallets.items())
+        else:
+            values = ((w, self.get_window(w, window, now)[key]) for w in self._wallets)
+        ranked = sorted(values, key=lambda item: item[1], reverse=True)[:n]
+        return [{'wallet': wallet, key: value} for wallet, value in ranked]
+
+    @property
+    def wallets(self):
+        """Wallets with at least one trade"""
+        return self._wallets.keys()
+
+    def __len__(self) -> int:
+        return len(self._wallets)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Point-in-time copy of every wallet's summary and positions
+
+        Returns:
+            dict: ``{'wallets': {wallet: get_wallet(wallet)}, 'taken_at': epoch}``
+        """
+        return {'wallets': {wallet: self.get_wallet(wallet) for wallet in self._wallets},
+                'taken_at': time.time()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Aggregator counters
+
+        Returns:
+            dict: ``wallets``, ``positions``, marked ``tokens`` and the
+            ``events``/``ignored`` totals
+        """
+        return {'wallets': len(self._wallets),
+                'positions': sum(len(s['positions']) for s in self._wallets.values()),
+                'tokens': len(self._marks), **self._stats}
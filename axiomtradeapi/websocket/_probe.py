@@ -0,0 +1,81 @@
+import time
+from typing import Any, Dict, List, Optional
+
+
+class ClusterProbe:
+    """
+    Handshake latency and health of each cluster URL.
+
+    Fed by probe handshakes and by the client's own connect attempts. A URL
+    is healthy when its last handshake succeeded; its latency is a moving
+    average so one slow handshake does not reorder the clusters.
+    """
+
+    def __init__(self, smoothing: float = 0.5) -> None:
+        """
+        Initialize ClusterProbe
+
+        Args:
+            smoothing: Weight of the newest sample in the latency average (0-1]
+        """
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be in (0, 1]")
+        self.smoothing = smoothing
+        self._results: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, url: str, latency: Optional[float], error: Optional[str] = None) -> None:
+        """
+        Record one handshake
+
+        Args:
+            url: Cluster URL
+            latency: Handshake time in seconds, or None when it failed
+            error: Why it failed
+        """
+        result = self._results.setdefault(url, {
+            'healthy': False, 'latency_ms': None, 'last_latency_ms': None,
+            'successes': 0, 'failures': 0, 'last_error': None, 'probed_at': None,
+        })
+        result['probed_at'] = time.time()
+        if latency is None:
+            result['healthy'] = False
+            result['failures'] += 1
+            result['last_error'] = error
+            return
+        ms = latency * 1000
+        previous = result['latency_ms']
+        result['latency_ms'] = ms if previous is None else previous + self.smoothing * (ms - previous)
+        result['last_latency_ms'] = ms
+        result['healthy'] = True
+        result['successes'] += 1
+
+    def rank(self, urls: List[str]) -> List[str]:
+        """
+        ``urls`` ordered fastest healthy first, then not yet probed (in their
+        given order), then failing
+        """
+        def key(item):
+            i, url = item
+            result = self._results.get(url)
+            if result is None:
+                return (1, 0.0, i)
+            if not result['healthy']:
+                return (2, 0.0, i)
+            return (0, result['latency_ms'], i)
+        return [url for _, url in sorted(enumerate(urls), key=key)]
+
+    @property
+    def fastest(self) -> Optional[str]:
+        """The healthy URL with the lowest average handshake latency"""
+        healthy = [(r['latency_ms'], url) for url, r in self._results.items() if r['healthy']]
+        return min(healthy)[1] if healthy else None
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-URL probe results
+
+        Returns:
+            dict: url -> ``healthy``, average and last handshake ``latency_ms``,
+            ``successes``/``failures``, ``last_error`` and ``probed_at`` (epoch)
+        """
+        return {url: dict(result) for url, result in self._results.items()}
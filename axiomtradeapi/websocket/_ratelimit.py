@@ -0,0 +1,59 @@
+import asyncio
+import time
+from typing import Any, Dict
+
+
+class RateLimiter:
+    """
+    Token bucket capping how fast room messages go out on one socket.
+
+    Up to ``burst`` messages are sent back to back; after that, one message
+    is allowed every ``1 / rate`` seconds.
+    """
+
+    def __init__(self, rate: float, burst: int = 100) -> None:
+        """
+        Initialize RateLimiter
+
+        Args:
+            rate: Sustained messages per second
+            burst: Messages that may be sent without waiting
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._stats = {'acquired': 0, 'throttled': 0, 'waited': 0.0}
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a message may be sent."""
+        # Take the token up front (the bucket may go negative) so that
+        # concurrent callers queue behind each other instead of all waking
+        # at the same time
+        self._refill()
+        self._tokens -= 1
+        self._stats['acquired'] += 1
+        if self._tokens < 0:
+            wait = -self._tokens / self.rate
+            self._stats['throttled'] += 1
+            self._stats['waited'] += wait
+            await asyncio.sleep(wait)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Limiter counters
+
+        Returns:
+            dict: ``rate``, ``burst``, messages ``acquired``, how many were
+            ``throttled`` and the total seconds ``waited``
+        """
+        return {'rate': self.rate, 'burst': self.burst, **self._stats}
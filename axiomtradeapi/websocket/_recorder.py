@@ -0,0 +1,200 @@
+import asyncio
+import gzip
+import mmap
+import time
+import zlib
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+_GZIP_MAGIC = b'\x1f\x8b\x08'
+_CHUNK = 64 * 1024
+
+
+def _salvage(inflater, chunk: bytes, step: int = 4096) -> bytes:
+    """Whatever ``inflater`` decodes from ``chunk`` before the first corrupt byte"""
+    out = []
+    for i in range(0, len(chunk), step):
+        piece = chunk[i:i + step]
+        saved = inflater.copy()
+        try:
+            out.append(inflater.decompress(piece))
+        except zlib.error:
+            # Narrow down to the byte the stream breaks at
+            if step > 1:
+                out.append(_salvage(saved, piece, max(step // 64, 1)))
+            break
+    return b''.join(out)
+
+
+def _inflate_members(data) -> Iterator[Optional[bytes]]:
+    """
+    Decompressed pieces of each gzip member in ``data``, with None after each member
+
+    A session that crashed leaves a member without an end; when a later
+    session appended to the same file, its header follows the unfinished
+    deflate stream and fails to decode. Reading then resumes at the next
+    gzip header, so the sessions after a crash are not lost.
+    """
+    pos, size = 0, len(data)
+    while 0 <= pos < size:
+        inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        i = pos
+        corrupt = False
+        while i < size and not inflater.eof:
+            chunk = data[i:i + _CHUNK]
+            saved = inflater.copy()
+            try:
+                piece = inflater.decompress(chunk)
+            except zlib.error:
+                piece = _salvage(saved, chunk)
+                corrupt = True
+            yield piece
+            if corrupt:
+                break
+            i += len(chunk)
+        yield None
+        if corrupt:
+            pos = data.find(_GZIP_MAGIC, pos + 1)
+        elif inflater.eof:
+            pos = i - len(inflater.unused_data)
+        else:
+            return  # the last session was not closed
+
+
+def read_frames(path: str) -> Iterator[Tuple[float, str, bytes]]:
+    """
+    Read a recording made by FrameRecorder
+
+    Sessions that were not closed (a crash, a kill) are read up to their last
+    flushed complete frame, including when later sessions were appended.
+
+    Yields:
+        tuple: (receive timestamp, endpoint, raw frame bytes)
+    """
+    with open(path, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # empty file
+        with data:
+            tail = b''
+            for piece in _inflate_members(data):
+                if piece is None:
+                    # A member that ends mid-line was cut short; drop the partial frame
+                    tail = b''
+                    continue
+                lines = (tail + piece).split(b'\n')
+                tail = lines.pop()
+                for line in lines:
+                    parts = line.split(b'\t', 2)
+                    if len(parts) != 3:
+                        continue
+                    try:
+                        received_at, endpoint = float(parts[0]), parts[1].decode('ascii')
+                    except (ValueError, UnicodeDecodeError):
+                        continue
+                    yield received_at, endpoint, parts[2]
+
+
+class FrameRecorder:
+    """
+    Appends raw WebSocket frames to a gzip-compressed, line-based log.
+
+    Each line is ``<receive timestamp>\t<endpoint>\t<frame>``. Frames are
+    stored byte for byte (newlines, which JSON only allows as whitespace,
+    become spaces), so recording costs no JSON encoding. The file is opened
+    in append mode, so several sessions can go into one log; every session
+    is its own gzip member and the whole file reads back as one stream.
+    """
+
+    def __init__(self, path: str, compresslevel: int = 3, flush_every: int = 1000) -> None:
+        """
+        Initialize FrameRecorder
+
+        Args:
+            path: Log file (conventionally ``*.log.gz``)
+            compresslevel: gzip level; lower is cheaper on the receive loop
+            flush_every: Flush to disk after this many frames
+        """
+        self.path = path
+        self.flush_every = flush_every
+        self.frames = 0
+        self._file = gzip.open(path, 'ab', compresslevel=compresslevel)
+        self._pending = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None
+
+    def write(self, raw: Union[str, bytes], endpoint: str = 'cluster',
+              received_at: Optional[float] = None) -> None:
+        """Append one frame."""
+        if self._file is None:
+            return
+        if isinstance(raw, str):
+            raw = raw.encode('utf-8')
+        stamp = time.time() if received_at is None else received_at
+        self._file.write(b'%.6f\t%s\t%s\n' % (stamp, endpoint.encode('ascii'), raw.replace(b'\n', b' ')))
+        self.frames += 1
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+            self._pending = 0
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ReplaySource:
+    """
+    Feeds a FrameRecorder log back through a client's ``_dispatch``.
+
+    ``speed`` 1.0 reproduces the recorded timing, 10.0 plays ten times
+    faster, and None (or 0) replays as fast as the client dispatches.
+    """
+
+    def __init__(self, path: str, speed: Optional[float] = 1.0) -> None:
+        if speed is not None and speed < 0:
+            raise ValueError("speed must be positive, 0 or None")
+        self.path = path
+        self.speed = speed or None
+        self._stats = {'frames': 0, 'late': 0, 'duration': 0.0}
+
+    async def run(self, client) -> int:
+        """
+        Dispatch every recorded frame to ``client``
+
+        Returns:
+            int: Number of frames replayed
+        """
+        loop = asyncio.get_event_loop()
+        started = loop.time()
+        first = None
+        for received_at, _, raw in read_frames(self.path):
+            if self.speed is not None:
+                if first is None:
+                    first = received_at
+                delay = started + (received_at - first) / self.speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                elif delay < -0.01:
+                    self._stats['late'] += 1
+            await client._dispatch(raw)
+            self._stats['frames'] += 1
+        self._stats['duration'] = loop.time() - started
+        return self._stats['frames']
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Replay counters
+
+        Returns:
+            dict: ``frames`` replayed, ``late`` frames dispatched more than
+            10 ms behind schedule and the wall-clock ``duration``
+        """
+        return dict(self._stats)
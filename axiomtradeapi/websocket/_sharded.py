@@ -0,0 +1,250 @@
+import asyncio
+import bisect
+import hashlib
+import logging
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from ._client import AxiomTradeWebSocketClient
+from ._subscription import Subscription
+
+
+class _HashRing:
+    """Consistent hash ring mapping room names to shard indexes."""
+
+    def __init__(self, shards: int, replicas: int = 64) -> None:
+        self._points: List[int] = []
+        self._owners: List[int] = []
+        ring = sorted((self._hash(f"shard-{shard}-{replica}"), shard)
+                      for shard in range(shards) for replica in range(replicas))
+        for point, shard in ring:
+            self._points.append(point)
+            self._owners.append(shard)
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int(hashlib.md5(value.encode('utf-8')).hexdigest()[:16], 16)
+
+    def get(self, room: str) -> int:
+        i = bisect.bisect(self._points, self._hash(room)) % len(self._points)
+        return self._owners[i]
+
+
+class ShardedWebSocketClient:
+    """
+    Spreads subscriptions over several AxiomTradeWebSocketClient connections.
+
+    Each subscription is assigned to a shard by consistent hashing of its room,
+    so a room always lives on the same connection and adding shards moves only
+    a fraction of the rooms. Every shard runs its own receive loop and
+    reconnects independently, so one dropped socket only affects its rooms.
+
+    Mirrors the client's subscribe methods, batch(), the stream*() methods
+    and its stats. Client features bound to a single connection (recording,
+    replay, cluster probing) are used on a shard directly
+    (``client.shards[i]``); accessing them here raises AttributeError. Pass
+    a MarketStateStore, NewPairIndex or WalletPnLAggregator instance
+    (``track_state=store``...) to share one across the shards.
+    """
+
+    def __init__(self, auth_manager, num_shards: int = 4, log_level=logging.INFO,
+                 **client_kwargs) -> None:
+        """
+        Initialize ShardedWebSocketClient
+
+        Args:
+            auth_manager: Authenticated AuthManager shared by all shards
+            num_shards: Number of WebSocket connections
+            log_level: Logging level for the shard clients
+            **client_kwargs: Passed to every AxiomTradeWebSocketClient
+                (cf_clearance, auto_reconnect, reconnect_* ...)
+        """
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        self.auth_manager = auth_manager
+        self.shards = [AxiomTradeWebSocketClient(auth_manager, log_level=log_level, **client_kwargs)
+                       for _ in range(num_shards)]
+        self.logger = logging.getLogger(__name__)
+
+        self._ring = _HashRing(num_shards)
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._running = False
+        self._stopped: Optional[asyncio.Event] = None
+        self._streams: set = set()
+
+    def shard_for(self, room: str) -> int:
+        """Index of the shard that owns ``room``"""
+        return self._ring.get(room)
+
+    # ------------------------------------------------------------------ #
+    #  Subscribe API (same as AxiomTradeWebSocketClient)                   #
+    # ------------------------------------------------------------------ #
+
+    async def _on_shard(self, room: str, subscribe: Callable, *args, **kwargs):
+        index = self.shard_for(room)
+        subscription = await subscribe(self.shards[index], *args, **kwargs)
+        if subscription and self._running:
+            self._start_shard(index)
+        return subscription
+
+    async def subscribe_new_tokens(self, callback: Callable[[Dict[str, Any]], None], **kwargs):
+        """Subscribe to new token updates."""
+        return await self._on_shard("new_pairs", AxiomTradeWebSocketClient.subscribe_new_tokens,
+                                    callback, **kwargs)
+
+    async def subscribe_token_price(self, token: str, callback: Callable[[Dict[str, Any]], None],
+                                    **kwargs):
+        """Subscribe to token price updates."""
+        return await self._on_shard(token, AxiomTradeWebSocketClient.subscribe_token_price,
+                                    token, callback, **kwargs)
+
+    async def subscribe_wallet_transactions(self, wallet_address: str,
+                                            callback: Callable[[Dict[str, Any]], None], **kwargs):
+        """Subscribe to wallet transaction updates."""
+        return await self._on_shard(f"v:{wallet_address}",
+                                    AxiomTradeWebSocketClient.subscribe_wallet_transactions,
+                                    wallet_address, callback, **kwargs)
+
+    async def subscribe_active_users(self, callback: Callable[[int], None],
+                                     token_address: str = "FFcYgSSgWHforA9rXXkA48p8YFoz8TSW85Jpo3CQHDyS",
+                                     **kwargs):
+        """Subscribe to active Axiom users count updates for a specific token."""
+        return await self._on_shard(f"e-{token_address}",
+                                    AxiomTradeWebSocketClient.subscribe_active_users,
+                                    callback, token_address, **kwargs)
+
+    async def subscribe_token_prices(self, tokens: List[str], callback: Callable[[str, Dict[str, Any]], None],
+                                     **kwargs) -> Dict[str, Union[Subscription, bool]]:
+        """Subscribe to price updates of many tokens, joining each shard's rooms in one batch."""
+        by_shard: Dict[int, List[str]] = {}
+        for token in tokens:
+            by_shard.setdefault(self.shard_for(token), []).append(token)
+        subscriptions = {}
+        for index, shard_tokens in by_shard.items():
+            subscriptions.update(await self.shards[index].subscribe_token_prices(shard_tokens, callback, **kwargs))
+            if self._running and any(subscriptions[token] for token in shard_tokens):
+                self._start_shard(index)
+        return {token: subscriptions[token] for token in tokens}
+
+    async def unsubscribe(self, subscription: Subscription) -> bool:
+        """Remove a subscription returned by one of the subscribe methods."""
+        return await subscription.unsubscribe()
+
+    @asynccontextmanager
+    async def batch(self):
+        """Collect the join/leave messages of every shard in the block and send them on exit."""
+        async with AsyncExitStack() as stack:
+            for shard in self.shards:
+                await stack.enter_async_context(shard.batch())
+            yield self
+
+    # The streaming API only needs the subscribe methods above, so the
+    # client's implementation is shared as is
+    stream = AxiomTradeWebSocketClient.stream
+    stream_prices = AxiomTradeWebSocketClient.stream_prices
+    stream_batches = AxiomTradeWebSocketClient.stream_batches
+
+    def __getattr__(self, name: str):
+        if not name.startswith('_') and hasattr(AxiomTradeWebSocketClient, name):
+            raise AttributeError(f"ShardedWebSocketClient does not support {name}; "
+                                 f"use it on a single shard (client.shards[i].{name})")
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    # ------------------------------------------------------------------ #
+    #  Lifecycle                                                           #
+    # ------------------------------------------------------------------ #
+
+    def _start_shard(self, index: int) -> None:
+        task = self._tasks.get(index)
+        if task is None or task.done():
+            self._tasks[index] = asyncio.ensure_future(self.shards[index].start())
+
+    async def start(self):
+        """Run the receive loops of all shards with subscriptions until close() is called."""
+        self._running = True
+        self._stopped = asyncio.Event()
+        for index, shard in enumerate(self.shards):
+            if shard._subscriptions:
+                self._start_shard(index)
+        self.logger.info(f"Sharded WebSocket started: {len(self._tasks)}/{len(self.shards)} shards active")
+        await self._stopped.wait()
+
+    async def close(self):
+        """Close all shard connections."""
+        self._running = False
+        await asyncio.gather(*(shard.close() for shard in self.shards), return_exceptions=True)
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        for stream in list(self._streams):
+            stream._finish()
+        if self._stopped is not None:
+            self._stopped.set()
+
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """
+        Per-shard connection health
+
+        Returns:
+            dict: ``shards`` (each shard's get_connection_stats() plus its
+            ``rooms`` count) and fleet-wide ``rooms``/``connected`` totals
+        """
+        shards = []
+        for shard in self.shards:
+            stats = shard.get_connection_stats()
+            stats['rooms'] = len(shard._room_refs)
+            shards.append(stats)
+        return {
+            'shards': shards,
+            'rooms': sum(s['rooms'] for s in shards),
+            'connected': sum(1 for s in shards if s['connected']),
+        }
+
+    def get_room_silence(self, min_silence: float = 0.0) -> Dict[str, float]:
+        """Seconds since each subscribed room (on any shard) last received a frame, most silent first"""
+        silence = {}
+        for shard in self.shards:
+            silence.update(shard.get_room_silence(min_silence))
+        return dict(sorted(silence.items(), key=lambda item: item[1], reverse=True))
+
+    def get_queue_stats(self) -> List[Dict[str, Any]]:
+        """Dispatch queue counters of every queued subscription, each with its ``shard`` index"""
+        return [{'shard': index, **stats}
+                for index, shard in enumerate(self.shards) for stats in shard.get_queue_stats()]
+
+    def get_callback_stats(self) -> Dict[str, Any]:
+        """
+        Callback pool counters
+
+        Returns:
+            dict: ``shards`` (each shard's get_callback_stats()) and the
+            fleet-wide ``delivered``/``errors``/``pending`` totals
+        """
+        shards = [shard.get_callback_stats() for shard in self.shards]
+        totals = {key: sum(s[key] for s in shards) for key in ('delivered', 'errors', 'pending')}
+        return {'shards': shards, **totals}
+
+    def get_latency_stats(self, rooms: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Per-room latency histograms (requires ``track_latency=True``)
+
+        Returns:
+            dict: ``rooms`` of every shard (each room lives on one shard) and
+            ``shards`` with each shard's get_latency_stats()
+        """
+        shards = [shard.get_latency_stats(rooms) for shard in self.shards]
+        merged = {}
+        for stats in shards:
+            merged.update(stats['rooms'])
+        return {'rooms': merged, 'shards': shards}
+
+    def reset_latency_stats(self) -> None:
+        """Clear the latency histograms of every shard."""
+        for shard in self.shards:
+            shard.reset_latency_stats()
+
+    def get_cluster_stats(self) -> List[Dict[str, Any]]:
+        """Each shard's get_cluster_stats()"""
+        return [shard.get_cluster_stats() for shard in self.shards]
@@ -0,0 +1,134 @@
+import json
+import time
+from typing import Any, Dict, Optional
+
+
+class MarketStateStore:
+    """
+    Latest market state seen on the WebSocket, updated in place by the client.
+
+    Per token: the last price tick and active users count; per wallet: the
+    last trade. Each value carries the epoch time it was received. Lookups
+    are single dict reads, so strategy code can query current state instead
+    of keeping its own caches in callbacks.
+    """
+
+    def __init__(self) -> None:
+        self._tokens: Dict[str, Dict[str, Any]] = {}
+        self._wallets: Dict[str, Dict[str, Any]] = {}
+
+    # ------------------------------------------------------------------ #
+    #  Updates (called by AxiomTradeWebSocketClient)                       #
+    # ------------------------------------------------------------------ #
+
+    def _token(self, token: str) -> Dict[str, Any]:
+        state = self._tokens.get(token)
+        if state is None:
+            state = self._tokens[token] = {'price': None, 'price_updated_at': None,
+                                           'active_users': None, 'active_users_updated_at': None}
+        return state
+
+    def update_price(self, token: str, price: Any, at: Optional[float] = None) -> None:
+        """Store the latest price tick (the room content as received) of ``token``."""
+        state = self._token(token)
+        state['price'] = price
+        state['price_updated_at'] = time.time() if at is None else at
+
+    def update_active_users(self, token: str, count: int, at: Optional[float] = None) -> None:
+        """Store the latest active users count of ``token``."""
+        state = self._token(token)
+        state['active_users'] = count
+        state['active_users_updated_at'] = time.time() if at is None else at
+
+    def update_wallet_trade(self, wallet: str, trade: Dict[str, Any], at: Optional[float] = None) -> None:
+        """Store the latest trade of ``wallet``."""
+        state = self._wallets.get(wallet)
+        if state is None:
+            state = self._wallets[wallet] = {'last_trade': None, 'updated_at': None, 'trades': 0}
+        state['last_trade'] = trade
+        state['updated_at'] = time.time() if at is None else at
+        state['trades'] += 1
+
+    # ------------------------------------------------------------------ #
+    #  Queries                                                             #
+    # ------------------------------------------------------------------ #
+
+    def get_price(self, token: str) -> Any:
+        """Latest price tick of ``token``, or None"""
+        state = self._tokens.get(token)
+        return None if state is None else state['price']
+
+    def get_active_users(self, token: str) -> Optional[int]:
+        """Latest active users count of ``token``, or None"""
+        state = self._tokens.get(token)
+        return None if state is None else state['active_users']
+
+    def get_last_trade(self, wallet: str) -> Optional[Dict[str, Any]]:
+        """Latest trade of ``wallet``, or None"""
+        state = self._wallets.get(wallet)
+        return None if state is None else state['last_trade']
+
+    def last_update(self, key: str) -> Optional[float]:
+        """Epoch time of the latest update for a token or wallet, or None"""
+        state = self._tokens.get(key)
+        if state is not None:
+            times = [t for t in (state['price_updated_at'], state['active_users_updated_at']) if t is not None]
+            return max(times) if times else None
+        state = self._wallets.get(key)
+        return None if state is None else state['updated_at']
+
+    def get_token(self, token: str) -> Optional[Dict[str, Any]]:
+        """Copy of everything known about ``token`` (price, active users and their update times)"""
+        state = self._tokens.get(token)
+        return None if state is None else dict(state)
+
+    def get_wallet(self, wallet: str) -> Optional[Dict[str, Any]]:
+        """Copy of everything known about ``wallet`` (last trade, update time, trade count)"""
+        state = self._wallets.get(wallet)
+        return None if state is None else dict(state)
+
+    @property
+    def tokens(self):
+        """Tokens with known state"""
+        return self._tokens.keys()
+
+    @property
+    def wallets(self):
+        """Wallets with known state"""
+        return self._wallets.keys()
+
+    def __len__(self) -> int:
+        return len(self._tokens) + len(self._wallets)
+
+    def clear(self) -> None:
+        """Forget all state."""
+        self._tokens.clear()
+        self._wallets.clear()
+
+    # ------------------------------------------------------------------ #
+    #  Snapshot / export                                                   #
+    # ------------------------------------------------------------------ #
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Point-in-time copy of the store
+
+        Returns:
+            dict: ``{'tokens': {token: {...}}, 'wallets': {wallet: {...}},
+            'taken_at': epoch}``; later updates do not change it
+        """
+        return {
+            'tokens': {token: dict(state) for token, state in self._tokens.items()},
+            'wallets': {wallet: dict(state) for wallet, state in self._wallets.items()},
+            'taken_at': time.time(),
+        }
+
+    def export(self, path: str) -> None:
+        """Write snapshot() to ``path`` as JSON."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, default=str)
+
+    def load(self, snapshot: Dict[str, Any]) -> None:
+        """Replace the store's contents with a snapshot() (e.g. one read back from export())."""
+        self._tokens = {token: dict(state) for token, state in snapshot.get('tokens', {}).items()}
+        self._wallets = {wallet: dict(state) for wallet, state in snapshot.get('wallets', {}).items()}
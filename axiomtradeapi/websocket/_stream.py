@@ -0,0 +1,218 @@
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+STREAM_OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+
+class EventStream:
+    """
+    Async iterator over the events of one or more subscriptions.
+
+    Returned by ``AxiomTradeWebSocketClient.stream()``/``stream_prices()``.
+    The subscriptions are made on first iteration; received events wait in a
+    bounded buffer until the consumer reads them. When the buffer is full the
+    ``overflow`` policy applies: ``block`` stalls the receive loop until the
+    consumer catches up, ``drop_oldest``/``drop_newest`` discard an event.
+
+    Leaving ``async with`` or calling ``aclose()`` unsubscribes; the stream
+    also ends when the client is closed.
+    """
+
+    def __init__(self, client, open_subscriptions: Callable[["EventStream"], Awaitable[List[Any]]],
+                 maxsize: int = 1000, overflow: str = "block", name: str = "") -> None:
+        """
+        Initialize EventStream
+
+        Args:
+            client: AxiomTradeWebSocketClient the subscriptions are made on
+            open_subscriptions: Coroutine function subscribing ``stream.push``
+                and returning the Subscription handles
+            maxsize: Maximum number of buffered events
+            overflow: One of ``block``, ``drop_oldest``, ``drop_newest``
+            name: Label used in log and error messages
+        """
+        if overflow not in STREAM_OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {STREAM_OVERFLOW_POLICIES}, got {overflow!r}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.name = name
+        self.subscriptions: List[Any] = []
+        self._client = client
+        self._open_subscriptions = open_subscriptions
+        self._opened = False
+        self._closed = False
+        self._items: deque = deque()
+        # Created lazily so they bind to the running loop
+        self._not_empty: Optional[asyncio.Event] = None
+        self._not_full: Optional[asyncio.Event] = None
+        self._stats = {'received': 0, 'dropped': 0, 'max_depth': 0}
+
+    @property
+    def depth(self) -> int:
+        """Number of events waiting to be read"""
+        return len(self._items)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _events(self) -> None:
+        if self._not_empty is None:
+            self._not_empty = asyncio.Event()
+            self._not_full = asyncio.Event()
+            self._not_full.set()
+
+    async def open(self) -> "EventStream":
+        """Make the subscriptions; called automatically on first iteration."""
+        if self._opened:
+            return self
+        if self._closed:
+            raise RuntimeError(f"Stream {self.name} is closed")
+        self._events()
+        self._opened = True
+        self._client._streams.add(self)
+        try:
+            self.subscriptions = await self._open_subscriptions(self)
+        except Exception:
+            await self.aclose()
+            raise
+        return self
+
+    async def push(self, event: Any) -> None:
+        """Buffer an event (used as the subscription callback)."""
+        if self._closed:
+            return
+        self._events()
+        items = self._items
+        if len(items) >= self.maxsize:
+            if self.overflow == "drop_newest":
+                self._stats['dropped'] += 1
+                return
+            if self.overflow == "drop_oldest":
+                items.popleft()
+                self._stats['dropped'] += 1
+            else:
+                while len(items) >= self.maxsize and not self._closed:
+                    self._not_full.clear()
+                    await self._not_full.wait()
+                if self._closed:
+                    return
+        items.append(event)
+        self._stats['received'] += 1
+        self._stats['max_depth'] = max(self._stats['max_depth'], len(items))
+        self._not_empty.set()
+
+    def _take(self) -> Any:
+        event = self._items.popleft()
+        self._not_full.set()
+        return event
+
+    async def get(self) -> Any:
+        """
+        Wait for the next event
+
+        Raises:
+            StopAsyncIteration: When the stream is closed and drained
+        """
+        await self.open()
+        while not self._items:
+            if self._closed:
+                raise StopAsyncIteration
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self._take()
+
+    async def get_batch(self, max_items: int = 100, max_wait_ms: float = 50.0) -> List[Any]:
+        """
+        Wait for the next micro-batch
+
+        Returns as soon as ``max_items`` events are buffered, or ``max_wait_ms``
+        after the first event of the batch arrived, whichever comes first.
+
+        Raises:
+            StopAsyncIteration: When the stream is closed and drained
+        """
+        if max_items < 1:
+            raise ValueError("max_items must be at least 1")
+        batch = [await self.get()]
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + max_wait_ms / 1000.0
+        while len(batch) < max_items:
+            if self._items:
+                batch.append(self._take())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0 or self._closed:
+                break
+            self._not_empty.clear()
+            try:
+                await asyncio.wait_for(self._not_empty.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _iterate(self) -> AsyncIterator[Any]:
+        try:
+            while True:
+                try:
+                    yield await self.get()
+                except StopAsyncIteration:
+                    return
+        finally:
+            await self.aclose()
+
+    async def _iterate_batches(self, max_items: int, max_wait_ms: float) -> AsyncIterator[List[Any]]:
+        try:
+            while True:
+                try:
+                    yield await self.get_batch(max_items, max_wait_ms)
+                except StopAsyncIteration:
+                    return
+        finally:
+            await self.aclose()
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._iterate()
+
+    def batches(self, max_items: int = 100, max_wait_ms: float = 50.0) -> AsyncIterator[List[Any]]:
+        """Iterate over micro-batches instead of single events (see get_batch())."""
+        return self._iterate_batches(max_items, max_wait_ms)
+
+    async def __aenter__(self) -> "EventStream":
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    def _finish(self) -> None:
+        """End the stream; buffered events can still be read."""
+        self._closed = True
+        if self._not_empty is not None:
+            self._not_empty.set()
+            self._not_full.set()
+
+    async def aclose(self) -> None:
+        """Unsubscribe and end the stream."""
+        self._finish()
+        self._client._streams.discard(self)
+        subscriptions, self.subscriptions = self.subscriptions, []
+        for subscription in subscriptions:
+            await self._client.unsubscribe(subscription)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Buffer counters
+
+        Returns:
+            dict: ``depth``, ``maxsize``, ``overflow`` and the
+            ``received``/``dropped``/``max_depth`` counters
+        """
+        return {'depth': self.depth, 'maxsize': self.maxsize, 'overflow': self.overflow,
+                **self._stats}
+
+    def __repr__(self) -> str:
+        state = "closed" if self._closed else "open"
+        return f"<EventStream {self.name} depth={self.depth} {state}>"
@@ -0,0 +1,33 @@
+import itertools
+from typing import Any, Awaitable, Callable, Dict, List
+
+_ids = itertools.count(1)
+
+
+class Subscription:
+    """
+    Handle returned by the ``subscribe_*`` methods of AxiomTradeWebSocketClient.
+
+    Several handles may share a room; the client joins a room when its first
+    handle is created and leaves it when the last one is unsubscribed.
+    """
+
+    def __init__(self, client, key: str, callback: Callable, rooms: List[str],
+                 handlers: Dict[str, Callable[[Any], Awaitable[None]]]) -> None:
+        self.id = next(_ids)
+        self.key = key
+        self.callback = callback
+        self.rooms = list(rooms)
+        self.handlers = handlers
+        self.active = True
+        self.queue = None  # DispatchQueue when the subscription is queued
+        self.endpoint = "cluster"  # socket the rooms are joined on
+        self._client = client
+
+    async def unsubscribe(self) -> bool:
+        """Remove this handler; leaves rooms that no other handle uses."""
+        return await self._client.unsubscribe(self)
+
+    def __repr__(self) -> str:
+        state = "active" if self.active else "closed"
+        return f"<Subscription {self.key} rooms={self.rooms} {state}>"
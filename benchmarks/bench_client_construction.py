@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark AxiomTradeClient construction cost for N clients.
+
+"lazy" constructs clients the way the SDK does now: the storage dir, Fernet
+key, saved-token decryption and requests.Session are deferred to first use.
+"eager" constructs and immediately calls warm(), which performs the start-up
+work the constructor used to do. "--baseline REV" also times the constructor
+of the package as it was at git revision REV (e.g. the commit before lazy
+construction), exported to a temporary directory and run in a subprocess.
+
+Usage:
+    python benchmarks/bench_client_construction.py --clients 300
+    python benchmarks/bench_client_construction.py --clients 300 --baseline d44c7aa~1
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.auth.auth_manager import AuthManager
+from axiomtradeapi.client import AxiomTradeClient
+
+
+def _prepare_storage(root: str, count: int) -> list:
+    """Create one storage dir per client holding a key and saved tokens"""
+    dirs = []
+    for i in range(count):
+        storage_dir = os.path.join(root, f"account-{i}")
+        AuthManager(auth_token="access.token.value", refresh_token="refresh-token",
+                    storage_dir=storage_dir).warm()
+        dirs.append(storage_dir)
+    return dirs
+
+
+def _construct(dirs: list, warm: bool) -> float:
+    start = time.perf_counter()
+    for storage_dir in dirs:
+        client = AxiomTradeClient(storage_dir=storage_dir)
+        if warm:
+            client.warm()
+    return time.perf_counter() - start
+
+
+_BASELINE_SCRIPT = """
+import json, logging, sys, time
+sys.path.insert(0, sys.argv[1])
+from axiomtradeapi.client import AxiomTradeClient
+logging.disable(logging.INFO)
+dirs, rounds = json.loads(sys.argv[2]), int(sys.argv[3])
+best = None
+for _ in range(rounds):
+    start = time.perf_counter()
+    for storage_dir in dirs:
+        AxiomTradeClient(storage_dir=storage_dir)
+    elapsed = time.perf_counter() - start
+    best = elapsed if best is None else min(best, elapsed)
+print(best)
+"""
+
+
+def _construct_at_revision(rev: str, dirs: list, rounds: int) -> float:
+    """Best construction time of the package checked out at git revision ``rev``"""
+    repo = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    with tempfile.TemporaryDirectory() as checkout:
+        archive = os.path.join(checkout, 'src.tar')
+        subprocess.run(['git', 'archive', '--format=tar', '-o', archive, rev, 'axiomtradeapi'],
+                       cwd=repo, check=True)
+        with tarfile.open(archive) as tar:
+            tar.extractall(checkout)
+        output = subprocess.run([sys.executable, '-c', _BASELINE_SCRIPT, checkout, json.dumps(dirs), str(rounds)],
+                                check=True, capture_output=True, text=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--clients', type=int, default=300, help='number of clients to construct')
+    parser.add_argument('--rounds', type=int, default=3, help='rounds per mode (best is reported)')
+    parser.add_argument('--baseline', metavar='REV', help='also time the constructor at this git revision')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as root:
+        dirs = _prepare_storage(root, args.clients)
+        results = {}
+        if args.baseline:
+            results[f'baseline ({args.baseline})'] = _construct_at_revision(args.baseline, dirs, args.rounds)
+        for mode, warm in (('eager (construct + warm)', True), ('lazy (construct only)', False)):
+            results[mode] = min(_construct(dirs, warm) for _ in range(args.rounds))
+
+    print(f"Constructing {args.clients} clients (best of {args.rounds}):")
+    for mode, elapsed in results.items():
+        per_client = elapsed / args.clients * 1000
+        print(f"  {mode:<26} {elapsed * 1000:9.1f} ms total  {per_client:7.3f} ms/client")
+    lazy = results['lazy (construct only)']
+    print(f"  speed-up: {results['eager (construct + warm)'] / lazy:.1f}x over eager", end='')
+    if args.baseline:
+        print(f", {results[f'baseline ({args.baseline})'] / lazy:.1f}x over baseline")
+    else:
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark AxiomTradeWebSocketClient frame dispatch against subscription count.
+
+Registers N token price subscriptions (plus a wallet and a new_pairs
+subscription) without a network connection and times _dispatch() for frames
+addressed to one subscribed token and to an unsubscribed room. Frames are
+compact UTF-8 bytes with a pair-sized payload, as received from the server.
+
+With --replay, a recording made by start_recording() is dispatched at max
+speed to an offline client subscribed to every room it contains.
+
+Usage:
+    python benchmarks/bench_ws_dispatch.py --subscriptions 100 1000 5000
+    python benchmarks/bench_ws_dispatch.py --replay frames.log.gz
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.websocket._client import AxiomTradeWebSocketClient
+from axiomtradeapi.websocket._codec import extract_room
+from axiomtradeapi.websocket._recorder import read_frames
+
+
+async def _noop(_):
+    pass
+
+
+async def _build_client(subscriptions: int) -> AxiomTradeWebSocketClient:
+    client = AxiomTradeWebSocketClient(Mock(), log_level=logging.WARNING)
+
+    async def connected(*args, **kwargs):
+        return True
+
+    async def send(*args, **kwargs):
+        pass
+
+    client._ensure_connected = connected
+    client._send = send
+    await client.subscribe_new_tokens(_noop)
+    await client.subscribe_wallet_transactions("Wallet1111111111111111111111111111111111111", _noop)
+    for i in range(subscriptions):
+        await client.subscribe_token_price(f"Token{i:039d}", _noop)
+    return client
+
+
+# Roughly the size and shape of a new_pairs / price frame
+_CONTENT = {
+    "tokenName": "Example", "tokenTicker": "EXM", "tokenAddress": "Mint" + "1" * 40,
+    "pairAddress": "Pair" + "2" * 40, "protocol": "Pump V1", "marketCapSol": 31.53,
+    "volumeSol": 12.04, "liquiditySol": 30.0, "liquidityToken": 1.0e9, "supply": 1.0e9,
+    "top10Holders": 18.2, "devHoldsPercent": 2.1, "snipersHoldPercent": 0.0,
+    "pairCreatedAt": "2026-01-01T00:00:00.000Z", "website": None, "twitter": None,
+    "telegram": None, "discord": None, "mintAuthority": None, "freezeAuthority": None,
+    "lpBurned": 100, "deployerAddress": "Dev" + "3" * 40, "extra": list(range(20)),
+}
+
+
+def _frame(room: str) -> bytes:
+    return json.dumps({"room": room, "content": _CONTENT}, separators=(',', ':')).encode()
+
+
+async def _time_dispatch(client, frame: str, frames: int) -> float:
+    start = time.perf_counter()
+    for _ in range(frames):
+        await client._dispatch(frame)
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+async def _run(counts, frames):
+    print(f"{'subscriptions':>13} {'hit (us/frame)':>16} {'miss (us/frame)':>16}")
+    for count in counts:
+        client = await _build_client(count)
+        hit = _frame(f"Token{count // 2:039d}")
+        miss = _frame("unrelated-room")
+        print(f"{count:>13} {await _time_dispatch(client, hit, frames):>16.2f} "
+              f"{await _time_dispatch(client, miss, frames):>16.2f}")
+
+
+async def _run_replay(path):
+    client = AxiomTradeWebSocketClient(Mock(), log_level=logging.WARNING, offline=True)
+    rooms = {extract_room(raw) for _, _, raw in read_frames(path)} - {None}
+    for room in rooms:
+        await client._subscribe(room, _noop, [room], {room: _noop})
+    start = time.perf_counter()
+    frames = await client.replay(path, speed=None)
+    elapsed = time.perf_counter() - start
+    print(f"{frames} frames, {len(rooms)} rooms: {elapsed / max(frames, 1) * 1e6:.2f} us/frame")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--subscriptions', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--frames', type=int, default=2000, help='frames dispatched per measurement')
+    parser.add_argument('--replay', metavar='PATH', help='dispatch a recorded frame log instead')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    if args.replay:
+        asyncio.run(_run_replay(args.replay))
+    else:
+        asyncio.run(_run(args.subscriptions, args.frames))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark AxiomTradeWebSocketClient end to end against MockAxiomServer.
+
+Subscribes to N token price rooms on a local mock server, pushes frames
+round-robin over those rooms through a real WebSocket and reports how many
+frames per second the client receives, decodes and dispatches. With
+--drops, the server drops the connection that many times during the run
+and the reconnect count and frames lost are reported as well.
+
+Usage:
+    python benchmarks/bench_ws_mock_server.py --rooms 10 100 --frames 20000
+    python benchmarks/bench_ws_mock_server.py --rooms 100 --drops 3
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.websocket._client import AxiomTradeWebSocketClient
+from axiomtradeapi.websocket._mock_server import MockAxiomServer
+
+
+def _auth_manager():
+    auth = Mock()
+    auth.ensure_valid_authentication.return_value = True
+    auth.get_tokens.return_value = Mock(access_token="tok", refresh_token="ref")
+    return auth
+
+
+async def _run_once(rooms: int, frames: int, drops: int):
+    received = 0
+
+    async def on_price(_):
+        nonlocal received
+        received += 1
+
+    async with MockAxiomServer(seed=1) as server:
+        client = AxiomTradeWebSocketClient(_auth_manager(), log_level=logging.CRITICAL,
+                                           preflight=False, reconnect_base_delay=0.01)
+        client.ws_url = client.ws_url_token_price = server.url
+        client.ws_fallback_urls = []
+        tokens = [f"Token{i:039d}" for i in range(rooms)]
+        await client.subscribe_token_prices(tokens, lambda token, price: on_price(price))
+        task = asyncio.ensure_future(client.start())
+        while len(server.rooms()) < rooms:
+            await asyncio.sleep(0.01)
+
+        contents = [server.make_content("price", token) for token in tokens]
+        drop_every = frames // (drops + 1) if drops else None
+        start = time.perf_counter()
+        for i in range(frames):
+            if drop_every and i and i % drop_every == 0:
+                connections = server.get_stats()['connections']
+                await server.drop_connections()
+                while server.get_stats()['connections'] == connections or len(server.rooms()) < rooms:
+                    await asyncio.sleep(0.001)
+            await server.push(tokens[i % rooms], contents[i % rooms])
+        # Wait for the client to drain what is in flight
+        last, idle = -1, 0
+        while received < frames and idle < 20:
+            await asyncio.sleep(0.01)
+            idle = idle + 1 if received == last else 0
+            last = received
+        elapsed = time.perf_counter() - start
+        stats = client.get_connection_stats()
+        await client.close()
+        await asyncio.wait_for(task, 5)
+    return received, elapsed, stats
+
+
+async def _run(room_counts, frames, drops):
+    print(f"{'rooms':>6} {'frames/s':>10} {'us/frame':>9} {'received':>9} {'reconnects':>10}")
+    for rooms in room_counts:
+        received, elapsed, stats = await _run_once(rooms, frames, drops)
+        print(f"{rooms:>6} {received / elapsed:>10.0f} {elapsed / max(received, 1) * 1e6:>9.2f} "
+              f"{received:>9} {stats['connects'] - 1:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rooms', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--frames', type=int, default=20000, help='frames pushed per measurement')
+    parser.add_argument('--drops', type=int, default=0, help='simulated disconnects during the run')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(_run(args.rooms, args.frames, args.drops))
+
+
+if __name__ == '__main__':
+    main()
@@ -23,6 +23,7 @@ setup(
         "telegram": ["python-telegram-bot>=20.0"],
         "dev": ["pytest", "black", "flake8"],
         "all-proxies": ["beautifulsoup4", "websockets-proxy>=0.1.0", "requests[socks]"],
+        "fast-json": ["orjson"],
     },
     include_package_data=True,
     license="MIT",
@@ -0,0 +1,161 @@
+"""
+Test the warm browser pool used by AuthManager browser logins.
+
+nodriver is replaced by a fake module so the pool can be exercised without
+launching Chrome.
+"""
+import asyncio
+import threading
+import time
+import types
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.auth.auth_manager import AuthManager
+from axiomtradeapi.auth.browser_pool import BrowserPool
+
+
+class FakeBrowser:
+    launched = 0
+
+    def __init__(self):
+        FakeBrowser.launched += 1
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+    async def send(self, command):
+        return []
+
+
+async def _fake_start(**kwargs):
+    return FakeBrowser()
+
+
+class SlowMailbox:
+    """Blocking imaplib stand-in: a slow connect, then one Axiom OTP email"""
+
+    def __init__(self, host):
+        time.sleep(0.3)
+        self.searches = 0
+
+    def login(self, user, password):
+        pass
+
+    def select(self, mailbox):
+        pass
+
+    def check(self):
+        pass
+
+    def search(self, charset, criteria):
+        self.searches += 1
+        return "OK", [b"" if self.searches == 1 else b"1"]
+
+    def fetch(self, msg_id, parts):
+        return "OK", [(b"1", b"From: no-reply@axiom.trade\r\nSubject: Code\r\n\r\nYour code is 123456\r\n")]
+
+    def close(self):
+        pass
+
+    def logout(self):
+        pass
+
+
+class TestBrowserPool(unittest.TestCase):
+
+    def setUp(self):
+        FakeBrowser.launched = 0
+        fake_nodriver = types.SimpleNamespace(start=_fake_start)
+        patcher = patch.dict(sys.modules, {'nodriver': fake_nodriver})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_concurrency_is_bounded_by_pool_size(self):
+        pool = BrowserPool(size=2)
+        self.addCleanup(pool.close)
+        state = {'active': 0, 'peak': 0}
+        lock = threading.Lock()
+
+        async def login(lease):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            await asyncio.sleep(0.05)
+            with lock:
+                state['active'] -= 1
+            return True
+
+        threads = [threading.Thread(target=pool.run, args=(login,)) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(state['peak'], 2)
+        self.assertEqual(FakeBrowser.launched, 2)
+        self.assertEqual(pool.get_stats()['logins'], 6)
+
+    def test_slow_otp_fetches_do_not_serialise_pooled_logins(self):
+        pool = BrowserPool(size=3)
+        self.addCleanup(pool.close)
+        manager = AuthManager(username="user@example.com", password="pw", use_saved_tokens=False)
+        manager.imap_host = "imap.example.com"
+        manager.imap_poll_interval = 0.01
+
+        async def login(lease):
+            return await manager._get_otp_from_imap(timeout=5)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(pool.run(login))) for _ in range(3)]
+        with patch('imaplib.IMAP4_SSL', SlowMailbox):
+            started = time.monotonic()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.monotonic() - started
+
+        self.assertEqual(results, ["123456"] * 3)
+        # Three 0.3 s blocking connects overlap instead of running one after another
+        self.assertLess(elapsed, 0.75)
+
+    def test_broken_browser_is_recycled(self):
+        pool = BrowserPool(size=1)
+        self.addCleanup(pool.close)
+        seen = []
+
+        async def crashing_login(lease):
+            seen.append(lease.browser)
+            lease.broken = True
+            return False
+
+        async def login(lease):
+            seen.append(lease.browser)
+            return True
+
+        self.assertFalse(pool.run(crashing_login))
+        self.assertTrue(pool.run(login))
+        self.assertIsNot(seen[0], seen[1])
+        self.assertTrue(seen[0].stopped)
+        self.assertEqual(pool.get_stats()['crashes'], 1)
+
+    def test_browser_is_recycled_after_max_uses(self):
+        pool = BrowserPool(size=1, max_uses=2)
+        self.addCleanup(pool.close)
+
+        async def login(lease):
+            return lease.browser
+
+        browsers = [pool.run(login) for _ in range(3)]
+        self.assertIs(browsers[0], browsers[1])
+        self.assertIsNot(browsers[1], browsers[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Test the cf_clearance lifecycle manager and its use by the auth and
+WebSocket clients.
+"""
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.auth.auth_manager import AuthManager
+from axiomtradeapi.auth.clearance import ClearanceManager
+from axiomtradeapi.websocket._client import AxiomTradeWebSocketClient
+
+
+class TestClearanceManager(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _manager(self, **kwargs):
+        kwargs.setdefault('auto_refresh', False)
+        return ClearanceManager(storage_dir=self.tmp.name, **kwargs)
+
+    def test_cookie_is_shared_between_managers(self):
+        first, second = self._manager(), self._manager()
+        first.set("clearance-1", time.time() + 3600)
+        self.assertEqual(second.get(), "clearance-1")
+
+        time.sleep(0.01)
+        second.set("clearance-2", time.time() + 3600)
+        self.assertEqual(first.get(), "clearance-2")
+
+    def test_expired_cookie_is_not_returned(self):
+        manager = self._manager()
+        manager.set("clearance", time.time() + 3600)
+        manager.invalidate()
+        self.assertIsNone(manager.get())
+
+    def test_seed_does_not_revive_stale_value(self):
+        manager = self._manager()
+        manager.set("old", time.time() + 3600)
+        manager.invalidate()
+        manager.seed("old")
+        self.assertIsNone(manager.get())
+        manager.seed("new")
+        self.assertEqual(manager.get(), "new")
+
+    def test_refresh_starts_ahead_of_expiry(self):
+        manager = self._manager(auto_refresh=True, refresh_margin=600)
+        manager.set("clearance", time.time() + 300)
+
+        with patch.object(manager, 'refresh') as refresh:
+            value = manager.get()
+            manager._refresh_thread.join()
+
+        self.assertEqual(value, "clearance")
+        refresh.assert_called_once()
+
+    def test_auth_manager_and_websocket_use_current_value(self):
+        manager = self._manager()
+        manager.set("shared", time.time() + 3600)
+        auth = AuthManager(use_saved_tokens=False, storage_dir=self.tmp.name,
+                           clearance_manager=manager)
+        self.assertEqual(auth.cf_clearance, "shared")
+
+        ws = AxiomTradeWebSocketClient(auth)
+        tokens = Mock(access_token="tok", refresh_token="ref")
+        self.assertEqual(ws._build_cookies(tokens)['cf_clearance'], "shared")
+
+        time.sleep(0.01)
+        manager.set("rotated", time.time() + 3600)
+        self.assertEqual(ws._build_cookies(tokens)['cf_clearance'], "rotated")
+        headers = auth.get_authenticated_headers()
+        self.assertIn("cf_clearance=rotated", headers.get("Cookie", ""))
+
+
+if __name__ == '__main__':
+    unittest.main()
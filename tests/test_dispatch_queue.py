@@ -0,0 +1,175 @@
+"""
+Test bounded per-subscription dispatch queues and their overflow policies.
+"""
+import asyncio
+import json
+import unittest
+from unittest.mock import Mock, AsyncMock
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.websocket._client import AxiomTradeWebSocketClient
+from axiomtradeapi.websocket._dispatch import DispatchQueue
+
+
+class TestDispatchQueuePolicies(unittest.TestCase):
+
+    def _fill(self, overflow, frames, maxsize=2):
+        """Enqueue ``frames`` while the consumer is blocked, then release it."""
+        delivered = []
+
+        async def run():
+            gate = asyncio.Event()
+
+            async def deliver(room, content):
+                await gate.wait()
+                delivered.append((room, content))
+
+            queue = DispatchQueue(deliver, maxsize=maxsize, overflow=overflow)
+            await queue.put(*frames[0])
+            await asyncio.sleep(0)  # worker takes the first frame and blocks
+            for frame in frames[1:]:
+                await queue.put(*frame)
+            depth = queue.depth
+            gate.set()
+            while queue.depth:
+                await asyncio.sleep(0.001)
+            await asyncio.sleep(0.001)
+            await queue.stop()
+            return depth, queue.get_stats()
+
+        depth, stats = asyncio.run(run())
+        return delivered, depth, stats
+
+    def test_drop_oldest(self):
+        frames = [("a", i) for i in range(5)]
+        delivered, depth, stats = self._fill("drop_oldest", frames)
+        self.assertEqual(depth, 2)
+        self.assertEqual([c for _, c in delivered], [0, 3, 4])
+        self.assertEqual(stats['dropped'], 2)
+
+    def test_drop_newest(self):
+        frames = [("a", i) for i in range(5)]
+        delivered, _, stats = self._fill("drop_newest", frames)
+        self.assertEqual([c for _, c in delivered], [0, 1, 2])
+        self.assertEqual(stats['dropped'], 2)
+
+    def test_conflate_keeps_latest_per_room(self):
+        frames = [("a", 0), ("a", 1), ("b", 1), ("a", 2), ("b", 2), ("a", 3)]
+        delivered, depth, stats = self._fill("conflate", frames)
+        self.assertEqual(depth, 2)
+        self.assertEqual(delivered, [("a", 0), ("a", 3), ("b", 2)])
+        self.assertEqual(stats['dropped'], 3)
+
+    def test_block_applies_backpressure(self):
+        async def run():
+            gate = asyncio.Event()
+
+            async def deliver(room, content):
+                await gate.wait()
+
+            queue = DispatchQueue(deliver, maxsize=1, overflow="block")
+            await queue.put("a", 0)
+            await asyncio.sleep(0)
+            await queue.put("a", 1)
+            blocked = asyncio.ensure_future(queue.put("a", 2))
+            await asyncio.sleep(0.01)
+            self.assertFalse(blocked.done())
+            gate.set()
+            await asyncio.wait_for(blocked, 1)
+            await queue.stop()
+            return queue.get_stats()
+
+        stats = asyncio.run(run())
+        self.assertEqual(stats['dropped'], 0)
+        self.assertEqual(stats['enqueued'], 3)
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            DispatchQueue(AsyncMock(), overflow="fifo")
+
+
+class TestQueuedSubscriptions(unittest.TestCase):
+
+    def setUp(self):
+        self.client = AxiomTradeWebSocketClient(Mock(), queue_size=10)
+        self.client._ensure_connected = AsyncMock(return_value=True)
+        self.client._send = AsyncMock()
+
+    def test_slow_callback_does_not_stall_dispatch(self):
+        started = []
+
+        async def slow(content):
+            started.append(content)
+            await asyncio.sleep(0.05)
+
+        async def run():
+            await self.client.subscribe_token_price("Token1", slow)
+            loop = asyncio.get_running_loop()
+            t0 = loop.time()
+            for i in range(5):
+                await self.client._dispatch(json.dumps({"room": "Token1", "content": {"i": i}}))
+            elapsed = loop.time() - t0
+            await asyncio.sleep(0.01)
+            stats = self.client.get_queue_stats()
+            await self.client.close()
+            return elapsed, stats
+
+        elapsed, stats = asyncio.run(run())
+        self.assertLess(elapsed, 0.05)
+        self.assertEqual(started, [{"i": 0}])
+        self.assertEqual(stats[0]['key'], "token_price_Token1")
+        self.assertEqual(stats[0]['enqueued'], 5)
+
+    def test_per_subscription_override_and_validation(self):
+        async def run():
+            inline = await self.client.subscribe_new_tokens(AsyncMock(), queue_size=0)
+            return inline
+
+        with self.assertRaises(ValueError):
+            asyncio.run(run())
+
+        async def run_override():
+            return await self.client.subscribe_token_price("Token1", AsyncMock(), overflow="conflate")
+
+        handle = asyncio.run(run_override())
+        self.assertEqual(handle.queue.overflow, "conflate")
+        self.assertEqual(handle.queue.maxsize, 10)
+
+
+
+class TestPriceConflation(unittest.TestCase):
+
+    def test_burst_collapses_to_latest_tick(self):
+        client = AxiomTradeWebSocketClient(Mock())
+        client._ensure_connected = AsyncMock(return_value=True)
+        client._send = AsyncMock()
+        seen = []
+
+        async def on_price(content):
+            seen.append(content["price"])
+            await asyncio.sleep(0.01)
+
+        async def run():
+            handle = await client.subscribe_token_price("Token1", on_price, conflate=True)
+            for i in range(100):
+                await client._dispatch(json.dumps({"room": "Token1", "content": {"price": i}}))
+                if i == 0:
+                    await asyncio.sleep(0)  # callback picks up the first tick and stays busy
+            await client._dispatch(json.dumps({"room": "Token1", "content": None}))
+            for _ in range(200):
+                if not handle.queue.depth and len(seen) >= 2:
+                    break
+                await asyncio.sleep(0.005)
+            await client.close()
+            return handle.queue.get_stats()
+
+        stats = asyncio.run(run())
+        self.assertEqual(seen, [0, 99])
+        self.assertEqual(stats['dropped'], 98)
+
+
+if __name__ == '__main__':
+    unittest.main()
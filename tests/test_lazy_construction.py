@@ -0,0 +1,58 @@
+"""
+Test that AuthManager / AxiomTradeClient defer storage, key and session
+set-up until first use or warm().
+"""
+import os
+import tempfile
+import unittest
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.auth.auth_manager import AuthManager
+from axiomtradeapi.client import AxiomTradeClient
+
+
+class TestLazyConstruction(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.storage_dir = os.path.join(self.tmp.name, "store")
+
+    def test_construction_does_not_touch_storage(self):
+        client = AxiomTradeClient(storage_dir=self.storage_dir)
+        self.assertFalse(os.path.exists(self.storage_dir))
+        self.assertIsNone(client._session)
+        self.assertIsNone(client.auth_manager.token_storage._cipher_suite)
+
+    def test_provided_tokens_are_saved_on_warm(self):
+        auth = AuthManager(auth_token="access", refresh_token="refresh",
+                           storage_dir=self.storage_dir)
+        self.assertFalse(os.path.exists(self.storage_dir))
+        auth.warm()
+        self.assertTrue(auth.has_saved_tokens())
+
+    def test_saved_tokens_are_loaded_on_first_access(self):
+        AuthManager(auth_token="access", refresh_token="refresh",
+                    storage_dir=self.storage_dir).warm()
+
+        client = AxiomTradeClient(storage_dir=self.storage_dir)
+        self.assertFalse(client.auth_manager._storage_loaded)
+        self.assertEqual(client.access_token, "access")
+        self.assertEqual(client.session.cookies.get('auth-access-token'), "access")
+
+    def test_explicit_tokens_are_not_overwritten_by_saved_ones(self):
+        AuthManager(auth_token="old", refresh_token="old-refresh",
+                    storage_dir=self.storage_dir).warm()
+
+        client = AxiomTradeClient(auth_token="new", refresh_token="new-refresh",
+                                  storage_dir=self.storage_dir)
+        tokens = client.auth_manager.tokens
+        self.assertEqual((tokens.access_token, tokens.refresh_token), ("new", "new-refresh"))
+        self.assertEqual(client.access_token, "new")
+        # The explicit tokens replaced the saved ones on disk too
+        self.assertEqual(AuthManager(storage_dir=self.storage_dir).tokens.access_token, "new")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Test the shared mailbox OTP router.
+
+A fake IMAP4_SSL stands in for the catch-all mailbox so we can check that
+several logins share one connection and each gets the code sent to its alias.
+"""
+import asyncio
+import threading
+import time
+import unittest
+from email.message import EmailMessage
+from email.utils import formatdate
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.tools.otp_router import SharedMailboxOTPRouter
+
+
+def _otp_email(recipient, code, sender="Axiom <no-reply@axiom.trade>",
+               subject="Your Axiom security code"):
+    msg = EmailMessage()
+    msg['From'] = sender
+    msg['To'] = recipient
+    msg['Subject'] = subject
+    msg['Date'] = formatdate(time.time())
+    msg.set_content(f"Your security code is {code}")
+    return msg.as_bytes()
+
+
+class FakeIMAP:
+    """Minimal UID-based IMAP mailbox shared by every connection."""
+    instances = []
+    messages = {}
+    lock = threading.Lock()
+
+    def __init__(self, host, port):
+        self.fetched = []
+        FakeIMAP.instances.append(self)
+
+    @classmethod
+    def deliver(cls, raw):
+        with cls.lock:
+            cls.messages[max(cls.messages, default=0) + 1] = raw
+
+    def login(self, user, password):
+        return "OK", [b""]
+
+    def select(self, mailbox):
+        return "OK", [b""]
+
+    def status(self, mailbox, items):
+        with FakeIMAP.lock:
+            return "OK", [f'INBOX (UIDNEXT {max(FakeIMAP.messages, default=0) + 1})'.encode()]
+
+    def noop(self):
+        return "OK", [b""]
+
+    def uid(self, command, *args):
+        with FakeIMAP.lock:
+            if command == 'search':
+                start = int(args[1].split()[1].split(':')[0])
+                uids = [u for u in FakeIMAP.messages if u >= start] or list(FakeIMAP.messages)[-1:]
+                return "OK", [b" ".join(str(u).encode() for u in uids)]
+            uid = int(args[0])
+            self.fetched.append(uid)
+            return "OK", [(b"1 (BODY[] {0})", FakeIMAP.messages[uid]), b")"]
+
+    def close(self):
+        pass
+
+    def logout(self):
+        pass
+
+
+class TestSharedMailboxOTPRouter(unittest.TestCase):
+
+    def setUp(self):
+        FakeIMAP.instances = []
+        FakeIMAP.messages = {}
+        FakeIMAP.deliver(_otp_email("old@example.com", "000000"))
+        self.router = SharedMailboxOTPRouter(check_interval=0.05, lookback=0)
+        patcher = patch('axiomtradeapi.tools.otp_router.imaplib.IMAP4_SSL', FakeIMAP)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.router.close)
+
+    def test_routes_codes_by_recipient_over_one_connection(self):
+        async def run():
+            waits = [
+                asyncio.ensure_future(self.router.wait_for_otp_async(
+                    f"user{i}@example.com", imap_user="catchall@example.com",
+                    imap_password="pw", imap_host="imap.example.com", timeout=5))
+                for i in range(3)
+            ]
+            await asyncio.sleep(0.2)
+            for i in reversed(range(3)):
+                FakeIMAP.deliver(_otp_email(f"User{i}@example.com", f"{i}{i}{i}111"))
+            return await asyncio.gather(*waits)
+
+        codes = asyncio.run(run())
+        self.assertEqual(codes, ["000111", "111111", "222111"])
+        self.assertEqual(len(FakeIMAP.instances), 1)
+        # Every message is fetched once, the pre-existing one is never fetched
+        fetched = FakeIMAP.instances[0].fetched
+        self.assertEqual(sorted(fetched), [2, 3, 4])
+
+    def test_code_that_arrives_before_its_login_waits_is_kept(self):
+        async def run():
+            first = asyncio.ensure_future(self.router.wait_for_otp_async(
+                "first@example.com", imap_user="catchall@example.com", imap_password="pw", timeout=5))
+            await asyncio.sleep(0.1)
+            # The second login's code is polled while only the first one waits
+            FakeIMAP.deliver(_otp_email("second@example.com", "222222"))
+            await asyncio.sleep(0.3)
+            second = await self.router.wait_for_otp_async(
+                "second@example.com", imap_user="catchall@example.com", imap_password="pw", timeout=0.5)
+            FakeIMAP.deliver(_otp_email("first@example.com", "111111"))
+            return await first, second
+
+        self.assertEqual(asyncio.run(run()), ("111111", "222222"))
+
+    def test_unclaimed_code_expires_after_clock_skew(self):
+        self.router.clock_skew = 0.1
+        self.router._route(["late@example.com"], "333333", time.time())
+        time.sleep(0.2)
+        code = self.router.wait_for_otp("late@example.com", imap_user="catchall@example.com",
+                                        imap_password="pw", timeout=0.2)
+        self.assertIsNone(code)
+
+    def test_ignores_non_axiom_email_and_times_out(self):
+        def deliver_later():
+            time.sleep(0.2)
+            FakeIMAP.deliver(_otp_email("user@example.com", "123456", sender="spam@other.com",
+                                          subject="Your invoice 123456"))
+
+        threading.Thread(target=deliver_later).start()
+        code = self.router.wait_for_otp("user@example.com", imap_user="catchall@example.com",
+                                        imap_password="pw", timeout=0.6)
+        self.assertIsNone(code)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Test the staggered fleet-wide token refresh scheduler.
+"""
+import asyncio
+import threading
+import time
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.auth.auth_manager import AuthTokens
+from axiomtradeapi.tools.refresh_scheduler import TokenRefreshScheduler
+
+
+class FakeAuthManager:
+    """Stands in for AuthManager; refresh_tokens extends the expiry."""
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, username, expires_at, succeed=True):
+        self.username = username
+        self.tokens = AuthTokens("access", "refresh", expires_at, time.time())
+        self.succeed = succeed
+        self.lifetime = 3600
+        self.refreshed_at = []
+
+    def refresh_tokens(self):
+        with FakeAuthManager.lock:
+            FakeAuthManager.active += 1
+            FakeAuthManager.peak = max(FakeAuthManager.peak, FakeAuthManager.active)
+        time.sleep(0.02)
+        self.refreshed_at.append(time.time())
+        with FakeAuthManager.lock:
+            FakeAuthManager.active -= 1
+        if self.succeed:
+            self.tokens = AuthTokens("access2", "refresh", time.time() + self.lifetime, time.time())
+        return self.succeed
+
+
+class TestTokenRefreshScheduler(unittest.TestCase):
+
+    def setUp(self):
+        FakeAuthManager.active = 0
+        FakeAuthManager.peak = 0
+
+    def test_offsets_spread_accounts_over_window(self):
+        scheduler = TokenRefreshScheduler(lead_time=60, spread_window=600)
+        expires = time.time() + 3600
+        for i in range(50):
+            scheduler.add(FakeAuthManager(f"user{i}@example.com", expires))
+        due = sorted(scheduler.due_at(f"user{i}@example.com") for i in range(50))
+        self.assertGreater(due[-1] - due[0], 400)
+        self.assertLessEqual(due[-1], expires - 60)
+        self.assertGreaterEqual(due[0], expires - 660)
+
+    def test_refreshes_respect_concurrency_cap_and_report_metrics(self):
+        scheduler = TokenRefreshScheduler(lead_time=0, spread_window=0.2, max_concurrency=2,
+                                          min_interval=0.0, tick=0.02)
+        expires = time.time()
+        managers = [FakeAuthManager(f"user{i}@example.com", expires) for i in range(8)]
+        for manager in managers:
+            scheduler.add(manager)
+
+        async def run():
+            scheduler.start()
+            deadline = time.time() + 5
+            while scheduler.get_metrics()['refreshed'] < len(managers) and time.time() < deadline:
+                await asyncio.sleep(0.02)
+            await scheduler.stop()
+            return scheduler.get_metrics()
+
+        metrics = asyncio.run(run())
+        self.assertEqual(metrics['refreshed'], 8)
+        self.assertEqual(metrics['backlog'], 0)
+        self.assertLessEqual(FakeAuthManager.peak, 2)
+        self.assertGreater(metrics['latency_avg'], 0)
+        self.assertTrue(all(len(m.refreshed_at) == 1 for m in managers))
+
+    def test_spread_shifts_only_the_first_refresh(self):
+        scheduler = TokenRefreshScheduler(lead_time=0.3, spread_window=0.3, min_interval=0.0,
+                                          min_refresh_interval=0.2, tick=0.02)
+        scheduler._offset_for = lambda account_id: 0.3
+        manager = FakeAuthManager("user@example.com", time.time() + 0.6)
+        manager.lifetime = 0.6
+        scheduler.add(manager)
+
+        async def run():
+            scheduler.start()
+            await asyncio.sleep(1.5)
+            await scheduler.stop()
+
+        asyncio.run(run())
+        # First refresh at once (0.6 - 0.3 - 0.3), then every lifetime - lead_time
+        intervals = [b - a for a, b in zip(manager.refreshed_at, manager.refreshed_at[1:])]
+        self.assertGreaterEqual(len(intervals), 2)
+        self.assertLessEqual(len(intervals), 5)
+        self.assertTrue(all(interval >= 0.25 for interval in intervals), intervals)
+
+    def test_refresh_is_not_due_before_min_refresh_interval(self):
+        scheduler = TokenRefreshScheduler(lead_time=360, spread_window=600, min_refresh_interval=60)
+        manager = FakeAuthManager("user@example.com", time.time() + 900)
+        scheduler.add(manager)
+        # Token lifetime is shorter than lead_time + spread_window
+        self.assertGreaterEqual(scheduler.due_at("user@example.com"), manager.tokens.issued_at + 60)
+
+    def test_failed_refresh_is_retried_with_backoff(self):
+        scheduler = TokenRefreshScheduler(lead_time=0, spread_window=0, retry_delay=60, tick=0.02)
+        manager = FakeAuthManager("user@example.com", time.time(), succeed=False)
+        scheduler.add(manager)
+
+        async def run():
+            scheduler.start()
+            await asyncio.sleep(0.2)
+            await scheduler.stop()
+
+        asyncio.run(run())
+        self.assertEqual(len(manager.refreshed_at), 1)
+        self.assertEqual(scheduler.get_metrics()['failed'], 1)
+        self.assertGreater(scheduler.due_at("user@example.com"), time.time() + 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,212 @@
+"""
+Test plain (non-async) callbacks running on the callback pool.
+"""
+import asyncio
+import json
+import logging
+import sys
+import os
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, AsyncMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.websocket._client import AxiomTradeWebSocketClient
+from axiomtradeapi.websocket._executor import CallbackPool, is_async_callable
+from axiomtradeapi.websocket._mock_server import MockAxiomServer
+
+
+def _frame(room, content):
+    return json.dumps({"room": room, "content": content})
+
+
+async def _until(predicate, timeout=2.0):
+    loop = asyncio.get_event_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        if loop.time() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.002)
+
+
+class TestSyncCallbacks(unittest.TestCase):
+
+    def setUp(self):
+        self.client = AxiomTradeWebSocketClient(Mock(), callback_workers=4)
+        self.client._ensure_connected = AsyncMock(return_value=True)
+        self.client._send = AsyncMock()
+
+    def test_sync_callbacks_run_off_the_loop_in_order(self):
+        calls = []
+
+        def on_transaction(tx):
+            time.sleep(0.001)
+            calls.append((tx["n"], threading.current_thread().name))
+
+        async def run():
+            await self.client.subscribe_wallet_transactions("W", on_transaction)
+            for n in range(20):
+                await self.client._dispatch(_frame("v:W", {"n": n}))
+            await _until(lambda: len(calls) == 20)
+            stats = self.client.get_callback_stats()
+            await self.client.close()
+            return stats
+
+        stats = asyncio.run(run())
+        self.assertEqual([n for n, _ in calls], list(range(20)))
+        self.assertTrue(all(name.startswith("axiom-callback") for _, name in calls))
+        self.assertEqual((stats['lanes'], stats['delivered'], stats['errors']), (1, 20, 0))
+
+    def test_rooms_run_in_parallel_without_blocking_dispatch(self):
+        both_running = threading.Barrier(2, timeout=2)
+        seen = []
+
+        def on_price(price):
+            both_running.wait()  # only passes if the other room runs concurrently
+            seen.append(price["p"])
+
+        async def run():
+            await self.client.subscribe_token_price("A", on_price)
+            await self.client.subscribe_token_price("B", on_price)
+            started = time.perf_counter()
+            await self.client._dispatch(_frame("A", {"p": 1}))
+            await self.client._dispatch(_frame("B", {"p": 2}))
+            dispatch_time = time.perf_counter() - started
+            await _until(lambda: len(seen) == 2)
+            await self.client.close()
+            return dispatch_time
+
+        self.assertLess(asyncio.run(run()), 0.5)
+        self.assertEqual(sorted(seen), [1, 2])
+
+    def test_coroutine_callbacks_stay_on_the_loop(self):
+        threads = []
+
+        async def on_pairs(pairs):
+            threads.append(threading.current_thread())
+
+        async def run():
+            await self.client.subscribe_new_tokens(on_pairs)
+            await self.client._dispatch(_frame("new_pairs", {"a": 1}))
+
+        asyncio.run(run())
+        self.assertEqual(threads, [threading.main_thread()])
+        self.assertTrue(is_async_callable(AsyncMock()))
+
+    def test_lambda_returning_coroutine_switches_to_the_loop(self):
+        received = []
+
+        async def record(price):
+            received.append((price["p"], threading.current_thread()))
+
+        async def run():
+            await self.client.subscribe_token_price("A", lambda price: record(price))
+            await self.client._dispatch(_frame("A", {"p": 1}))
+            await _until(lambda: received)
+            await self.client._dispatch(_frame("A", {"p": 2}))
+            await self.client.close()
+
+        asyncio.run(run())
+        self.assertEqual([p for p, _ in received], [1, 2])
+        self.assertEqual({t for _, t in received}, {threading.main_thread()})
+
+    def test_conflated_sync_callback_gets_latest_price(self):
+        gate = threading.Event()
+        seen = []
+
+        def on_price(price):
+            gate.wait(2)
+            seen.append(price["p"])
+
+        async def run():
+            await self.client.subscribe_token_price("A", on_price, conflate=True)
+            for p in range(5):
+                await self.client._dispatch(_frame("A", {"p": p}))
+                await asyncio.sleep(0.01)
+            gate.set()
+            await _until(lambda: seen and seen[-1] == 4)
+            await self.client.close()
+
+        asyncio.run(run())
+        self.assertEqual(seen, [0, 4])
+
+    def test_supplied_executor_is_not_shut_down(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        client = AxiomTradeWebSocketClient(Mock(), callback_executor=executor)
+        client._ensure_connected = AsyncMock(return_value=True)
+        client._send = AsyncMock()
+        seen = []
+
+        async def run():
+            await client.subscribe_new_tokens(seen.append)
+            await client._dispatch(_frame("new_pairs", {"a": 1}))
+            await _until(lambda: seen)
+            await client.close()
+
+        asyncio.run(run())
+        self.assertEqual(executor.submit(lambda: 42).result(), 42)
+        executor.shutdown()
+        self.assertEqual(seen, [[{"a": 1}]])
+
+    def test_plain_callbacks_against_mock_server(self):
+        pairs, prices, transactions, users = [], [], [], []
+        auth = Mock()
+        auth.get_tokens.return_value = Mock(access_token="tok", refresh_token="ref")
+
+        async def run():
+            rates = {"new_pairs": 100, "price": 100, "wallet": 100, "active_users": 100}
+            async with MockAxiomServer(rates=rates, seed=7) as server:
+                client = AxiomTradeWebSocketClient(auth, log_level=logging.CRITICAL, preflight=False)
+                client.ws_url = client.ws_url_token_price = server.url
+                client.ws_fallback_urls = []
+                await client.subscribe_new_tokens(pairs.append)
+                await client.subscribe_token_price("Mint1", prices.append)
+                await client.subscribe_wallet_transactions("Wallet1", transactions.append)
+                await client.subscribe_active_users(users.append, "Mint1")
+                quiet = await client.subscribe_token_price("Mint2", lambda price: None)
+                task = asyncio.ensure_future(client.start())
+                await _until(lambda: pairs and prices and transactions and users)
+                await quiet.unsubscribe()
+                stats = client.get_callback_stats()
+                await client.close()
+                await asyncio.wait_for(task, 2)
+                return stats
+
+        stats = asyncio.run(run())
+        self.assertIn("pair_address", pairs[0][0])
+        self.assertEqual(prices[0]["tokenAddress"], "Mint1")
+        self.assertEqual(transactions[0]["maker_address"], "Wallet1")
+        self.assertIsInstance(users[0], int)
+        self.assertEqual(stats['errors'], 0)
+
+    def test_unsubscribing_the_last_callback_drops_its_lane(self):
+        calls = []
+
+        async def run():
+            first = await self.client.subscribe_token_price("Mint1", calls.append)
+            second = await self.client.subscribe_token_price("Mint1", calls.append)
+            await self.client._dispatch(_frame("Mint1", {"price": 1}))
+            await _until(lambda: len(calls) == 2)
+            lanes = [self.client.get_callback_stats()['lanes']]
+            await self.client.unsubscribe(first)
+            lanes.append(self.client.get_callback_stats()['lanes'])
+            await self.client.unsubscribe(second)
+            lanes.append(self.client.get_callback_stats()['lanes'])
+            workers = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            await self.client.close()
+            return lanes, workers
+
+        lanes, workers = asyncio.run(run())
+        self.assertEqual(lanes, [1, 1, 0])
+        self.assertEqual(workers, [])
+
+    def test_unknown_executor_is_rejected(self):
+        with self.assertRaises(ValueError):
+            CallbackPool("fibers")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Test cluster latency probing and fastest-cluster preference.
+"""
+import asyncio
+import logging
+import os
+import socket
+import sys
+import unittest
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.websocket._client import AxiomTradeWebSocketClient
+from axiomtradeapi.websocket._mock_server import MockAxiomServer
+from axiomtradeapi.websocket._probe import ClusterProbe
+
+
+def _make_mock_auth_manager():
+    mock_auth = Mock()
+    mock_auth.ensure_valid_authentication.return_value = True
+    mock_auth.get_tokens.return_value = Mock(access_token="tok", refresh_token="ref")
+    return mock_auth
+
+
+def _closed_port_url():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"ws://127.0.0.1:{port}/"
+
+
+async def _until(predicate, timeout=3.0):
+    loop = asyncio.get_event_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        if loop.time() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.005)
+
+
+class TestClusterProbe(unittest.TestCase):
+
+    def test_rank_orders_healthy_by_latency_then_unprobed_then_failing(self):
+        probe = ClusterProbe()
+        probe.record("a", 0.200)
+        probe.record("b", None, "refused")
+        probe.record("d", 0.050)
+        self.assertEqual(probe.rank(["a", "b", "c", "d"]), ["d", "a", "c", "b"])
+        self.assertEqual(probe.fastest, "d")
+
+    def test_latency_is_smoothed(self):
+        probe = ClusterProbe(smoothing=0.5)
+        probe.record("a", 0.100)
+        probe.record("a", 0.300)
+        stats = probe.get_stats()["a"]
+        self.assertAlmostEqual(stats['latency_ms'], 200.0)
+        self.assertAlmostEqual(stats['last_latency_ms'], 300.0)
+        self.assertEqual((stats['successes'], stats['failures']), (2, 0))
+
+
+class TestFastestClusterPreference(unittest.TestCase):
+
+    def test_connect_and_reconnect_prefer_fastest_healthy_cluster(self):
+        async def run():
+            slow = await MockAxiomServer(handshake_delay=0.15).start()
+            fast = await MockAxiomServer().start()
+            dead = _closed_port_url()
+            try:
+                client = AxiomTradeWebSocketClient(_make_mock_auth_manager(), log_level=logging.CRITICAL,
+                                                   preflight=False, reconnect_base_delay=0.01,
+                                                   probe_interval=60.0)
+                client.ws_url = slow.url
+                client.ws_fallback_urls = [dead, fast.url]
+                received = []
+                await client.subscribe_new_tokens(received.append)
+                connected_to = client.get_connection_stats()['url']
+                stats = client.get_cluster_stats()
+
+                task = asyncio.ensure_future(client.start())
+                await _until(lambda: "new_pairs" in fast.rooms())
+                await fast.drop_connections()
+                # The cluster that dropped is ranked last; the reconnect moves to the next healthy one
+                await _until(lambda: "new_pairs" in slow.rooms())
+                await slow.push("new_pairs", {"a": 1})
+                await _until(lambda: received)
+                after_drop = client.get_cluster_stats()
+                await client.close()
+                await asyncio.wait_for(task, 2)
+                return connected_to, stats, after_drop, fast.get_stats(), (fast.url, slow.url, dead)
+            finally:
+                await slow.close()
+                await fast.close()
+
+        connected_to, stats, after_drop, fast_stats, (fast, slow, dead) = asyncio.run(run())
+        self.assertEqual(connected_to, fast)
+        self.assertEqual(stats['preferred'], fast)
+        self.assertEqual(stats['order'], [fast, slow, dead])
+        self.assertFalse(stats['clusters'][dead]['healthy'])
+        self.assertGreater(stats['clusters'][slow]['latency_ms'], 100)
+        self.assertEqual(fast_stats['connections'], 2)  # the probe and the first connect
+        self.assertEqual(after_drop['order'][0], slow)
+        self.assertFalse(after_drop['clusters'][fast]['healthy'])
+        self.assertEqual(after_drop['clusters'][fast]['last_error'], "disconnected")
+
+    def test_probing_is_off_by_default(self):
+        client = AxiomTradeWebSocketClient(_make_mock_auth_manager())
+        self.assertIsNone(client.get_cluster_stats()['last_probe_age'])
+        self.assertEqual(client.get_cluster_stats()['order'][0], client.ws_url)
+
+
+if __name__ == '__main__':
+    unittest.main()
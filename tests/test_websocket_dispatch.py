@@ -0,0 +1,282 @@
+"""
+Test room-indexed dispatch in AxiomTradeWebSocketClient.
+"""
+import asyncio
+import json
+import unittest
+from unittest.mock import Mock, AsyncMock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.websocket._client import AxiomTradeWebSocketClient
+from axiomtradeapi.websocket._codec import extract_room, resolve_json_backend
+from axiomtradeapi.websocket._ratelimit import RateLimiter
+
+
+class TestRoomDispatch(unittest.TestCase):
+
+    def setUp(self):
+        self.client = AxiomTradeWebSocketClient(Mock())
+
+    def _subscribe(self, coro_fn, *args):
+        async def run():
+            with patch.object(self.client, '_ensure_connected', new=AsyncMock(return_value=True)):
+                with patch.object(self.client, '_send', new=AsyncMock()):
+                    await coro_fn(*args)
+        asyncio.run(run())
+
+    def _dispatch(self, room, content):
+        asyncio.run(self.client._dispatch(json.dumps({"room": room, "content": content})))
+
+    def test_frames_reach_only_their_room(self):
+        prices = {f"Token{i}": AsyncMock() for i in range(50)}
+        for token, callback in prices.items():
+            self._subscribe(self.client.subscribe_token_price, token, callback)
+        wallet_cb = AsyncMock()
+        self._subscribe(self.client.subscribe_wallet_transactions, "Wallet1", wallet_cb)
+
+        self._dispatch("Token7", {"price": 1.5})
+        self._dispatch("v:Wallet1", {"type": "buy"})
+        self._dispatch("unrelated", {"price": 2})
+
+        prices["Token7"].assert_awaited_once_with({"price": 1.5})
+        self.assertEqual(sum(cb.await_count for cb in prices.values()), 1)
+        wallet_cb.assert_awaited_once_with({"type": "buy"})
+
+    def test_new_pairs_and_active_users_adapters(self):
+        pairs_cb, users_cb = AsyncMock(), AsyncMock()
+        self._subscribe(self.client.subscribe_new_tokens, pairs_cb)
+        self._subscribe(self.client.subscribe_active_users, users_cb, "Mint1")
+
+        self._dispatch("new_pairs", {"tokenName": "A"})
+        self._dispatch("e-Mint1", "42")
+        self._dispatch("s:Mint1", {"active_users": 7})
+        self._dispatch("e-Mint1", "not-a-number")
+
+        pairs_cb.assert_awaited_once_with([{"tokenName": "A"}])
+        self.assertEqual([c.args[0] for c in users_cb.await_args_list], [42, 7])
+
+    def test_several_handlers_share_a_room(self):
+        first, second = AsyncMock(), AsyncMock()
+        self._subscribe(self.client.subscribe_token_price, "Token1", first)
+        self._subscribe(self.client.subscribe_token_price, "Token1", second)
+
+        self._dispatch("Token1", {"price": 1})
+
+        first.assert_awaited_once_with({"price": 1})
+        second.assert_awaited_once_with({"price": 1})
+        self.assertEqual(self.client._room_refs["Token1"], 2)
+
+
+class TestSubscriptionHandles(unittest.TestCase):
+
+    def setUp(self):
+        self.client = AxiomTradeWebSocketClient(Mock())
+        self.sent = []
+
+        async def send(data, endpoint="cluster"):
+            self.sent.append(json.loads(data))
+
+        self.client._send = send
+        self.client._ensure_connected = AsyncMock(return_value=True)
+
+    def _messages(self, action):
+        return [m["room"] for m in self.sent if m["action"] == action]
+
+    def test_room_is_joined_once_and_left_after_last_handle(self):
+        async def run():
+            first = await self.client.subscribe_token_price("Token1", AsyncMock())
+            second = await self.client.subscribe_token_price("Token1", AsyncMock())
+            self.assertEqual(self._messages("join"), ["Token1"])
+
+            self.assertTrue(await first.unsubscribe())
+            self.assertEqual(self._messages("leave"), [])
+            self.assertIs(self.client._callbacks["token_price_Token1"], second.callback)
+
+            self.assertTrue(await second.unsubscribe())
+            self.assertFalse(await second.unsubscribe())
+            self.assertEqual(self._messages("leave"), ["Token1"])
+
+        asyncio.run(run())
+        self.assertNotIn("Token1", self.client._rooms)
+        self.assertNotIn("token_price_Token1", self.client._callbacks)
+
+    def test_unsubscribed_handler_gets_no_frames(self):
+        kept, dropped = AsyncMock(), AsyncMock()
+
+        async def run():
+            await self.client.subscribe_wallet_transactions("Wallet1", kept)
+            handle = await self.client.subscribe_wallet_transactions("Wallet1", dropped)
+            await handle.unsubscribe()
+            await self.client._dispatch(json.dumps({"room": "v:Wallet1", "content": {"type": "sell"}}))
+
+        asyncio.run(run())
+        kept.assert_awaited_once()
+        dropped.assert_not_awaited()
+
+    def test_active_users_rooms_are_reference_counted(self):
+        async def run():
+            handle = await self.client.subscribe_active_users(AsyncMock(), "Mint1")
+            joined = self._messages("join")
+            await handle.unsubscribe()
+            self.assertEqual(sorted(self._messages("leave")), sorted(joined))
+
+        asyncio.run(run())
+        self.assertEqual(self.client._room_refs, {})
+
+
+
+class TestPreDecodeFiltering(unittest.TestCase):
+
+    def test_extract_room(self):
+        self.assertEqual(extract_room('{"room":"e-Mint1","content":3}'), "e-Mint1")
+        self.assertEqual(extract_room(b'{"room": "v:Wallet1", "content": {}}'), "v:Wallet1")
+        # Ambiguous or escaped rooms fall back to a full decode
+        self.assertIsNone(extract_room('{"content":{"room":"x"},"room":"y"}'))
+        self.assertIsNone(extract_room('{"room":"a\\"b","content":1}'))
+        self.assertIsNone(extract_room('{"content":1}'))
+        # A room key nested in another value is not the frame's room
+        self.assertIsNone(extract_room('{"content":{"room":"y"}}'))
+        self.assertIsNone(extract_room(b'{"content": [{"room": "y"}]}'))
+        self.assertEqual(extract_room('{"content": 1, "room": "e-Mint1"}'), "e-Mint1")
+
+    def test_unwanted_rooms_are_not_decoded(self):
+        client = AxiomTradeWebSocketClient(Mock(), json_backend="json")
+        callback = AsyncMock()
+        loads = Mock(side_effect=json.loads)
+        client._json_loads = loads
+
+        async def run():
+            client._ensure_connected = AsyncMock(return_value=True)
+            client._send = AsyncMock()
+            await client.subscribe_active_users(callback, "Mint1")
+            for room in ("t:Mint1", "f:Mint1", "b-Mint1", "kol_tx:Mint1"):
+                await client._dispatch(json.dumps({"room": room, "content": {"x": 1}}).encode())
+            await client._dispatch(json.dumps({"room": "e-Mint1", "content": 5}).encode())
+
+        asyncio.run(run())
+        callback.assert_awaited_once_with(5)
+        self.assertEqual(loads.call_count, 1)
+        self.assertEqual(client.get_connection_stats()['messages_skipped'], 4)
+
+    def test_json_backend_selection(self):
+        self.assertEqual(resolve_json_backend("json")[0], "json")
+        self.assertIn(resolve_json_backend("auto")[0], ("orjson", "msgspec", "json"))
+        with self.assertRaises(ValueError):
+            resolve_json_backend("simdjson")
+
+
+class TestBatchedJoins(unittest.TestCase):
+
+    def _client(self, **kwargs):
+        client = AxiomTradeWebSocketClient(Mock(), **kwargs)
+        self.sent = []
+
+        async def send(data, endpoint="cluster"):
+            self.sent.append((endpoint, json.loads(data)))
+
+        client._send = send
+        client._ensure_connected = AsyncMock(return_value=True)
+        return client
+
+    def test_batch_sends_joins_on_exit(self):
+        client = self._client()
+
+        async def run():
+            async with client.batch():
+                await client.subscribe_wallet_transactions("W1", AsyncMock())
+                temporary = await client.subscribe_wallet_transactions("W2", AsyncMock())
+                await client.subscribe_token_price("T1", AsyncMock())
+                await temporary.unsubscribe()  # never joined, so nothing is sent
+                self.assertEqual(self.sent, [])
+
+        asyncio.run(run())
+        self.assertEqual(self.sent, [("cluster", {"action": "join", "room": "v:W1"}),
+                                     ("price", {"action": "join", "room": "T1"})])
+
+    def test_subscribe_token_prices(self):
+        client = self._client()
+        received = []
+
+        async def on_price(token, price):
+            received.append((token, price))
+
+        async def run():
+            subscriptions = await client.subscribe_token_prices(["A", "B", "C"], on_price)
+            await client._dispatch(b'{"room":"B","content":{"price":2}}')
+            return subscriptions
+
+        subscriptions = asyncio.run(run())
+        self.assertEqual(sorted(subscriptions), ["A", "B", "C"])
+        self.assertEqual(received, [("B", {"price": 2})])
+        self.assertEqual([m["room"] for endpoint, m in self.sent if endpoint == "price"], ["A", "B", "C"])
+
+    def test_join_rate_caps_flush(self):
+        client = self._client(join_rate=500, join_burst=10)
+
+        async def run():
+            loop = asyncio.get_event_loop()
+            start = loop.time()
+            await client.subscribe_token_prices([f"T{i}" for i in range(40)], AsyncMock())
+            return loop.time() - start
+
+        elapsed = asyncio.run(run())
+        self.assertEqual(len(self.sent), 40)
+        self.assertGreaterEqual(elapsed, 0.05)  # 30 joins beyond the burst at 500/s
+        self.assertEqual(client._join_limiters["price"].get_stats()['acquired'], 40)
+
+    def test_failed_flush_removes_subscription(self):
+        client = self._client()
+        client._send = AsyncMock(side_effect=ConnectionError("closed"))
+
+        async def run():
+            return await client.subscribe_wallet_transactions("W1", AsyncMock())
+
+        self.assertFalse(asyncio.run(run()))
+        self.assertEqual(client._room_refs, {})
+        self.assertFalse(client._pending_rooms["cluster"])
+
+    def test_failed_batch_keeps_rooms_queued_for_retry(self):
+        client = AxiomTradeWebSocketClient(Mock())
+        client._ensure_connected = AsyncMock(return_value=True)
+
+        class FlakySocket:
+            """curl-like socket that accepts ``accept`` messages, then fails until repaired"""
+
+            def __init__(self, accept):
+                self.accept = accept
+                self.sent = []
+
+            async def send(self, data, flags):
+                if self.accept <= 0:
+                    raise ConnectionError("send failed")
+                self.accept -= 1
+                self.sent.append(json.loads(data)["room"])
+
+        socket = FlakySocket(accept=1)
+        client._connections["cluster"].curl_ws = socket
+
+        async def run():
+            with self.assertRaises(ConnectionError):
+                async with client.batch():
+                    for wallet in ("W1", "W2", "W3"):
+                        await client.subscribe_wallet_transactions(wallet, AsyncMock())
+            self.assertEqual(list(client._pending_rooms["cluster"]), ["v:W2", "v:W3"])
+            socket.accept = 10
+            await client.subscribe_wallet_transactions("W4", AsyncMock())
+
+        asyncio.run(run())
+        self.assertEqual(socket.sent, ["v:W1", "v:W2", "v:W3", "v:W4"])
+        self.assertFalse(client._pending_rooms["cluster"])
+
+    def test_rate_limiter_rejects_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(0)
+        with self.assertRaises(ValueError):
+            RateLimiter(10, burst=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+"""
+Test the local fan-out hub (WebSocketHub / HubClient).
+"""
+import asyncio
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import unittest
+from unittest.mock import Mock, AsyncMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.websocket._client import AxiomTradeWebSocketClient
+from axiomtradeapi.websocket._hub import HubClient, WebSocketHub
+
+
+async def _until(predicate, timeout=2.0):
+    loop = asyncio.get_event_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        if loop.time() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.005)
+
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "Unix domain sockets required")
+class TestWebSocketHub(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "hub.sock")
+        self.upstream = AxiomTradeWebSocketClient(Mock())
+        self.upstream._ensure_connected = AsyncMock(return_value=True)
+        self.sent = []
+
+        async def send(data, endpoint="cluster"):
+            self.sent.append((endpoint, json.loads(data)))
+
+        self.upstream._send = send
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _actions(self, action):
+        return [(endpoint, m["room"]) for endpoint, m in self.sent if m["action"] == action]
+
+    def test_rooms_are_shared_and_frames_fanned_out(self):
+        hub = WebSocketHub(self.upstream, self.path)
+        first_events, second_events, prices = [], [], []
+
+        async def on_first(content):
+            first_events.append(content)
+
+        async def on_second(content):
+            second_events.append(content)
+
+        async def on_price(content):
+            prices.append(content)
+
+        async def run():
+            await hub.start()
+            first, second = HubClient(self.path), HubClient(self.path)
+            tasks = [asyncio.ensure_future(first.start()), asyncio.ensure_future(second.start())]
+            sub_first = await first.subscribe_wallet_transactions("W", on_first)
+            await second.subscribe_wallet_transactions("W", on_second)
+            await second.subscribe_token_price("T", on_price)
+            await _until(lambda: len(self.sent) == 2)
+
+            await self.upstream._dispatch(b'{"room":"v:W","content":{"sig":1}}')
+            await self.upstream._dispatch(b'{"room":"T","content":{"price":5}}')
+            await _until(lambda: first_events and second_events and prices)
+
+            await sub_first.unsubscribe()
+            await asyncio.sleep(0.02)
+            self.assertEqual(self._actions("leave"), [])  # second still listens
+            await second.close()  # disconnecting releases its rooms
+            await _until(lambda: len(self._actions("leave")) == 2)
+            stats = hub.get_stats()
+
+            await first.close()
+            await asyncio.wait_for(asyncio.gather(*tasks), 2)
+            await hub.close()
+            return stats
+
+        stats = asyncio.run(run())
+        self.assertEqual(sorted(self._actions("join")), [("cluster", "v:W"), ("price", "T")])
+        self.assertEqual(sorted(self._actions("leave")), [("cluster", "v:W"), ("price", "T")])
+        self.assertEqual(first_events, [{"sig": 1}])
+        self.assertEqual(second_events, [{"sig": 1}])
+        self.assertEqual(prices, [{"price": 5}])
+        self.assertEqual(stats['rooms'], 0)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_hub_forwards_without_decoding(self):
+        hub = WebSocketHub(self.upstream, self.path)
+        received = []
+
+        async def run():
+            await hub.start()
+            consumer = HubClient(self.path)
+            task = asyncio.ensure_future(consumer.start())
+            await consumer.subscribe_new_tokens(AsyncMock(side_effect=received.append))
+            await _until(lambda: self.sent)
+            self.upstream._json_loads = Mock(side_effect=AssertionError("hub decoded a frame"))
+            await self.upstream._dispatch(b'{"room":"new_pairs","content":{"a":1}}')
+            await _until(lambda: received)
+            await consumer.close()
+            await asyncio.wait_for(task, 2)
+            await hub.close()
+
+        asyncio.run(run())
+        self.assertEqual(received, [[{"a": 1}]])
+
+    def test_large_frames_and_raising_callbacks_keep_the_consumer_running(self):
+        hub = WebSocketHub(self.upstream, self.path)
+        received = []
+
+        async def on_transaction(content):
+            received.append(content)
+            if len(received) == 1:
+                raise ValueError("bug in user code")
+
+        big = {"sig": 1, "blob": "x" * 200_000}  # beyond asyncio's 64 KiB line default
+
+        async def run():
+            await hub.start()
+            consumer = HubClient(self.path)
+            task = asyncio.ensure_future(consumer.start())
+            await consumer.subscribe_wallet_transactions("W", on_transaction)
+            await _until(lambda: self.sent)
+            await self.upstream._dispatch(json.dumps({"room": "v:W", "content": big}))
+            await self.upstream._dispatch(b'{"room":"v:W","content":{"sig":2}}')
+            await _until(lambda: len(received) == 2)
+            self.assertFalse(task.done())
+            self.assertEqual(hub.get_stats()['consumers'], 1)
+            await consumer.close()
+            await asyncio.wait_for(task, 2)
+            await hub.close()
+
+        asyncio.run(run())
+        self.assertEqual(received, [big, {"sig": 2}])
+
+    def test_frames_over_the_line_limit_are_skipped(self):
+        hub = WebSocketHub(self.upstream, self.path)
+        received = []
+
+        async def on_transaction(content):
+            received.append(content)
+
+        async def run():
+            await hub.start()
+            consumer = HubClient(self.path, line_limit=1024)
+            task = asyncio.ensure_future(consumer.start())
+            await consumer.subscribe_wallet_transactions("W", on_transaction)
+            await _until(lambda: self.sent)
+            # A nested "room" in the oversized tail must not be read as a frame
+            oversized = {"sig": 1, "blob": "x" * 5000, "inner": {"room": "v:W", "content": {"sig": 9}}}
+            await self.upstream._dispatch(json.dumps({"room": "v:W", "content": oversized}))
+            await self.upstream._dispatch(b'{"room":"v:W","content":{"sig":2}}')
+            await _until(lambda: received)
+            await asyncio.sleep(0.02)
+            stats = consumer.get_connection_stats()
+            await consumer.close()
+            await asyncio.wait_for(task, 2)
+            await hub.close()
+            return stats
+
+        stats = asyncio.run(run())
+        self.assertEqual(received, [{"sig": 2}])
+        self.assertEqual(stats['oversize_lines'], 1)
+
+    def test_hub_client_needs_no_auth_and_reports_missing_hub(self):
+        consumer = HubClient(self.path)
+
+        async def run():
+            return await consumer.subscribe_new_tokens(AsyncMock())
+
+        self.assertFalse(asyncio.run(run()))
+        self.assertFalse(consumer.get_connection_stats()['connected'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Test the latency instrumentation of AxiomTradeWebSocketClient.
+"""
+import asyncio
+import json
+import time
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.websocket._client import AxiomTradeWebSocketClient
+from axiomtradeapi.websocket._latency import (
+    LatencyHistogram, clock_offset_from_response, parse_timestamp, server_timestamp,
+)
+
+
+class TestLatencyHelpers(unittest.TestCase):
+
+    def test_parse_timestamp(self):
+        self.assertEqual(parse_timestamp("2026-01-01T00:00:00Z"), 1767225600.0)
+        self.assertAlmostEqual(parse_timestamp("2026-01-01T00:00:00.25Z"), 1767225600.25)
+        self.assertAlmostEqual(parse_timestamp("2026-01-01T00:00:00.123456789+00:00"), 1767225600.123456)
+        self.assertEqual(parse_timestamp(1767225600123), 1767225600.123)
+        self.assertEqual(parse_timestamp("1767225600"), 1767225600.0)
+        self.assertIsNone(parse_timestamp("2026-01-01T00:00:00"))  # no timezone
+        self.assertIsNone(parse_timestamp("soon"))
+        self.assertIsNone(parse_timestamp(True))
+
+    def test_server_timestamp_prefers_created_at(self):
+        content = {"pairCreatedAt": "2026-01-01T00:00:00Z", "created_at": "2026-01-01T00:00:01Z"}
+        self.assertEqual(server_timestamp(content), 1767225601.0)
+        self.assertIsNone(server_timestamp({"price": 1}))
+        self.assertIsNone(server_timestamp(5))
+
+    def test_clock_offset_from_body_and_date_header(self):
+        offset = clock_offset_from_response({"serverTime": 1000.5}, None, 999.0, 1000.0)
+        self.assertAlmostEqual(offset, 1.0)
+        offset = clock_offset_from_response(None, "Thu, 01 Jan 2026 00:00:10 GMT", 1767225600.0, 1767225600.0)
+        self.assertAlmostEqual(offset, 10.0)
+        self.assertIsNone(clock_offset_from_response("n/a", None, 0.0, 1.0))
+
+    def test_histogram_percentiles(self):
+        histogram = LatencyHistogram()
+        for ms in [1] * 90 + [40] * 9 + [3000]:
+            histogram.record(ms / 1000.0)
+        stats = histogram.get_stats()
+        self.assertEqual(stats['count'], 100)
+        self.assertEqual(stats['p50_ms'], 1)
+        self.assertEqual(stats['p90_ms'], 1)
+        self.assertEqual(stats['p99_ms'], 50)
+        self.assertEqual(stats['max_ms'], 3000)
+
+
+class TestClientLatency(unittest.TestCase):
+
+    def _client(self, **kwargs):
+        client = AxiomTradeWebSocketClient(Mock(), **kwargs)
+
+        async def connected(*args, **kwargs):
+            return True
+
+        async def send(data, endpoint="cluster"):
+            pass
+
+        client._ensure_connected = connected
+        client._send = send
+        return client
+
+    def test_stages_recorded_per_room(self):
+        client = self._client(track_latency=True)
+        client._latency.clock_offset = 2.0  # server clock runs 2 s ahead
+
+        async def slow_callback(content):
+            await asyncio.sleep(0.02)
+
+        async def run():
+            await client.subscribe_wallet_transactions("W", slow_callback)
+            received_at = time.time()
+            created = received_at + 2.0 - 0.15  # sent 150 ms before receipt, server clock
+            frame = {"room": "v:W", "content": {"created_at": created * 1000, "type": "buy"}}
+            await client._dispatch(json.dumps(frame).encode(), received_at)
+
+        asyncio.run(run())
+        stats = client.get_latency_stats()
+        room = stats['rooms']['v:W']
+        self.assertEqual(set(room), {"network", "decode", "queue", "callback", "total"})
+        self.assertAlmostEqual(room['network']['mean_ms'], 150, delta=5)
+        self.assertGreaterEqual(room['callback']['mean_ms'], 15)
+        self.assertEqual(stats['overall']['total']['count'], 1)
+
+    def test_queued_subscriptions_are_tracked(self):
+        client = self._client(track_latency=True, queue_size=10)
+        done = []
+
+        async def callback(content):
+            done.append(content)
+
+        async def run():
+            await client.subscribe_new_tokens(callback)
+            await client._dispatch(b'{"room":"new_pairs","content":{"a":1}}', time.time())
+            for _ in range(100):
+                if done:
+                    break
+                await asyncio.sleep(0.001)
+            await client.close()
+
+        asyncio.run(run())
+        self.assertEqual(client.get_latency_stats()['rooms']['new_pairs']['total']['count'], 1)
+
+    def test_tracking_off_by_default(self):
+        client = self._client()
+        with self.assertRaises(RuntimeError):
+            client.get_latency_stats()
+
+    def test_preflight_sets_clock_offset(self):
+        client = self._client(track_latency=True)
+        resp = Mock()
+        resp.json.return_value = {"serverTime": (time.time() + 5) * 1000}
+        resp.headers = {}
+        client._update_clock_offset(resp, time.time(), time.time())
+        self.assertAlmostEqual(client.server_clock_offset, 5, delta=0.1)
+        self.assertEqual(client._latency.clock_offset, client.server_clock_offset)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+Test the client end to end against the local MockAxiomServer.
+"""
+import asyncio
+import logging
+import os
+import sys
+import unittest
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.websocket._client import AxiomTradeWebSocketClient
+from axiomtradeapi.websocket._mock_server import MockAxiomServer
+
+
+def _make_mock_auth_manager():
+    mock_auth = Mock()
+    mock_auth.ensure_valid_authentication.return_value = True
+    mock_auth.get_tokens.return_value = Mock(access_token="tok", refresh_token="ref")
+    return mock_auth
+
+
+def _make_client(server):
+    client = AxiomTradeWebSocketClient(_make_mock_auth_manager(), log_level=logging.CRITICAL,
+                                       preflight=False, reconnect_base_delay=0.01)
+    client.ws_url = client.ws_url_token_price = server.url
+    client.ws_fallback_urls = []
+    return client
+
+
+async def _until(predicate, timeout=3.0):
+    loop = asyncio.get_event_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        if loop.time() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.005)
+
+
+class TestMockAxiomServer(unittest.TestCase):
+
+    def test_synthetic_frames_reach_each_channel(self):
+        pairs, prices, transactions, users = [], [], [], []
+
+        async def run():
+            rates = {"new_pairs": 100, "price": 100, "wallet": 100, "active_users": 100}
+            async with MockAxiomServer(rates=rates, seed=7) as server:
+                client = _make_client(server)
+                await client.subscribe_new_tokens(lambda p: _append(pairs, p))
+                await client.subscribe_token_price("Mint1", lambda p: _append(prices, p))
+                await client.subscribe_wallet_transactions("Wallet1", lambda t: _append(transactions, t))
+                await client.subscribe_active_users(lambda n: _append(users, n), "Mint1")
+                task = asyncio.ensure_future(client.start())
+                await _until(lambda: pairs and prices and transactions and users)
+                await client.close()
+                await asyncio.wait_for(task, 2)
+
+        asyncio.run(run())
+        self.assertIn("pair_address", pairs[0][0])
+        self.assertEqual(prices[0]["tokenAddress"], "Mint1")
+        self.assertEqual(transactions[0]["maker_address"], "Wallet1")
+        self.assertIsInstance(users[0], int)
+
+    def test_client_rejoins_after_dropped_connection(self):
+        received = []
+
+        async def run():
+            async with MockAxiomServer() as server:
+                client = _make_client(server)
+                await client.subscribe_wallet_transactions("W", lambda t: _append(received, t))
+                task = asyncio.ensure_future(client.start())
+                await _until(lambda: "v:W" in server.rooms())
+                await server.push("v:W", {"n": 1})
+                await _until(lambda: received)
+
+                self.assertEqual(await server.drop_connections(), 1)
+                await _until(lambda: server.get_stats()['connections'] == 2 and "v:W" in server.rooms())
+                await server.push("v:W", {"n": 2})
+                await _until(lambda: len(received) == 2)
+                stats = client.get_connection_stats()
+                await client.close()
+                await asyncio.wait_for(task, 2)
+                return stats
+
+        stats = asyncio.run(run())
+        self.assertEqual(received, [{"n": 1}, {"n": 2}])
+        self.assertEqual(stats['disconnects'], 1)
+
+    def test_leave_stops_frames(self):
+        async def run():
+            async with MockAxiomServer(rates={"price": 200}) as server:
+                client = _make_client(server)
+                subscription = await client.subscribe_token_price("Mint1", lambda p: _noop())
+                await _until(lambda: "Mint1" in server.rooms())
+                await subscription.unsubscribe()
+                await _until(lambda: not server.rooms())
+                stats = server.get_stats()
+                await client.close()
+                return stats
+
+        stats = asyncio.run(run())
+        self.assertEqual((stats['joins'], stats['leaves']), (1, 1))
+
+    def test_quiet_room_is_not_treated_as_stale(self):
+        async def run():
+            async with MockAxiomServer() as server:
+                client = _make_client(server)
+                client.heartbeat_interval = 0.1
+                client.stale_timeout = 0.3
+                await client.subscribe_wallet_transactions("Quiet", lambda t: None)
+                task = asyncio.ensure_future(client.start())
+                await _until(lambda: "v:Quiet" in server.rooms())
+                await asyncio.sleep(1.2)
+                stats = client.get_connection_stats()
+                await client.close()
+                await asyncio.wait_for(task, 2)
+                return stats, server.get_stats()
+
+        stats, server_stats = asyncio.run(run())
+        self.assertGreater(stats['pings'], 2)
+        self.assertEqual(stats['stale_reconnects'], 0)
+        self.assertEqual(server_stats['connections'], 1)
+
+    def test_unknown_rate_is_rejected(self):
+        with self.assertRaises(ValueError):
+            MockAxiomServer(rates={"trades": 10})
+
+
+async def _append(items, item):
+    items.append(item)
+
+
+async def _noop():
+    pass
+
+
+if __name__ == '__main__':
+    unittest.main()
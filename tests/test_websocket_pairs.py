@@ -0,0 +1,102 @@
+"""
+Test the typed NewPair record and the rolling new-pairs index.
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+import unittest
+from unittest.mock import Mock, AsyncMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.websocket._client import AxiomTradeWebSocketClient
+from axiomtradeapi.websocket._pairs import NewPair, NewPairIndex
+
+
+def _content(n, creator="Dev1", ticker="PEPE"):
+    return {"pair_address": f"Pair{n}", "token_address": f"Mint{n}", "token_ticker": ticker,
+            "token_name": f"Token {n}", "deployer_address": creator, "protocol": "Pump V1",
+            "created_at": "2026-01-01T00:00:00.000Z", "supply": 1000000000,
+            "initial_liquidity_sol": "30.5"}
+
+
+class TestNewPair(unittest.TestCase):
+
+    def test_from_room_content(self):
+        pair = NewPair.from_content(_content(1), received_at=5.0)
+        self.assertEqual((pair.mint, pair.ticker, pair.creator), ("Mint1", "PEPE", "Dev1"))
+        self.assertEqual(pair.created_at, 1767225600.0)
+        self.assertEqual(pair.liquidity_sol, 30.5)
+        self.assertEqual(pair.to_dict()['received_at'], 5.0)
+        self.assertFalse(hasattr(pair, '__dict__'))
+
+    def test_camel_case_keys_are_accepted(self):
+        pair = NewPair.from_content({"tokenAddress": "M", "tokenTicker": "X", "creatorAddress": "D"})
+        self.assertEqual((pair.mint, pair.ticker, pair.creator), ("M", "X", "D"))
+
+
+class TestNewPairIndex(unittest.TestCase):
+
+    def test_windowed_counts_by_creator_and_ticker(self):
+        index = NewPairIndex(retention=3600)
+        now = time.time()
+        for n, age in enumerate([1800, 500, 30, 10]):
+            index.add(NewPair.from_content(_content(n, ticker="pepe" if n % 2 else "PEPE"),
+                                           received_at=now - age))
+        index.add(NewPair.from_content(_content(9, creator="Dev2", ticker="DOGE"), received_at=now))
+
+        self.assertEqual(index.count_by_creator("Dev1"), 4)
+        self.assertEqual(index.count_by_creator("Dev1", window=600), 3)
+        self.assertEqual(index.count_by_creator("Dev1", window=60), 2)
+        self.assertEqual(index.count_by_ticker("Pepe", window=600), 3)
+        self.assertEqual(index.serial_creators(min_count=3, window=600), {"Dev1": 3})
+        self.assertEqual(index.duplicate_tickers(window=60), {"PEPE": 2})
+        self.assertEqual(index.get("Mint9").creator, "Dev2")
+        self.assertIn("Mint2", index)
+
+    def test_old_pairs_are_evicted(self):
+        index = NewPairIndex(retention=100, max_pairs=3)
+        now = time.time()
+        index.add(NewPair.from_content(_content(0), received_at=now - 500))
+        index.add(NewPair.from_content(_content(1, creator="Dev2"), received_at=now))
+        self.assertNotIn("Mint0", index)
+        self.assertEqual(index.count_by_creator("Dev1"), 0)
+        for n in range(2, 6):
+            index.add(NewPair.from_content(_content(n), received_at=now))
+        stats = index.get_stats()
+        self.assertEqual((stats['pairs'], stats['evicted'], stats['creators']), (3, 3, 1))
+        self.assertEqual([p.mint for p in index.by_creator("Dev1")], ["Mint3", "Mint4", "Mint5"])
+
+
+class TestClientPairIndex(unittest.TestCase):
+
+    def test_client_indexes_each_frame_once_and_passes_typed_pairs(self):
+        client = AxiomTradeWebSocketClient(Mock(), index_new_pairs=True)
+        client._ensure_connected = AsyncMock(return_value=True)
+        client._send = AsyncMock()
+        typed, plain = [], []
+
+        async def on_typed(pairs):
+            typed.extend(pairs)
+
+        async def on_plain(pairs):
+            plain.extend(pairs)
+
+        async def run():
+            await client.subscribe_new_tokens(on_typed, typed=True)
+            await client.subscribe_new_tokens(on_plain)
+            for n in range(3):
+                await client._dispatch(json.dumps({"room": "new_pairs", "content": _content(n)}))
+
+        asyncio.run(run())
+        self.assertEqual(len(client.pair_index), 3)
+        self.assertEqual(client.pair_index.count_by_creator("Dev1", window=60), 3)
+        self.assertTrue(all(isinstance(p, NewPair) for p in typed))
+        self.assertEqual(typed[0].raw, client.pair_index.get("Mint0").raw)
+        self.assertEqual(plain[0]["token_address"], "Mint0")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Test the per-wallet PnL aggregator fed by wallet transaction streams.
+"""
+import asyncio
+import json
+import os
+import sys
+import unittest
+from unittest.mock import Mock, AsyncMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.websocket._client import AxiomTradeWebSocketClient
+from axiomtradeapi.websocket._pnl import WalletPnLAggregator
+
+
+def _trade(side, sol, amount, token="Mint1", usd=None, wallet="W1"):
+    return {"type": side, "total_sol": sol, "total_usd": sol * 100 if usd is None else usd,
+            "token_address": token, "token_amount": amount, "maker_address": wallet}
+
+
+def _make_client(**kwargs):
+    client = AxiomTradeWebSocketClient(Mock(), **kwargs)
+    client._ensure_connected = AsyncMock(return_value=True)
+    client._send = AsyncMock()
+    return client
+
+
+class TestWalletPnLAggregator(unittest.TestCase):
+
+    def test_average_cost_realised_and_unrealised(self):
+        pnl = WalletPnLAggregator()
+        pnl.add_trade(_trade("buy", 1.0, 100), at=1000.0)
+        pnl.add_trade(_trade("buy", 3.0, 100), at=1001.0)   # average cost 0.02 SOL
+        pnl.add_trade(_trade("sell", 2.0, 50), at=1002.0)   # proceeds 2.0, basis 1.0
+
+        position = pnl.get_position("W1", "Mint1")
+        self.assertAlmostEqual(position['realised_sol'], 1.0)
+        self.assertAlmostEqual(position['realised_usd'], 100.0)
+        self.assertAlmostEqual(position['qty'], 150)
+        self.assertAlmostEqual(position['cost_sol'], 3.0)
+        # Marked at the last trade price (0.04 SOL)
+        self.assertAlmostEqual(position['unrealised_sol'], 150 * 0.04 - 3.0)
+        pnl.update_mark("Mint1", 0.01)
+        self.assertAlmostEqual(pnl.get_position("W1", "Mint1")['unrealised_sol'], 1.5 - 3.0)
+
+        wallet = pnl.get_wallet("W1")
+        self.assertEqual((wallet['buys'], wallet['sells'], wallet['open_positions']), (2, 1, 1))
+        self.assertAlmostEqual(wallet['net_sol'], -2.0)
+
+    def test_oversell_is_unmatched_and_unknown_events_are_ignored(self):
+        pnl = WalletPnLAggregator()
+        pnl.add_trade(_trade("buy", 1.0, 100), at=1000.0)
+        pnl.add_trade(_trade("sell", 4.0, 200), at=1001.0)  # half is from before tracking
+        position = pnl.get_position("W1", "Mint1")
+        self.assertAlmostEqual(position['realised_sol'], 1.0)
+        self.assertAlmostEqual(position['unmatched_sol'], 2.0)
+        self.assertEqual((position['qty'], position['cost_sol'], position['unrealised_sol']), (0.0, 0.0, 0.0))
+
+        self.assertIsNone(pnl.add_trade({"type": "transfer", "total_sol": 1.0}, "W1"))
+        self.assertIsNone(pnl.add_trade({"type": "buy"}, "W1"))
+        self.assertEqual(pnl.get_stats()['ignored'], 2)
+        self.assertIsNone(pnl.get_wallet("Unknown"))
+
+    def test_rolling_windows_and_ranking(self):
+        pnl = WalletPnLAggregator(windows=(60.0, 3600.0), bucket=10.0)
+        pnl.add_trade(_trade("buy", 1.0, 100, wallet="W1"), at=1000.0)
+        pnl.add_trade(_trade("sell", 3.0, 100, wallet="W1"), at=1000.0)   # +2 long ago
+        pnl.add_trade(_trade("buy", 1.0, 100, wallet="W1"), at=4500.0)
+        pnl.add_trade(_trade("sell", 2.0, 100, wallet="W1"), at=4650.0)   # +1 recently
+        pnl.add_trade(_trade("buy", 1.0, 100, wallet="W2"), at=4640.0)
+        pnl.add_trade(_trade("sell", 2.5, 100, wallet="W2"), at=4645.0)   # +1.5 recently
+
+        recent = pnl.get_window("W1", 60.0, now=4660.0)
+        self.assertEqual(recent['trades'], 1)
+        self.assertAlmostEqual(recent['realised_sol'], 1.0)
+        self.assertAlmostEqual(pnl.get_window("W1", 3600.0, now=4660.0)['realised_sol'], 1.0)
+        # Buckets older than the longest window were evicted
+        self.assertEqual(pnl.get_window("W1", 10 ** 6, now=4660.0)['trades'], 2)
+        self.assertAlmostEqual(pnl.get_wallet("W1")['realised_sol'], 3.0)
+
+        self.assertEqual([r['wallet'] for r in pnl.top_wallets()], ["W1", "W2"])
+        self.assertEqual(len(pnl.snapshot()['wallets']), 2)
+        with self.assertRaises(ValueError):
+            WalletPnLAggregator(bucket=0)
+
+    def test_client_feeds_shared_aggregator_once_per_frame(self):
+        shared = WalletPnLAggregator()
+        client = _make_client(track_pnl=shared)
+        on_trade = AsyncMock()
+
+        async def run():
+            await client.subscribe_wallet_transactions("W1", on_trade)
+            await client.subscribe_wallet_transactions("W1", None)
+            await client._dispatch(json.dumps({"room": "v:W1", "content": _trade("buy", 1.0, 10)}))
+            sell = json.dumps({"room": "v:W1", "content": _trade("sell", 1.0, 5)})
+            # The same sell sent twice is two frames, decoded into two dicts
+            await client._dispatch(sell)
+            await client._dispatch(sell)
+
+        asyncio.run(run())
+        self.assertIs(client.pnl, shared)
+        self.assertEqual(shared.get_wallet("W1")['trades'], 3)
+        self.assertAlmostEqual(shared.get_wallet("W1")['realised_sol'], 1.0)
+        self.assertEqual(on_trade.await_count, 3)
+        self.assertIsNone(_make_client().pnl)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,272 @@
+"""
+Test the reconnect supervisor of AxiomTradeWebSocketClient.
+"""
+import asyncio
+import json
+import unittest
+from unittest.mock import Mock, AsyncMock, MagicMock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.websocket._client import AxiomTradeWebSocketClient
+
+
+def _make_mock_auth_manager():
+    mock_auth = Mock()
+    mock_auth.ensure_valid_authentication.return_value = True
+    mock_auth.get_tokens.return_value = Mock(access_token="tok", refresh_token="ref")
+    return mock_auth
+
+
+class FakeSocket:
+    """curl_cffi-like socket that plays ``frames`` and then drops (or idles until closed)."""
+
+    def __init__(self, frames, drop=True, fail_sends=False):
+        self.frames = list(frames)
+        self.drop = drop
+        self.fail_sends = fail_sends
+        self.sent = []
+        self.pings = 0
+        self._wake = None
+
+    async def send(self, data, flags):
+        if flags == 16:  # ping; like curl_cffi, the pong never reaches recv()
+            self.pings += 1
+            if self.fail_sends:
+                raise ConnectionError("send failed")
+            return
+        if self.fail_sends:
+            raise ConnectionError("send failed")
+        self.sent.append(json.loads(data))
+
+    async def recv(self):
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        while True:
+            if self.frames:
+                frame = self.frames.pop(0)
+                return (b"" if frame is None else json.dumps(frame).encode()), None
+            if self.drop:
+                raise ConnectionError("connection reset")
+            self._wake.clear()
+            await self._wake.wait()
+
+    def close(self):
+        self.drop = True
+        if self._wake is not None:
+            self._wake.set()
+
+
+class TestReconnect(unittest.TestCase):
+
+    def setUp(self):
+        self.client = AxiomTradeWebSocketClient(_make_mock_auth_manager(), reconnect_base_delay=0.01,
+                                                reconnect_max_delay=0.02)
+        self.connected_urls = []
+
+    def _session(self, sockets):
+        def ws_connect(url, **kwargs):
+            self.connected_urls.append(url)
+            socket = sockets.pop(0)
+            ctx = MagicMock()
+            ctx.__aenter__ = AsyncMock(return_value=socket)
+            ctx.__aexit__ = AsyncMock(side_effect=lambda *args: socket.close())
+            return ctx
+
+        session = MagicMock()
+        session.get = AsyncMock(return_value=MagicMock(status_code=200))
+        session.ws_connect = ws_connect
+        session.close = AsyncMock()
+        return session
+
+    def test_reconnects_to_next_cluster_and_rejoins_rooms(self):
+        received = []
+
+        async def on_transaction(content):
+            received.append(content)
+            if len(received) == 2:
+                await self.client.close()
+
+        first = FakeSocket([{"room": "v:Wallet1", "content": {"sig": 1}}])
+        second = FakeSocket([{"room": "v:Wallet1", "content": {"sig": 2}}], drop=False)
+
+        async def run():
+            with patch('axiomtradeapi.websocket._client.CurlAsyncSession',
+                       return_value=self._session([first, second])):
+                await self.client.subscribe_wallet_transactions("Wallet1", on_transaction)
+                await self.client.subscribe_new_tokens(AsyncMock())
+                await asyncio.wait_for(self.client.start(), 5)
+
+        asyncio.run(run())
+        self.assertEqual(received, [{"sig": 1}, {"sig": 2}])
+        self.assertEqual(self.connected_urls, [self.client.ws_url, "wss://cluster3.axiom.trade/"])
+        self.assertEqual(sorted(m["room"] for m in second.sent), ["new_pairs", "v:Wallet1"])
+
+        stats = self.client.get_connection_stats()
+        self.assertEqual(stats['connects'], 2)
+        self.assertEqual(stats['disconnects'], 1)
+        self.assertEqual(len(stats['gaps']), 1)
+        self.assertGreater(stats['downtime'], 0)
+        self.assertEqual(stats['messages_received'], 2)
+
+    def test_raising_callback_does_not_reconnect(self):
+        received = []
+
+        async def on_transaction(content):
+            received.append(content)
+            if content["sig"] == 1:
+                raise ValueError("bug in user code")
+            if content["sig"] == 3:
+                await self.client.close()
+
+        frames = [{"room": "v:Wallet1", "content": {"sig": n}} for n in (1, 2, 3)]
+        socket = FakeSocket(frames, drop=False)
+
+        async def run():
+            with patch('axiomtradeapi.websocket._client.CurlAsyncSession',
+                       return_value=self._session([socket])):
+                await self.client.subscribe_wallet_transactions("Wallet1", on_transaction)
+                await asyncio.wait_for(self.client.start(), 5)
+
+        asyncio.run(run())
+        self.assertEqual([c["sig"] for c in received], [1, 2, 3])
+        self.assertEqual(len(self.connected_urls), 1)
+        stats = self.client.get_connection_stats()
+        self.assertEqual((stats['disconnects'], stats['reconnect_attempts'], len(stats['gaps'])), (0, 0, 0))
+
+    def test_failed_rejoin_is_retried_on_a_new_socket(self):
+        received = []
+
+        async def on_transaction(content):
+            received.append(content)
+            if len(received) == 2:
+                await self.client.close()
+
+        first = FakeSocket([{"room": "v:Wallet1", "content": {"sig": 1}}])
+        refusing = FakeSocket([], drop=False, fail_sends=True)
+        third = FakeSocket([{"room": "v:Wallet1", "content": {"sig": 2}}], drop=False)
+
+        async def run():
+            with patch('axiomtradeapi.websocket._client.CurlAsyncSession',
+                       return_value=self._session([first, refusing, third])):
+                await self.client.subscribe_wallet_transactions("Wallet1", on_transaction)
+                await asyncio.wait_for(self.client.start(), 5)
+
+        asyncio.run(run())
+        self.assertEqual(received, [{"sig": 1}, {"sig": 2}])
+        self.assertEqual(len(self.connected_urls), 3)
+        self.assertEqual([m["room"] for m in third.sent], ["v:Wallet1"])
+        stats = self.client.get_connection_stats()
+        self.assertEqual((stats['reconnect_attempts'], len(stats['gaps'])), (2, 1))
+
+    def test_price_and_cluster_rooms_use_separate_sockets(self):
+        cluster = FakeSocket([{"room": "v:Wallet1", "content": {"sig": 1}}], drop=False)
+        price = FakeSocket([{"room": "Token1", "content": {"price": 1}}], drop=False)
+        session = self._session([cluster, price])
+        wallet_events, prices = [], []
+
+        async def on_price(content):
+            prices.append(content)
+            if wallet_events:
+                await self.client.close()
+
+        async def on_transaction(content):
+            wallet_events.append(content)
+            if prices:
+                await self.client.close()
+
+        async def run():
+            with patch('axiomtradeapi.websocket._client.CurlAsyncSession', return_value=session):
+                await self.client.subscribe_wallet_transactions("Wallet1", on_transaction)
+                await self.client.subscribe_token_price("Token1", on_price)
+                await asyncio.wait_for(self.client.start(), 5)
+
+        asyncio.run(run())
+        self.assertEqual(self.connected_urls, [self.client.ws_url, self.client.ws_url_token_price])
+        self.assertEqual([m["room"] for m in cluster.sent], ["v:Wallet1"])
+        self.assertEqual([m["room"] for m in price.sent], ["Token1"])
+        self.assertEqual(wallet_events, [{"sig": 1}])
+        self.assertEqual(prices, [{"price": 1}])
+        # one shared session, pre-flight run once (server-time + announcement)
+        self.assertEqual(session.get.await_count, 2)
+
+        endpoints = self.client.get_connection_stats()['endpoints']
+        self.assertEqual(endpoints['cluster']['messages_received'], 1)
+        self.assertEqual(endpoints['price']['messages_received'], 1)
+
+    def test_silent_socket_is_replaced(self):
+        self.client.heartbeat_interval = None
+        self.client.curl_stale_timeout = 0.1
+        received = []
+
+        async def on_transaction(content):
+            received.append(content)
+            await self.client.close()
+
+        silent = FakeSocket([], drop=False)
+        fresh = FakeSocket([{"room": "v:Wallet1", "content": {"sig": 1}}], drop=False)
+
+        async def run():
+            with patch('axiomtradeapi.websocket._client.CurlAsyncSession',
+                       return_value=self._session([silent, fresh])):
+                await self.client.subscribe_wallet_transactions("Wallet1", on_transaction)
+                await asyncio.wait_for(self.client.start(), 5)
+
+        asyncio.run(run())
+        self.assertEqual(received, [{"sig": 1}])
+        self.assertEqual(self.connected_urls, [self.client.ws_url, "wss://cluster3.axiom.trade/"])
+        self.assertEqual(self.client.get_connection_stats()['stale_reconnects'], 1)
+
+    def test_quiet_curl_socket_is_kept_without_pongs(self):
+        self.client.heartbeat_interval = 0.05
+        self.client.stale_timeout = 0.15
+        quiet = FakeSocket([], drop=False)
+
+        async def run():
+            with patch('axiomtradeapi.websocket._client.CurlAsyncSession',
+                       return_value=self._session([quiet])):
+                await self.client.subscribe_wallet_transactions("Wallet1", AsyncMock())
+                task = asyncio.ensure_future(self.client.start())
+                await asyncio.sleep(0.5)
+                silence = self.client.get_room_silence(min_silence=0.3)
+                await self.client.close()
+                await asyncio.wait_for(task, 5)
+                return silence
+
+        silence = asyncio.run(run())
+        stats = self.client.get_connection_stats()
+        self.assertEqual(stats['stale_reconnects'], 0)
+        self.assertGreater(quiet.pings, 2)
+        self.assertEqual(len(self.connected_urls), 1)
+        self.assertEqual(list(silence), ["v:Wallet1"])
+
+    def test_gives_up_after_max_attempts(self):
+        self.client.max_reconnect_attempts = 2
+
+        async def run():
+            with patch('axiomtradeapi.websocket._client.CurlAsyncSession',
+                       return_value=self._session([FakeSocket([])])):
+                with patch.object(self.client, '_connect_curl', wraps=self.client._connect_curl) as spy:
+                    await asyncio.wait_for(self.client.start(), 5)
+                    return spy.await_count
+
+        attempts = asyncio.run(run())
+        self.assertEqual(attempts, 3)
+        self.assertEqual(self.client.get_connection_stats()['reconnect_attempts'], 2)
+
+    def test_no_reconnect_when_disabled(self):
+        self.client.auto_reconnect = False
+
+        async def run():
+            with patch('axiomtradeapi.websocket._client.CurlAsyncSession',
+                       return_value=self._session([FakeSocket([])])):
+                await asyncio.wait_for(self.client.start(), 5)
+
+        asyncio.run(run())
+        self.assertEqual(len(self.connected_urls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Test frame recording and replay of AxiomTradeWebSocketClient.
+"""
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.websocket._client import AxiomTradeWebSocketClient
+from axiomtradeapi.websocket._recorder import FrameRecorder, ReplaySource, read_frames
+
+
+class FakeSocket:
+    """curl_cffi-like socket that plays ``frames`` and then drops."""
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+
+    async def recv(self):
+        if self.frames:
+            return json.dumps(self.frames.pop(0)).encode(), None
+        raise ConnectionError("connection reset")
+
+
+class TestRecordAndReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "frames.log.gz")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_received_frames_are_recorded(self):
+        client = AxiomTradeWebSocketClient(Mock())
+        conn = client._connections['price']
+        conn.curl_ws = FakeSocket([{"room": "Token1", "content": {"price": i}} for i in range(3)])
+
+        async def run():
+            client.start_recording(self.path)
+            await client._message_handler_curl(conn)
+            client.stop_recording()
+
+        asyncio.run(run())
+        records = list(read_frames(self.path))
+        self.assertEqual(len(records), 3)
+        self.assertEqual({endpoint for _, endpoint, _ in records}, {"price"})
+        self.assertEqual(json.loads(records[2][2])["content"], {"price": 2})
+
+    def test_offline_replay_reaches_callbacks(self):
+        recorder = FrameRecorder(self.path)
+        for i in range(5):
+            recorder.write(json.dumps({"room": "v:W", "content": {"sig": i}}), received_at=100.0 + i)
+        recorder.write(json.dumps({"room": "other", "content": {}}), received_at=106.0)
+        recorder.close()
+
+        client = AxiomTradeWebSocketClient(Mock(), offline=True)
+        received = []
+
+        async def on_transaction(content):
+            received.append(content["sig"])
+
+        async def run():
+            await client.subscribe_wallet_transactions("W", on_transaction)
+            return await client.replay(self.path, speed=None)
+
+        self.assertEqual(asyncio.run(run()), 6)
+        self.assertEqual(received, [0, 1, 2, 3, 4])
+
+    def test_replay_respects_speed(self):
+        recorder = FrameRecorder(self.path)
+        for i in range(3):
+            recorder.write('{"room":"x","content":1}', received_at=10.0 + i * 0.1)
+        recorder.close()
+
+        client = AxiomTradeWebSocketClient(Mock(), offline=True)
+        source = ReplaySource(self.path, speed=2.0)
+        start = time.perf_counter()
+        asyncio.run(source.run(client))
+        elapsed = time.perf_counter() - start
+        self.assertGreaterEqual(elapsed, 0.09)
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(source.get_stats()['frames'], 3)
+
+    def test_appended_sessions_and_truncated_tail(self):
+        for session in range(2):
+            recorder = FrameRecorder(self.path)
+            recorder.write('{"room":"x","content":%d}' % session, received_at=float(session))
+            recorder.close()
+        recorder = FrameRecorder(self.path, flush_every=1)
+        recorder.write('{"room":"x","content":2}', received_at=2.0)
+        # never closed: the last gzip member has no trailer
+        self.assertEqual([json.loads(raw)["content"] for _, _, raw in read_frames(self.path)], [0, 1, 2])
+        recorder.close()
+
+    def test_session_appended_after_a_crashed_one(self):
+        recorder = FrameRecorder(self.path, flush_every=3)
+        for n in range(3):
+            recorder.write('{"room":"x","content":%d}' % n, received_at=float(n))
+        recorder.write('{"room":"x","content":"lost"}')  # not flushed when the process died
+        with open(self.path, 'rb') as f:
+            crashed = f.read()
+        recorder.close()
+        with open(self.path, 'wb') as f:
+            f.write(crashed)
+
+        recorder = FrameRecorder(self.path)
+        recorder.write('{"room":"x","content":3}', received_at=3.0)
+        recorder.close()
+        frames = list(read_frames(self.path))
+        self.assertEqual([json.loads(raw)["content"] for _, _, raw in frames], [0, 1, 2, 3])
+        self.assertEqual([at for at, _, _ in frames], [0.0, 1.0, 2.0, 3.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
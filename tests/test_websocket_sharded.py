@@ -0,0 +1,118 @@
+"""
+Test ShardedWebSocketClient room placement and subscribe API.
+"""
+import asyncio
+import json
+import unittest
+from unittest.mock import Mock, AsyncMock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.websocket import AxiomTradeWebSocketClient, ShardedWebSocketClient
+from axiomtradeapi.websocket._sharded import _HashRing
+
+
+class TestHashRing(unittest.TestCase):
+
+    def test_rooms_spread_evenly_and_move_little_when_resized(self):
+        rooms = [f"Token{i}" for i in range(4000)]
+        four, five = _HashRing(4), _HashRing(5)
+
+        counts = [0] * 4
+        for room in rooms:
+            counts[four.get(room)] += 1
+        self.assertTrue(all(600 < c < 1400 for c in counts), counts)
+
+        moved = sum(1 for room in rooms if four.get(room) != five.get(room))
+        self.assertLess(moved, len(rooms) * 0.35)
+
+
+class TestShardedClient(unittest.TestCase):
+
+    def setUp(self):
+        self.client = ShardedWebSocketClient(Mock(), num_shards=3)
+        self.sent = {id(shard): [] for shard in self.client.shards}
+        patchers = [
+            patch.object(AxiomTradeWebSocketClient, '_ensure_connected', new=AsyncMock(return_value=True)),
+            patch.object(AxiomTradeWebSocketClient, '_send', autospec=True, side_effect=self._record),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def _record(self, shard, data, endpoint="cluster"):
+        self.sent[id(shard)].append(json.loads(data)["room"])
+
+    def test_each_room_joined_on_its_shard_only(self):
+        tokens = [f"Token{i}" for i in range(30)]
+
+        async def run():
+            for token in tokens:
+                await self.client.subscribe_token_price(token, AsyncMock())
+            await self.client.subscribe_wallet_transactions("Wallet1", AsyncMock())
+
+        asyncio.run(run())
+        for token in tokens:
+            owner = self.client.shards[self.client.shard_for(token)]
+            self.assertIn(token, self.sent[id(owner)])
+        self.assertIn("v:Wallet1", self.sent[id(self.client.shards[self.client.shard_for("v:Wallet1")])])
+        self.assertEqual(sum(len(rooms) for rooms in self.sent.values()), 31)
+        self.assertEqual(self.client.get_connection_stats()['rooms'], 31)
+
+    def test_frames_and_unsubscribe_go_through_owning_shard(self):
+        callback = AsyncMock()
+
+        async def run():
+            handle = await self.client.subscribe_token_price("Token1", callback)
+            shard = self.client.shards[self.client.shard_for("Token1")]
+            await shard._dispatch(json.dumps({"room": "Token1", "content": {"price": 3}}))
+            self.assertTrue(await self.client.unsubscribe(handle))
+            return shard
+
+        shard = asyncio.run(run())
+        callback.assert_awaited_once_with({"price": 3})
+        self.assertEqual(shard._room_refs, {})
+
+    def test_token_prices_batch_and_stream_span_shards(self):
+        tokens = [f"Token{i}" for i in range(12)]
+        ticks = []
+
+        async def on_price(token, content):
+            ticks.append(token)
+
+        async def run():
+            async with self.client.batch():
+                subscriptions = await self.client.subscribe_token_prices(tokens, on_price)
+                self.assertEqual(sum(len(rooms) for rooms in self.sent.values()), 0)
+            self.assertEqual(list(subscriptions), tokens)
+            for token in tokens:
+                shard = self.client.shards[self.client.shard_for(token)]
+                await shard._dispatch(json.dumps({"room": token, "content": {"price": 1}}))
+            self.assertEqual(sorted(ticks), sorted(tokens))
+
+            stream = self.client.stream_prices(["Token0", "Token5"])
+            await stream.open()
+            for token in ("Token5", "Token0"):
+                shard = self.client.shards[self.client.shard_for(token)]
+                await shard._dispatch(json.dumps({"room": token, "content": {"price": 2}}))
+            events = [await stream.get(), await stream.get()]
+            await stream.aclose()
+            return events
+
+        events = asyncio.run(run())
+        self.assertEqual(events, [("Token5", {"price": 2}), ("Token0", {"price": 2})])
+        for token in tokens:
+            self.assertIn(token, self.sent[id(self.client.shards[self.client.shard_for(token)])])
+        self.assertEqual(self.client.get_callback_stats()['errors'], 0)
+
+    def test_connection_bound_features_raise_clearly(self):
+        with self.assertRaisesRegex(AttributeError, r"shards\[i\]\.start_recording"):
+            self.client.start_recording("frames.jsonl.gz")
+        with self.assertRaises(AttributeError):
+            self.client.no_such_method
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Test the live market state store fed by the WebSocket client.
+"""
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import Mock, AsyncMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.websocket._client import AxiomTradeWebSocketClient
+from axiomtradeapi.websocket._state import MarketStateStore
+
+
+def _frame(room, content):
+    return json.dumps({"room": room, "content": content})
+
+
+def _make_client(**kwargs):
+    client = AxiomTradeWebSocketClient(Mock(), **kwargs)
+    client._ensure_connected = AsyncMock(return_value=True)
+    client._send = AsyncMock()
+    return client
+
+
+class TestMarketStateStore(unittest.TestCase):
+
+    def test_client_updates_state_in_place(self):
+        client = _make_client(track_state=True)
+        on_price = AsyncMock()
+
+        async def run():
+            await client.subscribe_token_price("Mint1", on_price)
+            await client.subscribe_active_users(None, "Mint1")
+            await client.subscribe_wallet_transactions("W1", None)
+            await client._dispatch(_frame("Mint1", {"price": 1.5}))
+            await client._dispatch(_frame("Mint1", {"price": 2.0}))
+            await client._dispatch(_frame("e-Mint1", "42"))
+            await client._dispatch(_frame("v:W1", {"type": "buy", "total_sol": 1.0}))
+
+        asyncio.run(run())
+        state = client.state
+        self.assertEqual(state.get_price("Mint1"), {"price": 2.0})
+        self.assertEqual(state.get_active_users("Mint1"), 42)
+        self.assertEqual(state.get_last_trade("W1"), {"type": "buy", "total_sol": 1.0})
+        self.assertEqual(state.get_wallet("W1")['trades'], 1)
+        self.assertIsNotNone(state.last_update("Mint1"))
+        self.assertIsNone(state.get_price("Unknown"))
+        self.assertEqual(on_price.await_count, 2)
+
+    def test_bad_active_users_counts_are_ignored(self):
+        client = _make_client(track_state=True)
+        on_count = AsyncMock()
+
+        async def run():
+            await client.subscribe_active_users(on_count, "Mint1")
+            await client._dispatch(_frame("s:Mint1", {"active_users": 7}))
+            await client._dispatch(_frame("s:Mint1", {"active_users": "n/a"}))
+            await client._dispatch(_frame("e-Mint1", "n/a"))
+
+        asyncio.run(run())
+        self.assertEqual(client.state.get_active_users("Mint1"), 7)
+        self.assertEqual([c.args for c in on_count.await_args_list], [(7,)])
+
+    def test_frame_shared_by_two_subscriptions_is_counted_once(self):
+        client = _make_client(track_state=True)
+
+        async def run():
+            await client.subscribe_wallet_transactions("W1", None)
+            await client.subscribe_wallet_transactions("W1", None)
+            await client._dispatch(_frame("v:W1", {"type": "buy", "total_sol": 1.0}))
+
+        asyncio.run(run())
+        self.assertEqual(client.state.get_wallet("W1")['trades'], 1)
+
+    def test_snapshot_is_detached_and_round_trips_through_export(self):
+        store = MarketStateStore()
+        store.update_price("Mint1", {"price": 1}, at=100.0)
+        store.update_wallet_trade("W1", {"type": "sell"}, at=101.0)
+        snapshot = store.snapshot()
+        store.update_price("Mint1", {"price": 2}, at=102.0)
+        self.assertEqual(snapshot['tokens']['Mint1']['price'], {"price": 1})
+
+        tmp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp, "state.json")
+            store.export(path)
+            with open(path) as f:
+                restored = MarketStateStore()
+                restored.load(json.load(f))
+        finally:
+            shutil.rmtree(tmp)
+        self.assertEqual(restored.get_price("Mint1"), {"price": 2})
+        self.assertEqual(restored.last_update("W1"), 101.0)
+        self.assertEqual(len(restored), 2)
+
+    def test_store_can_be_shared_and_is_off_by_default(self):
+        shared = MarketStateStore()
+        first, second = _make_client(track_state=shared), _make_client(track_state=shared)
+
+        async def run():
+            await first.subscribe_token_price("A", None)
+            await second.subscribe_token_price("B", None)
+            await first._dispatch(_frame("A", {"price": 1}))
+            await second._dispatch(_frame("B", {"price": 2}))
+
+        asyncio.run(run())
+        self.assertEqual(sorted(shared.tokens), ["A", "B"])
+        self.assertIsNone(_make_client().state)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Test the async iterator streaming API of AxiomTradeWebSocketClient.
+"""
+import asyncio
+import json
+import unittest
+from unittest.mock import Mock, AsyncMock
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from axiomtradeapi.websocket._client import AxiomTradeWebSocketClient
+from axiomtradeapi.websocket._stream import EventStream
+
+
+def _frame(room, content):
+    return json.dumps({"room": room, "content": content}).encode()
+
+
+class TestEventStream(unittest.TestCase):
+
+    def setUp(self):
+        self.client = AxiomTradeWebSocketClient(Mock())
+        self.sent = []
+
+        async def send(data, endpoint="cluster"):
+            self.sent.append((endpoint, json.loads(data)))
+
+        self.client._send = send
+        self.client._ensure_connected = AsyncMock(return_value=True)
+
+    def test_stream_yields_events_and_leaves_room_on_exit(self):
+        async def run():
+            received = []
+            stream = self.client.stream("new_pairs")
+            await stream.open()
+            for i in range(3):
+                await self.client._dispatch(_frame("new_pairs", {"id": i}))
+            async for pair in stream:
+                received.append(pair)
+                if len(received) == 3:
+                    break
+            await stream.aclose()
+            return received
+
+        received = asyncio.run(run())
+        self.assertEqual(received, [{"id": 0}, {"id": 1}, {"id": 2}])
+        self.assertEqual([m["action"] for _, m in self.sent], ["join", "leave"])
+        self.assertEqual(self.client._rooms, {})
+
+    def test_stream_prices_tags_events_with_token(self):
+        async def run():
+            async with self.client.stream_prices(["A", "B"]) as stream:
+                await self.client._dispatch(_frame("B", {"price": 2}))
+                await self.client._dispatch(_frame("A", {"price": 1}))
+                return [await stream.get(), await stream.get()]
+
+        events = asyncio.run(run())
+        self.assertEqual(events, [("B", {"price": 2}), ("A", {"price": 1})])
+        self.assertEqual({endpoint for endpoint, _ in self.sent}, {"price"})
+        self.assertEqual(sorted(m["room"] for _, m in self.sent if m["action"] == "leave"), ["A", "B"])
+
+    def test_drop_oldest_keeps_latest_events(self):
+        async def run():
+            async with self.client.stream("wallet_transactions", "W", maxsize=2,
+                                          overflow="drop_oldest") as stream:
+                for i in range(5):
+                    await self.client._dispatch(_frame("v:W", {"sig": i}))
+                return [await stream.get(), await stream.get()], stream.get_stats()
+
+        events, stats = asyncio.run(run())
+        self.assertEqual(events, [{"sig": 3}, {"sig": 4}])
+        self.assertEqual(stats['dropped'], 3)
+
+    def test_batches_flush_on_size_and_timeout(self):
+        async def run():
+            batches = []
+            stream = self.client.stream("new_pairs")
+            await stream.open()
+            for i in range(5):
+                await self.client._dispatch(_frame("new_pairs", {"id": i}))
+            async for batch in stream.batches(max_items=3, max_wait_ms=20):
+                batches.append([pair["id"] for pair in batch])
+                if len(batches) == 2:
+                    break
+            await stream.aclose()
+            return batches
+
+        self.assertEqual(asyncio.run(run()), [[0, 1, 2], [3, 4]])
+
+    def test_client_close_ends_stream(self):
+        async def run():
+            received = []
+
+            async def consume():
+                async for count in self.client.stream("active_users", "Mint1"):
+                    received.append(count)
+
+            task = asyncio.ensure_future(consume())
+            await asyncio.sleep(0)
+            await self.client._dispatch(_frame("e-Mint1", "7"))
+            await asyncio.sleep(0)
+            await self.client.close()
+            await asyncio.wait_for(task, 1)
+            return received
+
+        self.assertEqual(asyncio.run(run()), [7])
+
+    def test_failed_subscription_raises(self):
+        self.client._ensure_connected = AsyncMock(return_value=False)
+
+        async def run():
+            async for _ in self.client.stream("new_pairs"):
+                pass
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(run())
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            self.client.stream("unknown")
+        with self.assertRaises(ValueError):
+            EventStream(self.client, AsyncMock(), overflow="conflate")
+
+
+if __name__ == '__main__':
+    unittest.main()